@@ -1,4 +1,6 @@
 import datetime as dt
+import tempfile
+import tracemalloc
 import unittest
 
 import pytest
@@ -108,3 +110,149 @@ class TestRegrid(unittest.TestCase):
         _result = self.benchmark(
             self.adapter.get_data, time=dt.datetime(2000, 1, 1), target=None
         )
+
+    @pytest.mark.benchmark(group="adapters-regrid-unstructured")
+    def test_regrid_linear_us_01_32x16(self):
+        grid1 = fm.UniformGrid((32, 16)).to_unstructured()
+        grid2 = fm.UniformGrid((32, 16), origin=(0.25, 0.25)).to_unstructured()
+
+        self.setup_adapter(grid1, grid2, fm.adapters.RegridLinear())
+        _result = self.benchmark(
+            self.adapter.get_data, time=dt.datetime(2000, 1, 1), target=None
+        )
+
+    @pytest.mark.benchmark(group="adapters-regrid-unstructured")
+    def test_regrid_linear_us_02_512x256(self):
+        grid1 = fm.UniformGrid((512, 256)).to_unstructured()
+        grid2 = fm.UniformGrid((512, 256), origin=(0.25, 0.25)).to_unstructured()
+
+        self.setup_adapter(grid1, grid2, fm.adapters.RegridLinear())
+        _result = self.benchmark(
+            self.adapter.get_data, time=dt.datetime(2000, 1, 1), target=None
+        )
+
+    @pytest.mark.benchmark(group="adapters-regrid-fill")
+    def test_regrid_linear_fill_01_512x256(self):
+        grid1 = fm.UniformGrid((512, 256))
+        grid2 = fm.UniformGrid((512, 256), origin=(0.25, 0.25))
+
+        self.setup_adapter(
+            grid1, grid2, fm.adapters.RegridLinear(fill_with_nearest=True)
+        )
+        _result = self.benchmark(
+            self.adapter.get_data, time=dt.datetime(2000, 1, 1), target=None
+        )
+
+    @pytest.mark.benchmark(group="adapters-regrid-fill")
+    def test_regrid_linear_fill_02_1024x512(self):
+        grid1 = fm.UniformGrid((1024, 512))
+        grid2 = fm.UniformGrid((1024, 512), origin=(0.25, 0.25))
+
+        self.setup_adapter(
+            grid1, grid2, fm.adapters.RegridLinear(fill_with_nearest=True)
+        )
+        _result = self.benchmark(
+            self.adapter.get_data, time=dt.datetime(2000, 1, 1), target=None
+        )
+
+    def setup_cached(self, cache_dir):
+        grid1 = fm.UniformGrid((512, 256)).to_unstructured()
+        grid2 = fm.UniformGrid((512, 256), origin=(0.25, 0.25)).to_unstructured()
+
+        self.setup_adapter(grid1, grid2, fm.adapters.RegridLinear(cache_dir=cache_dir))
+
+    @pytest.mark.benchmark(group="adapters-regrid-setup")
+    def test_regrid_setup_01_no_cache(self):
+        self.setup_cached(None)
+        _result = self.benchmark(self.adapter._setup_grid_specs)
+
+    @pytest.mark.benchmark(group="adapters-regrid-setup")
+    def test_regrid_setup_02_cached(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.setup_cached(tmp)
+            _result = self.benchmark(self.adapter._setup_grid_specs)
+
+    @pytest.mark.benchmark(group="adapters-regrid-conservative")
+    def test_regrid_conservative_01_512x256(self):
+        grid1 = fm.UniformGrid((512, 256))
+        grid2 = fm.UniformGrid((512, 256), origin=(0.25, 0.25))
+
+        self.setup_adapter(grid1, grid2, fm.adapters.RegridConservative())
+        _result = self.benchmark(
+            self.adapter.get_data, time=dt.datetime(2000, 1, 1), target=None
+        )
+
+    @pytest.mark.benchmark(group="adapters-regrid-conservative")
+    def test_regrid_conservative_02_1024x512(self):
+        grid1 = fm.UniformGrid((1024, 512))
+        grid2 = fm.UniformGrid((1024, 512), origin=(0.25, 0.25))
+
+        self.setup_adapter(grid1, grid2, fm.adapters.RegridConservative())
+        _result = self.benchmark(
+            self.adapter.get_data, time=dt.datetime(2000, 1, 1), target=None
+        )
+
+    @pytest.mark.benchmark(group="adapters-regrid-conservative")
+    def test_regrid_conservative_us_01_512x256(self):
+        grid1 = fm.UniformGrid((512, 256))
+        grid2 = fm.UniformGrid((512, 256), origin=(0.25, 0.25)).to_unstructured()
+
+        self.setup_adapter(grid1, grid2, fm.adapters.RegridConservative())
+        _result = self.benchmark(
+            self.adapter.get_data, time=dt.datetime(2000, 1, 1), target=None
+        )
+
+    @pytest.mark.benchmark(group="adapters-regrid-block")
+    def test_regrid_block_01_1024x512_mean(self):
+        grid1 = fm.UniformGrid((1025, 513))
+        grid2 = fm.UniformGrid((257, 129), spacing=(4.0, 4.0))
+
+        self.setup_adapter(grid1, grid2, fm.adapters.RegridBlock())
+        _result = self.benchmark(
+            self.adapter.get_data, time=dt.datetime(2000, 1, 1), target=None
+        )
+
+    @pytest.mark.benchmark(group="adapters-regrid-block")
+    def test_regrid_block_02_1024x512_refine(self):
+        grid1 = fm.UniformGrid((257, 129), spacing=(4.0, 4.0))
+        grid2 = fm.UniformGrid((1025, 513))
+
+        self.setup_adapter(grid1, grid2, fm.adapters.RegridBlock())
+        _result = self.benchmark(
+            self.adapter.get_data, time=dt.datetime(2000, 1, 1), target=None
+        )
+
+    @pytest.mark.benchmark(group="adapters-regrid-block")
+    def test_regrid_block_03_1024x512_conservative(self):
+        grid1 = fm.UniformGrid((1025, 513))
+        grid2 = fm.UniformGrid((257, 129), spacing=(4.0, 4.0))
+
+        self.setup_adapter(grid1, grid2, fm.adapters.RegridConservative())
+        _result = self.benchmark(
+            self.adapter.get_data, time=dt.datetime(2000, 1, 1), target=None
+        )
+
+    def setup_nearest(self, workers):
+        grid1 = fm.UniformGrid((1024, 512), data_location="POINTS")
+        grid2 = fm.UniformGrid((2048, 1024), spacing=(0.5, 0.5), data_location="POINTS")
+        adapter = fm.adapters.RegridNearest(
+            in_grid=grid1, out_grid=grid2, workers=workers
+        )
+        adapter.input_mask = fm.Mask.NONE
+        # peak memory of a single setup
+        tracemalloc.start()
+        adapter._update_grid_specs()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        self.benchmark.extra_info["peak_memory_mb"] = peak / 2**20
+        return adapter
+
+    @pytest.mark.benchmark(group="adapters-regrid-nearest-setup")
+    def test_regrid_nearest_setup_01_serial(self):
+        adapter = self.setup_nearest(workers=1)
+        _result = self.benchmark(adapter._update_grid_specs)
+
+    @pytest.mark.benchmark(group="adapters-regrid-nearest-setup")
+    def test_regrid_nearest_setup_02_parallel(self):
+        adapter = self.setup_nearest(workers=-1)
+        _result = self.benchmark(adapter._update_grid_specs)
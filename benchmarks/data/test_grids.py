@@ -133,3 +133,57 @@ class TestGridFunctionsSlow(unittest.TestCase):
     def test_cells_03_2048x1024(self):
         grid = fm.UniformGrid((2048, 1024))
         _result = self.benchmark(self.get_cells, grid=grid)
+
+
+class TestGridEquality(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def setupBenchmark(self, benchmark):
+        self.benchmark = benchmark
+
+    @pytest.mark.benchmark(group="data-grid-equality")
+    def test_equal_uniform_01_2048x1024(self):
+        grid1 = fm.UniformGrid((2048, 1024), crs="EPSG:32632")
+        grid2 = fm.UniformGrid((2048, 1024), crs="EPSG:32632")
+        _result = self.benchmark(grid1.__eq__, grid2)
+
+    @pytest.mark.benchmark(group="data-grid-equality")
+    def test_compatible_uniform_02_2048x1024(self):
+        grid1 = fm.UniformGrid((2048, 1024), crs="EPSG:32632")
+        grid2 = fm.UniformGrid((2048, 1024), crs="EPSG:32632", axes_reversed=True)
+        _result = self.benchmark(grid1.compatible_with, grid2)
+
+    @pytest.mark.benchmark(group="data-grid-equality")
+    def test_equal_unstructured_03_512x256(self):
+        grid1 = fm.UniformGrid((512, 256)).to_unstructured()
+        grid2 = fm.UniformGrid((512, 256)).to_unstructured()
+        _result = self.benchmark(grid1.__eq__, grid2)
+
+    @pytest.mark.benchmark(group="data-grid-equality")
+    def test_equal_info_04_512x256(self):
+        info1 = fm.Info(grid=fm.UniformGrid((512, 256)).to_unstructured())
+        info2 = fm.Info(grid=fm.UniformGrid((512, 256)).to_unstructured())
+        _result = self.benchmark(info1.__eq__, info2)
+
+
+class TestGridGeometryAccess(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def setupBenchmark(self, benchmark):
+        self.benchmark = benchmark
+
+    def access_geometry(self, grid):
+        for _ in range(10):
+            _points = grid.points
+            _cells = grid.cells
+            _cell_centers = grid.cell_centers
+            _cell_types = grid.cell_types
+            _data_points = grid.data_points
+
+    @pytest.mark.benchmark(group="data-grid-geometry")
+    def test_geometry_01_512x256(self):
+        grid = fm.UniformGrid((512, 256))
+        _result = self.benchmark(self.access_geometry, grid=grid)
+
+    @pytest.mark.benchmark(group="data-grid-geometry")
+    def test_geometry_02_2048x1024(self):
+        grid = fm.UniformGrid((2048, 1024))
+        _result = self.benchmark(self.access_geometry, grid=grid)
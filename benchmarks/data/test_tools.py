@@ -6,6 +6,7 @@ import pytest
 
 import finam as fm
 from finam.data.tools import (
+    ValidationPlan,
     check,
     compatible_units,
     equivalent_units,
@@ -40,6 +41,36 @@ class TestCheck(unittest.TestCase):
         _result = self.benchmark(check, xdata=xdata, info=info)
 
 
+class TestValidationPlan(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def setupBenchmark(self, benchmark):
+        self.benchmark = benchmark
+
+    @pytest.mark.benchmark(group="data-tools")
+    def test_plan_check_01_2x1(self):
+        time = dt.datetime(2000, 1, 1)
+        info = fm.Info(time=time, grid=fm.UniformGrid((2, 1)), units="m")
+        plan = ValidationPlan(info)
+        xdata = full(0.0, info)
+        _result = self.benchmark(plan.check, xdata=xdata)
+
+    @pytest.mark.benchmark(group="data-tools")
+    def test_plan_prepare_np_01_2x1(self):
+        time = dt.datetime(2000, 1, 1)
+        info = fm.Info(time=time, grid=fm.UniformGrid((2, 1)), units="m")
+        plan = ValidationPlan(info)
+        xdata = full(0.0, info)
+        _result = self.benchmark(plan.prepare, data=xdata)
+
+    @pytest.mark.benchmark(group="data-tools")
+    def test_plan_prepare_np_02_512x256(self):
+        time = dt.datetime(2000, 1, 1)
+        info = fm.Info(time=time, grid=fm.UniformGrid((512, 256)), units="m")
+        plan = ValidationPlan(info)
+        xdata = full(0.0, info)
+        _result = self.benchmark(plan.prepare, data=xdata)
+
+
 class TestPrepare(unittest.TestCase):
     @pytest.fixture(autouse=True)
     def setupBenchmark(self, benchmark):
@@ -253,6 +284,22 @@ class TestUnitsTools(unittest.TestCase):
         xdata = full(0.0, info)
         _result = self.benchmark(to_units, xdata=xdata, units="in")
 
+    @pytest.mark.benchmark(group="data-tools-slow")
+    def test_to_units_out_02_512x256(self):
+        time = dt.datetime(2000, 1, 1)
+        info = fm.Info(time=time, grid=fm.UniformGrid((512, 256)), units="m")
+        xdata = full(0.0, info)
+        out = np.empty_like(xdata.magnitude)
+        _result = self.benchmark(to_units, xdata=xdata, units="in", out=out)
+
+    @pytest.mark.benchmark(group="data-tools-slow")
+    def test_to_units_out_03_2048x1024(self):
+        time = dt.datetime(2000, 1, 1)
+        info = fm.Info(time=time, grid=fm.UniformGrid((2048, 1024)), units="m")
+        xdata = full(0.0, info)
+        out = np.empty_like(xdata.magnitude)
+        _result = self.benchmark(to_units, xdata=xdata, units="in", out=out)
+
     @pytest.mark.benchmark(group="data-tools")
     def test_to_units_noop_01_2x1(self):
         time = dt.datetime(2000, 1, 1)
@@ -338,6 +385,41 @@ class TestUnitsTools(unittest.TestCase):
         _result = self.benchmark(set_units_qua, data=xdata, units=fm.UNITS.Unit("m"))
 
 
+class TestInfo(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def setupBenchmark(self, benchmark):
+        self.benchmark = benchmark
+
+    def make_info(self):
+        time = dt.datetime(2000, 1, 1)
+        grid = fm.UniformGrid((512, 256))
+        mask = np.full(grid.data_shape, False)
+        mask[0, 0] = True
+        return fm.Info(time=time, grid=grid, units="m", mask=mask)
+
+    @pytest.mark.benchmark(group="data-info")
+    def test_info_01_copy_with(self):
+        info = self.make_info()
+        _result = self.benchmark(info.copy_with, units="km")
+
+    @pytest.mark.benchmark(group="data-info")
+    def test_info_02_eq(self):
+        info = self.make_info()
+        other = info.copy_with(mask=info.mask.copy())
+        _result = self.benchmark(info.__eq__, other)
+
+    @pytest.mark.benchmark(group="data-info")
+    def test_info_03_accepts(self):
+        info = self.make_info()
+        other = info.copy_with(mask=info.mask.copy(), units="km")
+        _result = self.benchmark(info.accepts, incoming=other, fail_info={})
+
+    @pytest.mark.benchmark(group="data-info")
+    def test_info_04_setattr(self):
+        info = self.make_info()
+        _result = self.benchmark(info.__setattr__, "foo", "bar")
+
+
 def set_units_mul(data, units):
     return units * data
 
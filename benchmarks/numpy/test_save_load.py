@@ -6,6 +6,7 @@ import numpy as np
 import pytest
 
 import finam as fm
+from finam.tools.memory_helper import MemoryArena
 
 
 class TestCreateUniform(unittest.TestCase):
@@ -72,3 +73,60 @@ class TestCreateUniform(unittest.TestCase):
             fp = os.path.join(d, "temp.npy")
             np.save(fp, xdata)
             _result = self.benchmark(np.load, file=fp)
+
+
+class TestArena(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def setupBenchmark(self, benchmark):
+        self.benchmark = benchmark
+
+    def store_free(self, arena, xdata):
+        arena.free(arena.store(xdata))
+
+    def run_store(self, size):
+        xdata = np.full(size, 1.0, dtype=np.dtype(np.float64))
+        with tempfile.TemporaryDirectory() as d:
+            arena = MemoryArena(os.path.join(d, "temp"))
+            self.benchmark(self.store_free, arena=arena, xdata=xdata)
+            arena.close()
+
+    def run_load(self, size):
+        xdata = np.full(size, 1.0, dtype=np.dtype(np.float64))
+        with tempfile.TemporaryDirectory() as d:
+            arena = MemoryArena(os.path.join(d, "temp"))
+            block = arena.store(xdata)
+            _result = self.benchmark(arena.load, block=block)
+            del _result
+            arena.close()
+
+    @pytest.mark.benchmark(group="np-save-load")
+    def test_arena_store_01_64x32(self):
+        self.run_store((1, 64, 32))
+
+    @pytest.mark.benchmark(group="np-save-load")
+    def test_arena_store_02_512x256(self):
+        self.run_store((1, 512, 256))
+
+    @pytest.mark.benchmark(group="np-save-load")
+    def test_arena_store_03_1024x512(self):
+        self.run_store((1, 1024, 512))
+
+    @pytest.mark.benchmark(group="np-save-load")
+    def test_arena_store_04_2048x1024(self):
+        self.run_store((1, 2048, 1024))
+
+    @pytest.mark.benchmark(group="np-save-load")
+    def test_arena_load_01_64x32(self):
+        self.run_load((1, 64, 32))
+
+    @pytest.mark.benchmark(group="np-save-load")
+    def test_arena_load_02_512x256(self):
+        self.run_load((1, 512, 256))
+
+    @pytest.mark.benchmark(group="np-save-load")
+    def test_arena_load_03_1024x512(self):
+        self.run_load((1, 1024, 512))
+
+    @pytest.mark.benchmark(group="np-save-load")
+    def test_arena_load_04_2048x1024(self):
+        self.run_load((1, 2048, 1024))
@@ -185,3 +185,182 @@ class TestSimpleRunCopy(SimpleRunBase):
     @pytest.mark.benchmark(group="run-sim")
     def test_run_simple_cp_08_2048x1024(self):
         self.run_test(2048, 1024, self.gen_data_copy)
+
+
+class TestSimpleRunNumpy(SimpleRunBase):
+    @pytest.fixture(autouse=True)
+    def setupBenchmark(self, benchmark):
+        self.setup(benchmark)
+
+    def setup_data(self, size):
+        self.info1 = fm.Info(time=None, grid=fm.UniformGrid(size), units="m")
+        self.info2 = fm.Info(time=None, grid=fm.UniformGrid(size), units="m")
+        self.data = [
+            np.full((1,) + self.info1.grid.data_shape, 0.0),
+            np.full((1,) + self.info1.grid.data_shape, 0.0),
+        ]
+
+    @pytest.mark.benchmark(group="run-sim-transport")
+    def test_run_numpy_01_2x1(self):
+        self.run_test(2, 1, self.gen_data)
+
+    @pytest.mark.benchmark(group="run-sim-transport")
+    def test_run_numpy_02_32x16(self):
+        self.run_test(32, 16, self.gen_data)
+
+    @pytest.mark.benchmark(group="run-sim-transport")
+    def test_run_numpy_03_128x64(self):
+        self.run_test(128, 64, self.gen_data)
+
+
+class TestAdapterChainRun(SimpleRunBase):
+    @pytest.fixture(autouse=True)
+    def setupBenchmark(self, benchmark):
+        self.setup(benchmark)
+
+    def setup_data(self, size):
+        self.info1 = fm.Info(time=None, grid=fm.UniformGrid(size), units="m")
+        self.info2 = fm.Info(time=None, grid=fm.UniformGrid(size), units="km")
+        self.data = [
+            fm.data.full(0.0, self.info1),
+            fm.data.full(0.0, self.info1),
+        ]
+
+    def run_simulation(self, gen_func):
+        source = fm.components.CallbackGenerator(
+            callbacks={"Out": (gen_func, self.info1.copy())},
+            start=self.start_time,
+            step=dt.timedelta(days=1),
+        )
+        sink = fm.components.DebugConsumer(
+            inputs={
+                "In": self.info2.copy(),
+            },
+            start=self.start_time,
+            step=dt.timedelta(days=1),
+        )
+
+        self.composition = fm.Composition([source, sink])
+
+        slot = source["Out"]
+        for _ in range(5):
+            slot = slot >> fm.adapters.Callback(callback=lambda data, t: data)
+        slot >> sink["In"]
+
+        self.composition.run(end_time=self.end_time)
+
+    @pytest.mark.benchmark(group="run-sim-transport")
+    def test_run_adapters_01_2x1(self):
+        self.run_test(2, 1, self.gen_data)
+
+    @pytest.mark.benchmark(group="run-sim-transport")
+    def test_run_adapters_02_32x16(self):
+        self.run_test(32, 16, self.gen_data)
+
+    @pytest.mark.benchmark(group="run-sim-transport")
+    def test_run_adapters_03_128x64(self):
+        self.run_test(128, 64, self.gen_data)
+
+
+class TestFanOutRun(SimpleRunBase):
+    @pytest.fixture(autouse=True)
+    def setupBenchmark(self, benchmark):
+        self.setup(benchmark)
+
+    def setup_data(self, size):
+        self.info1 = fm.Info(time=None, grid=fm.UniformGrid(size), units="m")
+        self.info2 = fm.Info(
+            time=None, grid=fm.UniformGrid(size, origin=(0.25, 0.25)), units="m"
+        )
+        self.data = [
+            fm.data.full(0.0, self.info1),
+            fm.data.full(0.0, self.info1),
+        ]
+
+    def run_simulation(self, gen_func):
+        source = fm.components.CallbackGenerator(
+            callbacks={"Out": (gen_func, self.info1.copy())},
+            start=self.start_time,
+            step=dt.timedelta(days=1),
+        )
+        sink = fm.components.DebugConsumer(
+            inputs={f"In{i}": self.info2.copy() for i in range(3)},
+            start=self.start_time,
+            step=dt.timedelta(days=1),
+        )
+
+        self.composition = fm.Composition([source, sink])
+
+        regrid = source["Out"] >> fm.adapters.RegridLinear()
+        for i in range(3):
+            regrid >> sink[f"In{i}"]
+
+        self.composition.run(end_time=self.end_time)
+
+    @pytest.mark.benchmark(group="run-sim-fanout")
+    def test_run_fanout_01_2x1(self):
+        self.run_test(2, 1, self.gen_data)
+
+    @pytest.mark.benchmark(group="run-sim-fanout")
+    def test_run_fanout_02_32x16(self):
+        self.run_test(32, 16, self.gen_data)
+
+    @pytest.mark.benchmark(group="run-sim-fanout")
+    def test_run_fanout_03_128x64(self):
+        self.run_test(128, 64, self.gen_data)
+
+
+class TestDemandRun(SimpleRunBase):
+    @pytest.fixture(autouse=True)
+    def setupBenchmark(self, benchmark):
+        self.setup(benchmark)
+
+    def setup_data(self, size):
+        self.info1 = fm.Info(time=None, grid=fm.UniformGrid(size), units="m")
+        self.info2 = fm.Info(time=None, grid=fm.UniformGrid(size), units="m")
+        self.work = np.ones(self.info1.grid.data_shape)
+
+    def gen_data_expensive(self, t):
+        # simulates an expensive diagnostic output
+        return np.sqrt(self.work)
+
+    def run_simulation(self, on_demand):
+        source = fm.components.CallbackGenerator(
+            callbacks={"Out": (self.gen_data_expensive, self.info1.copy())},
+            start=self.start_time,
+            step=dt.timedelta(days=1),
+            on_demand=on_demand,
+        )
+        sink = fm.components.DebugConsumer(
+            inputs={
+                "In": self.info2.copy(),
+            },
+            start=self.start_time,
+            step=dt.timedelta(days=10),
+        )
+
+        self.composition = fm.Composition([source, sink])
+
+        source["Out"] >> sink["In"]
+
+        self.composition.run(end_time=self.end_time)
+
+    def run_demand(self, sx, sy, on_demand):
+        self.setup_data(size=(sx, sy))
+        self.benchmark(self.run_simulation, on_demand=on_demand)
+
+    @pytest.mark.benchmark(group="run-sim-demand")
+    def test_run_every_step_01_32x16(self):
+        self.run_demand(32, 16, on_demand=False)
+
+    @pytest.mark.benchmark(group="run-sim-demand")
+    def test_run_every_step_02_512x256(self):
+        self.run_demand(512, 256, on_demand=False)
+
+    @pytest.mark.benchmark(group="run-sim-demand")
+    def test_run_on_demand_01_32x16(self):
+        self.run_demand(32, 16, on_demand=True)
+
+    @pytest.mark.benchmark(group="run-sim-demand")
+    def test_run_on_demand_02_512x256(self):
+        self.run_demand(512, 256, on_demand=True)
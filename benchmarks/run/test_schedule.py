@@ -0,0 +1,180 @@
+import datetime as dt
+import unittest
+
+import pytest
+
+import finam as fm
+from finam.schedule import _find_dependencies, _resolve_dependencies
+
+
+class TestScheduleRun(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def setupBenchmark(self, benchmark):
+        self.benchmark = benchmark
+        self.start_time = dt.datetime(2000, 1, 1)
+        self.end_time = dt.datetime(2000, 3, 1)
+
+    def run_simulation(self, n):
+        info = fm.Info(time=None, grid=fm.NoGrid(), units="m")
+        sources = []
+        sinks = []
+        for i in range(n):
+            source = fm.components.CallbackGenerator(
+                callbacks={"Out": (lambda t: 1.0, info.copy())},
+                start=self.start_time,
+                step=dt.timedelta(days=1 + i % 3),
+            )
+            sink = fm.components.DebugConsumer(
+                inputs={"In": info.copy()},
+                start=self.start_time,
+                step=dt.timedelta(days=1 + i % 5),
+            )
+            sources.append(source)
+            sinks.append(sink)
+
+        composition = fm.Composition(sources + sinks, print_log=False)
+
+        for source, sink in zip(sources, sinks):
+            source["Out"] >> sink["In"]
+
+        composition.run(end_time=self.end_time)
+
+    def run_test(self, n):
+        self.benchmark(self.run_simulation, n=n)
+
+    @pytest.mark.benchmark(group="run-schedule")
+    def test_run_schedule_01_10(self):
+        self.run_test(10)
+
+    @pytest.mark.benchmark(group="run-schedule")
+    def test_run_schedule_02_50(self):
+        self.run_test(50)
+
+    @pytest.mark.benchmark(group="run-schedule")
+    def test_run_schedule_03_100(self):
+        self.run_test(100)
+
+    @pytest.mark.benchmark(group="run-schedule")
+    def test_run_schedule_04_300(self):
+        self.run_test(300)
+
+
+class TestDependencies(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def setupBenchmark(self, benchmark):
+        self.benchmark = benchmark
+        self.start_time = dt.datetime(2000, 1, 1)
+
+    def setup_composition(self, n_inputs, n_adapters):
+        info = fm.Info(time=None, grid=fm.NoGrid(), units="m")
+        source = fm.components.CallbackGenerator(
+            callbacks={"Out": (lambda t: 1.0, info.copy())},
+            start=self.start_time,
+            step=dt.timedelta(days=1),
+        )
+        self.sink = fm.components.DebugConsumer(
+            inputs={f"In{i}": info.copy() for i in range(n_inputs)},
+            start=self.start_time,
+            step=dt.timedelta(days=1),
+        )
+        self.composition = fm.Composition([source, self.sink], print_log=False)
+
+        for i in range(n_inputs):
+            slot = source["Out"]
+            for _ in range(n_adapters):
+                slot = slot >> fm.adapters.Scale(1.0)
+            slot >> self.sink[f"In{i}"]
+
+        self.composition.connect()
+
+    def find_dependencies(self):
+        return _find_dependencies(
+            self.sink,
+            self.composition._output_owners,
+            self.start_time + dt.timedelta(days=1),
+        )
+
+    def resolve_dependencies(self):
+        return _resolve_dependencies(
+            self.composition._dependencies[self.sink],
+            self.start_time + dt.timedelta(days=1),
+        )
+
+    @pytest.mark.benchmark(group="run-dependencies")
+    def test_find_dependencies_01_10x10(self):
+        self.setup_composition(10, 10)
+        self.benchmark(self.find_dependencies)
+
+    @pytest.mark.benchmark(group="run-dependencies")
+    def test_find_dependencies_02_10x100(self):
+        self.setup_composition(10, 100)
+        self.benchmark(self.find_dependencies)
+
+    @pytest.mark.benchmark(group="run-dependencies")
+    def test_resolve_dependencies_01_10x10(self):
+        self.setup_composition(10, 10)
+        self.benchmark(self.resolve_dependencies)
+
+    @pytest.mark.benchmark(group="run-dependencies")
+    def test_resolve_dependencies_02_10x100(self):
+        self.setup_composition(10, 100)
+        self.benchmark(self.resolve_dependencies)
+
+
+class TestUpdateTarget(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def setupBenchmark(self, benchmark):
+        self.benchmark = benchmark
+        self.start_time = dt.datetime(2000, 1, 1)
+
+    def setup_composition(self, n_stages):
+        info = fm.Info(time=None, grid=fm.NoGrid(), units="m", mask=fm.Mask.NONE)
+        source = fm.components.CallbackGenerator(
+            callbacks={"Out": (lambda t: 1.0, info.copy())},
+            start=self.start_time,
+            step=dt.timedelta(days=1),
+        )
+        weights = fm.components.StaticCallbackGenerator(
+            callbacks={
+                "Weight": (
+                    lambda: 1.0,
+                    fm.Info(time=None, grid=fm.NoGrid(), mask=fm.Mask.NONE),
+                )
+            }
+        )
+        stages = [fm.components.WeightedSum(inputs=["In"]) for _ in range(n_stages)]
+        self.sink = fm.components.DebugConsumer(
+            inputs={"In": info.copy()},
+            start=self.start_time,
+            step=dt.timedelta(days=1),
+        )
+        self.composition = fm.Composition(
+            [source, weights] + stages + [self.sink], print_log=False
+        )
+
+        slot = source["Out"]
+        for stage in stages:
+            slot >> stage["In"]
+            weights["Weight"] >> stage["In_weight"]
+            slot = stage["WeightedSum"]
+        slot >> self.sink["In"]
+
+        self.composition.connect()
+
+    def find_update_target(self):
+        return self.composition._find_update_target(self.sink)
+
+    @pytest.mark.benchmark(group="run-update-target")
+    def test_update_target_01_10(self):
+        self.setup_composition(10)
+        self.benchmark(self.find_update_target)
+
+    @pytest.mark.benchmark(group="run-update-target")
+    def test_update_target_02_50(self):
+        self.setup_composition(50)
+        self.benchmark(self.find_update_target)
+
+    @pytest.mark.benchmark(group="run-update-target")
+    def test_update_target_03_200(self):
+        self.setup_composition(200)
+        self.benchmark(self.find_update_target)
@@ -1,10 +1,13 @@
 import datetime as dt
+import os
 import tempfile
 import unittest
 
+import numpy as np
 import pytest
 
 import finam as fm
+from finam.tools.memory_helper import MemoryArena
 
 
 class TestPushPullBase(unittest.TestCase):
@@ -18,21 +21,41 @@ class TestPushPullBase(unittest.TestCase):
         self.counter += 1
         return data
 
-    def setup_link(self, grid, target_units, memory_limit=None, tempdir=None):
+    def setup_link(
+        self,
+        grid,
+        target_units,
+        memory_limit=None,
+        tempdir=None,
+        masked=False,
+        codec=None,
+        target_grid=None,
+        target_dtype=None,
+    ):
         self.time = dt.datetime(2000, 1, 1)
-        info1 = fm.Info(time=self.time, grid=grid, units="mm")
-        info2 = fm.Info(time=self.time, grid=grid, units=target_units)
+        mask = fm.Mask.FLEX if masked else fm.Mask.NONE
+        info1 = fm.Info(time=self.time, grid=grid, units="mm", mask=mask)
+        info2 = fm.Info(
+            time=self.time,
+            grid=target_grid or grid,
+            units=target_units,
+            mask=mask,
+            dtype=target_dtype,
+        )
 
         self.data = [
             fm.data.full(0.0, info1),
             fm.data.full(0.0, info1),
         ]
+        if masked:
+            self.data = [fm.data.to_masked(d, mask=d.magnitude > 0) for d in self.data]
 
         self.out = fm.Output(name="Output")
         self.inp = fm.Input(name="Input")
 
         self.out.memory_limit = memory_limit
         self.out.memory_location = tempdir
+        self.out.memory_codec = codec
 
         self.out >> self.inp
         self.inp.ping()
@@ -161,3 +184,294 @@ class TestPushPull(TestPushPullBase):
             self.setup_link(grid, target_units="m", memory_limit=0, tempdir=td)
             self.benchmark(self.push_pull)
             self.out.finalize()
+
+    @pytest.mark.benchmark(group="sdk-io-mem")
+    def test_push_pull_file_masked_01_2x1(self):
+        grid = fm.UniformGrid((2, 1))
+        with tempfile.TemporaryDirectory() as td:
+            self.setup_link(
+                grid, target_units="m", memory_limit=0, tempdir=td, masked=True
+            )
+            self.benchmark(self.push_pull)
+            self.out.finalize()
+
+    @pytest.mark.benchmark(group="sdk-io-mem")
+    def test_push_pull_file_masked_02_512x256(self):
+        grid = fm.UniformGrid((512, 256))
+        with tempfile.TemporaryDirectory() as td:
+            self.setup_link(
+                grid, target_units="m", memory_limit=0, tempdir=td, masked=True
+            )
+            self.benchmark(self.push_pull)
+            self.out.finalize()
+
+    @pytest.mark.benchmark(group="sdk-io-mem")
+    def test_push_pull_file_masked_03_1024x512(self):
+        grid = fm.UniformGrid((1024, 512))
+        with tempfile.TemporaryDirectory() as td:
+            self.setup_link(
+                grid, target_units="m", memory_limit=0, tempdir=td, masked=True
+            )
+            self.benchmark(self.push_pull)
+            self.out.finalize()
+
+
+class TestPushPullTransform(TestPushPullBase):
+    @pytest.fixture(autouse=True)
+    def setupBenchmark(self, benchmark):
+        self.benchmark = benchmark
+        self.counter = 0
+
+    def run_transform(self, dims):
+        # reversed axes order and inverted y axis, like ESRI grids
+        target_grid = fm.UniformGrid(
+            dims, axes_reversed=True, axes_increase=[True, False]
+        )
+        self.setup_link(
+            fm.UniformGrid(dims), target_units="mm", target_grid=target_grid
+        )
+        data = self.benchmark(self.push_pull)
+        self.assertEqual(data.shape[1:], target_grid.data_shape)
+
+    @pytest.mark.benchmark(group="sdk-io-transform")
+    def test_push_pull_transform_01_2x1(self):
+        self.run_transform((2, 1))
+
+    @pytest.mark.benchmark(group="sdk-io-transform")
+    def test_push_pull_transform_02_512x256(self):
+        self.run_transform((512, 256))
+
+    @pytest.mark.benchmark(group="sdk-io-transform")
+    def test_push_pull_transform_03_2048x1024(self):
+        self.run_transform((2048, 1024))
+
+
+class TestPushPullCodec(TestPushPullBase):
+    @pytest.fixture(autouse=True)
+    def setupBenchmark(self, benchmark):
+        self.benchmark = benchmark
+        self.counter = 0
+
+    def run_codec(self, grid, codec):
+        with tempfile.TemporaryDirectory() as td:
+            self.setup_link(
+                grid, target_units="m", memory_limit=0, tempdir=td, codec=codec
+            )
+            # smooth fields, like typical model states
+            x, y = np.meshgrid(*grid.cell_axes, indexing="ij")
+            for d in self.data:
+                d[...] = fm.UNITS.Quantity(np.sin(x / 50.0) * np.cos(y / 50.0), "mm")
+            self.benchmark(self.push_pull)
+            self.out.finalize()
+
+    @pytest.mark.benchmark(group="sdk-io-mem-codec")
+    def test_push_pull_codec_none_01_512x256(self):
+        self.run_codec(fm.UniformGrid((512, 256)), codec=None)
+
+    @pytest.mark.benchmark(group="sdk-io-mem-codec")
+    def test_push_pull_codec_none_02_1024x512(self):
+        self.run_codec(fm.UniformGrid((1024, 512)), codec=None)
+
+    @pytest.mark.benchmark(group="sdk-io-mem-codec")
+    def test_push_pull_codec_zlib_01_512x256(self):
+        self.run_codec(fm.UniformGrid((512, 256)), codec="zlib")
+
+    @pytest.mark.benchmark(group="sdk-io-mem-codec")
+    def test_push_pull_codec_zlib_02_1024x512(self):
+        self.run_codec(fm.UniformGrid((1024, 512)), codec="zlib")
+
+    @pytest.mark.benchmark(group="sdk-io-mem-codec")
+    def test_push_pull_codec_shuffle_01_512x256(self):
+        self.run_codec(fm.UniformGrid((512, 256)), codec="shuffle")
+
+    @pytest.mark.benchmark(group="sdk-io-mem-codec")
+    def test_push_pull_codec_shuffle_02_1024x512(self):
+        self.run_codec(fm.UniformGrid((1024, 512)), codec="shuffle")
+
+
+class TestPushPullDtype(TestPushPullBase):
+    @pytest.fixture(autouse=True)
+    def setupBenchmark(self, benchmark):
+        self.benchmark = benchmark
+        self.counter = 0
+
+    def run_dtype(self, grid, dtype):
+        with tempfile.TemporaryDirectory() as td:
+            self.setup_link(
+                grid,
+                target_units="mm",
+                memory_limit=0,
+                tempdir=td,
+                codec="zlib",
+                target_dtype=dtype,
+            )
+            # smooth fields, like typical model states
+            x, y = np.meshgrid(*grid.cell_axes, indexing="ij")
+            for d in self.data:
+                d[...] = fm.UNITS.Quantity(np.sin(x / 50.0) * np.cos(y / 50.0), "mm")
+            self.benchmark(self.push_pull)
+            self.out.finalize()
+
+    @pytest.mark.benchmark(group="sdk-io-mem-dtype")
+    def test_push_pull_float64_01_512x256(self):
+        self.run_dtype(fm.UniformGrid((512, 256)), dtype=None)
+
+    @pytest.mark.benchmark(group="sdk-io-mem-dtype")
+    def test_push_pull_float64_02_2048x1024(self):
+        self.run_dtype(fm.UniformGrid((2048, 1024)), dtype=None)
+
+    @pytest.mark.benchmark(group="sdk-io-mem-dtype")
+    def test_push_pull_float32_01_512x256(self):
+        self.run_dtype(fm.UniformGrid((512, 256)), dtype="float32")
+
+    @pytest.mark.benchmark(group="sdk-io-mem-dtype")
+    def test_push_pull_float32_02_2048x1024(self):
+        self.run_dtype(fm.UniformGrid((2048, 1024)), dtype="float32")
+
+
+class TestPushComputePull(TestPushPullBase):
+    @pytest.fixture(autouse=True)
+    def setupBenchmark(self, benchmark):
+        self.benchmark = benchmark
+        self.counter = 0
+
+    def push_compute_pull(self):
+        data = self.data[self.counter % 2]
+
+        self.out.push_data(data, self.time)
+        # simulates the computation of other components
+        np.sqrt(self.work, out=self.work)
+        data = self.inp.pull_data(self.time)
+        self.time += dt.timedelta(days=1)
+        self.counter += 1
+        return data
+
+    def run_compute(self, grid, asynchronous):
+        self.work = np.ones(2 * grid.data_size)
+        with tempfile.TemporaryDirectory() as td:
+            self.setup_link(grid, target_units="m", memory_limit=0, tempdir=td)
+            self.out._arena = MemoryArena(
+                os.path.join(td, "arena"), asynchronous=asynchronous
+            )
+            self.benchmark(self.push_compute_pull)
+            self.out.finalize()
+
+    @pytest.mark.benchmark(group="sdk-io-mem-async")
+    def test_push_compute_pull_sync_01_512x256(self):
+        self.run_compute(fm.UniformGrid((512, 256)), asynchronous=False)
+
+    @pytest.mark.benchmark(group="sdk-io-mem-async")
+    def test_push_compute_pull_sync_02_1024x512(self):
+        self.run_compute(fm.UniformGrid((1024, 512)), asynchronous=False)
+
+    @pytest.mark.benchmark(group="sdk-io-mem-async")
+    def test_push_compute_pull_sync_03_2048x1024(self):
+        self.run_compute(fm.UniformGrid((2048, 1024)), asynchronous=False)
+
+    @pytest.mark.benchmark(group="sdk-io-mem-async")
+    def test_push_compute_pull_async_01_512x256(self):
+        self.run_compute(fm.UniformGrid((512, 256)), asynchronous=True)
+
+    @pytest.mark.benchmark(group="sdk-io-mem-async")
+    def test_push_compute_pull_async_02_1024x512(self):
+        self.run_compute(fm.UniformGrid((1024, 512)), asynchronous=True)
+
+    @pytest.mark.benchmark(group="sdk-io-mem-async")
+    def test_push_compute_pull_async_03_2048x1024(self):
+        self.run_compute(fm.UniformGrid((2048, 1024)), asynchronous=True)
+
+
+class TestPushDeferred(TestPushPullBase):
+    @pytest.fixture(autouse=True)
+    def setupBenchmark(self, benchmark):
+        self.benchmark = benchmark
+        self.counter = 0
+
+    def produce(self, _time):
+        # simulates an expensive diagnostic output
+        return np.sqrt(self.work)
+
+    def push_pull_coarse(self, deferred):
+        # push 10 daily steps, but pull only every 10th day
+        for _ in range(10):
+            self.out.push_data(
+                self.produce if deferred else self.produce(self.time), self.time
+            )
+            self.time += dt.timedelta(days=1)
+        return self.inp.pull_data(self.time - dt.timedelta(days=1))
+
+    def run_deferred(self, grid, deferred):
+        self.setup_link(grid, target_units="mm")
+        self.work = np.ones(grid.data_shape)
+        self.benchmark(self.push_pull_coarse, deferred=deferred)
+
+    @pytest.mark.benchmark(group="sdk-io-deferred")
+    def test_push_eager_01_512x256(self):
+        self.run_deferred(fm.UniformGrid((512, 256)), deferred=False)
+
+    @pytest.mark.benchmark(group="sdk-io-deferred")
+    def test_push_eager_02_1024x512(self):
+        self.run_deferred(fm.UniformGrid((1024, 512)), deferred=False)
+
+    @pytest.mark.benchmark(group="sdk-io-deferred")
+    def test_push_deferred_01_512x256(self):
+        self.run_deferred(fm.UniformGrid((512, 256)), deferred=True)
+
+    @pytest.mark.benchmark(group="sdk-io-deferred")
+    def test_push_deferred_02_1024x512(self):
+        self.run_deferred(fm.UniformGrid((1024, 512)), deferred=True)
+
+
+class TestPullCache(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def setupBenchmark(self, benchmark):
+        self.benchmark = benchmark
+
+    def setup_cache(self, size):
+        self.start_time = dt.datetime(2000, 1, 1)
+        info = fm.Info(time=self.start_time, grid=fm.UniformGrid((2, 1)), units="m")
+
+        self.out = fm.Output(name="Output")
+        self.inp_slow = fm.Input(name="Slow")
+        self.inp_fast = fm.Input(name="Fast")
+
+        self.out >> self.inp_slow
+        self.out >> self.inp_fast
+        self.inp_slow.ping()
+        self.inp_fast.ping()
+        self.out.push_info(info)
+        self.inp_slow.exchange_info(info)
+        self.inp_fast.exchange_info(info)
+
+        for i in range(size):
+            self.out.push_data(
+                fm.data.full(float(i), info),
+                self.start_time + dt.timedelta(hours=i),
+            )
+
+        # the slow input keeps all data in the cache
+        self.out.get_data(self.start_time, self.inp_slow)
+        self.pull_time = self.start_time + dt.timedelta(hours=size - 1, minutes=-20)
+
+    def pull(self):
+        return self.out.get_data(self.pull_time, self.inp_fast)
+
+    @pytest.mark.benchmark(group="sdk-io-cache")
+    def test_pull_cache_01_10(self):
+        self.setup_cache(10)
+        self.benchmark(self.pull)
+
+    @pytest.mark.benchmark(group="sdk-io-cache")
+    def test_pull_cache_02_100(self):
+        self.setup_cache(100)
+        self.benchmark(self.pull)
+
+    @pytest.mark.benchmark(group="sdk-io-cache")
+    def test_pull_cache_03_1000(self):
+        self.setup_cache(1000)
+        self.benchmark(self.pull)
+
+    @pytest.mark.benchmark(group="sdk-io-cache")
+    def test_pull_cache_04_10000(self):
+        self.setup_cache(10000)
+        self.benchmark(self.pull)
@@ -41,6 +41,8 @@ Regridding adapters
 
     RegridNearest
     RegridLinear
+    RegridConservative
+    RegridBlock
     ToCRS
     ToUnstructured
 
@@ -75,7 +77,14 @@ from . import base, probe, regrid, time
 from .base import Callback, GridToValue, Scale, ValueToGrid
 from .mask import Clip, Masking, UnMasking
 from .probe import CallbackProbe
-from .regrid import RegridLinear, RegridNearest, ToCRS, ToUnstructured
+from .regrid import (
+    RegridBlock,
+    RegridConservative,
+    RegridLinear,
+    RegridNearest,
+    ToCRS,
+    ToUnstructured,
+)
 from .stats import Histogram
 from .time import (
     DelayFixed,
@@ -102,6 +111,8 @@ __all__ += ["CallbackProbe"]
 __all__ += [
     "RegridNearest",
     "RegridLinear",
+    "RegridConservative",
+    "RegridBlock",
     "ToCRS",
     "ToUnstructured",
 ]
@@ -86,6 +86,10 @@ class Scale(Adapter):
             self.scale = scale
         self.grid = None
 
+    @property
+    def is_pure(self):
+        return True
+
     def _get_data(self, time, target):
         return (
             get_magnitude(strip_time(self.pull_data(time, target), self.grid))
@@ -139,6 +143,10 @@ class ValueToGrid(Adapter):
         self.grid = grid
         self.mask = mask
 
+    @property
+    def is_pure(self):
+        return True
+
     def _get_data(self, time, target):
         """Get the output's data-set for the given time.
 
@@ -195,6 +203,10 @@ class GridToValue(Adapter):
         super().__init__()
         self.func = func
 
+    @property
+    def is_pure(self):
+        return True
+
     def _get_data(self, time, target):
         """Get the output's data-set for the given time.
 
@@ -53,6 +53,10 @@ class UnMasking(Adapter):
         super().__init__()
         self.fill_value = fill_value
 
+    @property
+    def is_pure(self):
+        return True
+
     def _get_data(self, time, target):
         return filled(self.pull_data(time, target), self.fill_value)
 
@@ -102,6 +106,10 @@ class Masking(Adapter):
         self.fill_value = fill_value
         self.grid = None
 
+    @property
+    def is_pure(self):
+        return True
+
     def _get_data(self, time, target):
         data = get_magnitude(strip_time(self.pull_data(time, target), self.grid))
         if mask_specified(self.mask):
@@ -161,6 +169,10 @@ class Clip(Adapter):
         self.output_mask = None
         self.select = None
 
+    @property
+    def is_pure(self):
+        return True
+
     def _get_data(self, time, target):
         return strip_time(self.pull_data(time, target), self.input_grid)[self.select]
 
@@ -1,18 +1,30 @@
 """
-Basic linear and nearest neighbour regridding adapters.
+Basic linear, nearest neighbour, conservative and block regridding adapters.
 
 See package `finam-regrid <https://finam.pages.ufz.de/finam-regrid/>`_ for more advanced regridding.
 """
 
+import hashlib
+import itertools
+import os
+import tempfile
 from abc import ABC, abstractmethod
+from pathlib import Path
 
 import numpy as np
 import pyproj
-from scipy.interpolate import LinearNDInterpolator, RegularGridInterpolator
-from scipy.spatial import KDTree
+from scipy.sparse import coo_array, csr_array, kron
+from scipy.spatial import Delaunay, KDTree
 
 from ..data import tools as dtools
-from ..data.grid_spec import Grid, StructuredGrid, UnstructuredGrid
+from ..data.grid_spec import (
+    Grid,
+    Location,
+    StructuredGrid,
+    UniformGrid,
+    UnstructuredGrid,
+)
+from ..data.grid_tools import CellType, content_digest, point_order
 from ..errors import FinamDataError, FinamMetaDataError
 from ..sdk import Adapter
 from ..tools.log_helper import ErrorLogger
@@ -21,15 +33,27 @@ __all__ = [
     "ARegridding",
     "RegridNearest",
     "RegridLinear",
+    "RegridConservative",
+    "RegridBlock",
     "ToCRS",
     "ToUnstructured",
 ]
 
 
+_CACHE_VERSION = 1
+_CHUNK_SIZE = 2**20
+
+
 class ARegridding(Adapter, ABC):
-    """Abstract regridding class for handling data info"""
+    """Abstract regridding class for handling data info
+
+    Regridding adapters with a ``cache_dir`` store the arrays computed in :meth:`._update_grid_specs`
+    in that directory, keyed by a digest of the grids, masks and options.
+    Later runs with the same setup load them memory-mapped instead of computing them again.
+    Derived classes provide the arrays by overwriting :meth:`._cache_arrays` and :meth:`._load_cache_arrays`.
+    """
 
-    def __init__(self, in_grid=None, out_grid=None, out_mask=None):
+    def __init__(self, in_grid=None, out_grid=None, out_mask=None, cache_dir=None):
         super().__init__()
         self.input_grid = in_grid
         self.output_grid = out_grid
@@ -39,13 +63,64 @@ class ARegridding(Adapter, ABC):
         self.downstream_mask = None
         self.input_mask = None
         self.transformer = None
+        self.cache_dir = None if cache_dir is None else Path(cache_dir)
         self._is_initialized = False
         self._out_mask_checked = False
 
+    @property
+    def is_pure(self):
+        return True
+
     @abstractmethod
     def _update_grid_specs(self):
         """set up interpolator"""
 
+    def _cache_options(self):
+        """Options of the regridding that affect the cached arrays."""
+        return ()
+
+    def _cache_arrays(self):
+        """Arrays computed in :meth:`._update_grid_specs` to store in the cache, by name.
+
+        Returns ``None`` if caching is not supported.
+        """
+        return None
+
+    def _load_cache_arrays(self, arrays):
+        """Set up the regridding from cached arrays, as returned by :meth:`._cache_arrays`."""
+
+    def _cache_key(self):
+        digest = hashlib.blake2b(digest_size=16)
+        for item in (
+            _CACHE_VERSION,
+            self.__class__.__qualname__,
+            self._cache_options(),
+            self.input_grid.fingerprint,
+            self.output_grid.fingerprint,
+        ):
+            digest.update(repr(item).encode())
+        for mask in (self.input_mask, self.output_mask, self.downstream_mask):
+            digest.update(_mask_digest(mask))
+        return digest.hexdigest()
+
+    def _setup_grid_specs(self):
+        if self.cache_dir is None:
+            self._update_grid_specs()
+            return
+
+        path = self.cache_dir / f"{self.__class__.__name__}-{self._cache_key()}"
+        arrays = _load_arrays(path)
+        if arrays is not None:
+            self.logger.debug("load regridding arrays from %s", path)
+            self._load_cache_arrays(arrays)
+            return
+
+        self._update_grid_specs()
+        arrays = self._cache_arrays()
+        if arrays is not None:
+            self.logger.debug("store regridding arrays in %s", path)
+            _save_arrays(path, arrays)
+
     def _get_info(self, info):
         request = info.copy_with(grid=self.input_grid, mask=None)
         in_info = self.exchange_info(request)
@@ -88,7 +163,7 @@ class ARegridding(Adapter, ABC):
             self.transformer = _create_transformer(
                 self.output_grid.crs, self.input_grid.crs
             )
-            self._update_grid_specs()
+            self._setup_grid_specs()
             # self.output_mask may be determined by "_update_grid_specs"
             self._check_and_set_out_mask()
             self._is_initialized = True
@@ -118,6 +193,27 @@ class ARegridding(Adapter, ABC):
             self.output_mask = dtools.Mask.FLEX
         self._out_mask_checked = True
 
+    def _mask_outliers(self, mask, outliers):
+        """Output mask for the given mask specification, covering the given flat outliers."""
+        # create mask from outliers
+        outlier_mask = np.ma.make_mask(
+            dtools.from_compressed(
+                outliers, self.output_grid.data_shape, self.output_grid.order
+            )
+        )
+        # determine mask from outliers
+        if mask is None or mask is dtools.Mask.FLEX:
+            return outlier_mask
+        name = self.__class__.__name__
+        if mask is dtools.Mask.NONE:
+            if np.any(outlier_mask):
+                msg = f"{name}: interpolation is not covering desired domain."
+                raise FinamDataError(msg)
+        elif not dtools.is_sub_mask(outlier_mask, mask):
+            msg = f"{name}: interpolation is not covering desired masked domain."
+            raise FinamDataError(msg)
+        return mask
+
     def _need_mask(self, mask):
         return dtools.mask_specified(mask) and mask is not np.ma.nomask
 
@@ -143,6 +239,28 @@ class ARegridding(Adapter, ABC):
             out_data_points = self.output_grid.data_points
         return _transform_points(self.transformer, out_data_points)
 
+    def _iter_out_coords(self, chunk_size=_CHUNK_SIZE):
+        """Output coordinates of unmasked data points in chunks, generated from the axes for structured grids."""
+        if not self._out_mask_checked:
+            with ErrorLogger(self.logger):
+                msg = (
+                    "Regrid: Output coordinates weren't checked for mask compatibility"
+                )
+                raise FinamMetaDataError(msg)
+        grid = self.output_grid
+        mask = None
+        if self._need_mask(self.output_mask):
+            mask = np.logical_not(self.output_mask.ravel(order=grid.order))
+        for start in range(0, grid.data_size, chunk_size):
+            stop = min(start + chunk_size, grid.data_size)
+            if isinstance(grid, StructuredGrid):
+                points = _structured_data_points(grid, start, stop)
+            else:
+                points = grid.data_points[start:stop]
+            if mask is not None:
+                points = points[mask[start:stop]]
+            yield _transform_points(self.transformer, points)
+
     def _check_in_data(self, in_data):
         if dtools.is_masked_array(in_data) and not dtools.mask_specified(
             self.input_mask
@@ -189,11 +307,25 @@ class RegridNearest(ARegridding):
             * None: will be determined by connected target
     tree_options : dict
         kwargs for :class:`scipy.spatial.KDTree`
+    cache_dir : pathlike or None, optional
+        Directory to cache the nearest neighbour IDs between runs. Default: no caching.
+    workers : int, optional
+        Number of workers for the tree queries, -1 for all CPUs. Default: -1.
+        Output points are queried in chunks, generated from the axes for structured grids.
     """
 
-    def __init__(self, in_grid=None, out_grid=None, out_mask=None, tree_options=None):
-        super().__init__(in_grid, out_grid, out_mask)
+    def __init__(
+        self,
+        in_grid=None,
+        out_grid=None,
+        out_mask=None,
+        tree_options=None,
+        cache_dir=None,
+        workers=-1,
+    ):
+        super().__init__(in_grid, out_grid, out_mask, cache_dir)
         self.tree_options = tree_options
+        self.workers = workers
         self.ids = None
 
     def _update_grid_specs(self):
@@ -206,7 +338,17 @@ class RegridNearest(ARegridding):
         kw = self.tree_options or {}
         tree = KDTree(self._get_in_coords(), **kw)
         # only store IDs, since they will be constant
-        self.ids = tree.query(self._get_out_coords())[1]
+        self.ids = _query_nearest(tree, self._iter_out_coords(), self.workers)
+
+    def _cache_options(self):
+        return (_tree_options_key(self.tree_options),)
+
+    def _cache_arrays(self):
+        return {"ids": self.ids}
+
+    def _load_cache_arrays(self, arrays):
+        self._check_and_set_out_mask()
+        self.ids = arrays["ids"]
 
     def _get_data(self, time, target):
         in_data = dtools.get_magnitude(
@@ -225,10 +367,14 @@ class RegridLinear(ARegridding):
     """
     Regrid data between two grid specifications with linear interpolation.
 
-    Uses :class:`scipy.interpolate.RegularGridInterpolator` for structured grids.
-    For unstructured grids, :class:`scipy.interpolate.LinearNDInterpolator` is used,
-    which performs triangulation internally.
+    For structured grids, the corner indices and weights of all output points are computed once,
+    following :class:`scipy.interpolate.RegularGridInterpolator`,
+    so that each regridding step is a single gather-and-weight operation.
+    For unstructured grids, the input points are triangulated with :class:`scipy.spatial.Delaunay`,
+    like in :class:`scipy.interpolate.LinearNDInterpolator`.
     So the actual topology of the grid is not taken into account.
+    The barycentric weights are computed once into a sparse matrix,
+    so that each regridding step is a single sparse matrix-vector product.
 
     See package `finam-regrid <https://finam.pages.ufz.de/finam-regrid/>`_ for more advanced regridding
     using `ESMPy <https://earthsystemmodeling.org/esmpy/>`_.
@@ -266,6 +412,10 @@ class RegridLinear(ARegridding):
         Whether out of bounds points should be filled with the nearest value. Default ``False``.
     tree_options : dict
         kwargs for :class:`scipy.spatial.KDTree`
+    cache_dir : pathlike or None, optional
+        Directory to cache the interpolation weights between runs. Default: no caching.
+    workers : int, optional
+        Number of workers for the tree queries of ``fill_with_nearest``, -1 for all CPUs. Default: -1.
     """
 
     def __init__(
@@ -275,74 +425,111 @@ class RegridLinear(ARegridding):
         out_mask=None,
         fill_with_nearest=False,
         tree_options=None,
+        cache_dir=None,
+        workers=-1,
     ):
-        super().__init__(in_grid, out_grid, out_mask)
+        super().__init__(in_grid, out_grid, out_mask, cache_dir)
         self.tree_options = tree_options
+        self.workers = workers
         self.fill_with_nearest = bool(fill_with_nearest)
         self.ids = None
-        self.inter = None
+        self.in_axes = None
+        self.stencil = None
+        self.tri = None
+        self.weights = None
         self.out_ids = None
         self.fill_ids = None
         self.out_coords = None
         self.structured = False
 
+    def _outliers(self, out_coords):
+        if self.structured:
+            return _linear_stencil(self.in_axes, out_coords)[3]
+        return self.tri.find_simplex(out_coords) < 0
+
     def _update_grid_specs(self):
         if isinstance(self.input_grid, StructuredGrid) and not self._need_mask(
             self.input_mask
         ):
             self.structured = True
-            self.inter = RegularGridInterpolator(
-                points=self.input_grid.data_axes,
-                values=np.zeros(self.input_grid.data_shape, dtype=np.double),
-                bounds_error=False,
-            )
+            # descending axes are used in ascending order, like in RegularGridInterpolator
+            self.in_axes = [
+                ax[::-1] if len(ax) > 1 and ax[0] > ax[-1] else ax
+                for ax in self.input_grid.data_axes
+            ]
         else:
-            in_coords = self._get_in_coords()
-            self.inter = LinearNDInterpolator(
-                points=in_coords,
-                values=np.zeros(len(in_coords), dtype=np.double),
-            )
+            self.tri = Delaunay(self._get_in_coords())
         if self.fill_with_nearest:
             # out mask not restricted when filled with nearest
             self._check_and_set_out_mask()
             self.out_coords = self._get_out_coords()
             # check for outliers once
-            res = self.inter(self.out_coords)
-            self.out_ids = np.isnan(res)
+            self.out_ids = self._outliers(self.out_coords)
             out_points = self.out_coords[self.out_ids]
             kw = self.tree_options or {}
             tree = KDTree(self._get_in_coords(), **kw)
-            self.fill_ids = tree.query(out_points)[1]
+            self.fill_ids = _query_nearest(tree, [out_points], self.workers)
         else:
             mask_save = self.output_mask
             # temporarily unmask
             self._out_mask_checked = True
             self.output_mask = np.ma.nomask
             # check for outliers once
-            res = self.inter(self._get_out_coords())
-            # create mask from outliers
-            outlier_mask = np.ma.make_mask(
-                dtools.from_compressed(
-                    np.isnan(res), self.output_grid.data_shape, self.output_grid.order
-                )
-            )
-            # determine mask from outliers
-            if mask_save is None or mask_save is dtools.Mask.FLEX:
-                self.output_mask = outlier_mask
-            elif mask_save is dtools.Mask.NONE:
-                if np.any(outlier_mask):
-                    msg = "RegridLinear: interpolation is not covering desired domain."
-                    raise FinamDataError(msg)
-                self.output_mask = mask_save
-            else:
-                if not dtools.is_sub_mask(outlier_mask, mask_save):
-                    msg = "RegridLinear: interpolation is not covering desired masked domain."
-                    raise FinamDataError(msg)
-                self.output_mask = mask_save
+            outliers = self._outliers(self._get_out_coords())
+            self.output_mask = self._mask_outliers(mask_save, outliers)
             self._out_mask_checked = False
             self._check_and_set_out_mask()
             self.out_coords = self._get_out_coords()
 
+        if self.structured:
+            self.stencil = _linear_stencil(self.in_axes, self.out_coords)
+        else:
+            self.weights, self.out_ids = _linear_weights(
+                self.tri, self.out_coords, self.fill_ids
+            )
+
+    def _cache_options(self):
+        if self.fill_with_nearest:
+            return (True, _tree_options_key(self.tree_options))
+        return (False,)
+
+    def _cache_arrays(self):
+        arrays = {}
+        if self.out_ids is not None:
+            arrays["out_ids"] = self.out_ids
+        if self.fill_ids is not None:
+            arrays["fill_ids"] = self.fill_ids
+        if isinstance(self.output_mask, np.ndarray):
+            # mask determined from outliers, nomask is stored as a scalar
+            arrays["output_mask"] = np.asarray(self.output_mask)
+        if self.structured:
+            for name, array in zip(
+                ("shape", "ids", "weights", "outside"), self.stencil
+            ):
+                arrays[f"stencil_{name}"] = np.asarray(array)
+        else:
+            arrays.update(_sparse_arrays("weights", self.weights))
+        return arrays
+
+    def _load_cache_arrays(self, arrays):
+        self.structured = "stencil_ids" in arrays
+        if "output_mask" in arrays:
+            mask = np.array(arrays["output_mask"])
+            self.output_mask = np.ma.nomask if mask.ndim == 0 else mask
+        self._out_mask_checked = False
+        self._check_and_set_out_mask()
+        self.out_ids = arrays.get("out_ids")
+        self.fill_ids = arrays.get("fill_ids")
+        if self.structured:
+            self.stencil = (
+                tuple(arrays["stencil_shape"]),
+                arrays["stencil_ids"],
+                arrays["stencil_weights"],
+                arrays["stencil_outside"],
+            )
+        else:
+            self.weights = _load_sparse(arrays, "weights")
+
     def _get_data(self, time, target):
         in_data = dtools.get_magnitude(
             dtools.strip_time(self.pull_data(time, target), self.input_grid)
@@ -350,21 +537,17 @@ class RegridLinear(ARegridding):
         self._check_in_data(in_data)
 
         if self.structured:
-            self.inter.values[...] = in_data
-            res = self.inter(self.out_coords)
+            in_data = np.asarray(in_data, dtype=np.double)
+            res = _apply_stencil(in_data, *self.stencil)
             if self.fill_with_nearest:
-                res[self.out_ids] = self.inter.values.flatten(
-                    order=self.input_grid.order
-                )[self.fill_ids]
+                res[self.out_ids] = in_data.flatten(order=self.input_grid.order)[
+                    self.fill_ids
+                ]
         else:
             in_data = dtools.to_compressed(in_data, order=self.input_grid.order)
-            self.inter.values = np.ascontiguousarray(
-                in_data.reshape((-1, 1)),
-                dtype=np.double,
-            )
-            res = self.inter(self.out_coords)
-            if self.fill_with_nearest:
-                res[self.out_ids] = self.inter.values[self.fill_ids, 0]
+            res = self.weights @ np.asarray(in_data, dtype=np.double)
+            if not self.fill_with_nearest:
+                res[self.out_ids] = np.nan
         return dtools.from_compressed(
             res,
             shape=self.output_grid.data_shape,
@@ -373,6 +556,253 @@ class RegridLinear(ARegridding):
         )
 
 
+class RegridConservative(ARegridding):
+    """
+    Regrid cell data between two 2D grid specifications with first-order conservative remapping.
+
+    Each output cell gets the area-weighted mean of the input cells it overlaps,
+    so that the area integral of the data is conserved.
+    The overlap areas are computed once into a sparse matrix,
+    so that each regridding step is a single sparse matrix-vector product.
+
+    Overlaps between structured grids in the same CRS are computed per axis.
+    Otherwise, cells are intersected by polygon clipping,
+    which requires convex triangle or quadrilateral cells.
+    Areas are computed in the coordinates of the input CRS.
+
+    Output cells that do not overlap any (unmasked) input cell are masked, like in :class:`.RegridLinear`.
+    Masked input cells are excluded from the overlaps.
+
+    See package `finam-regrid <https://finam.pages.ufz.de/finam-regrid/>`_ for more advanced regridding
+    using `ESMPy <https://earthsystemmodeling.org/esmpy/>`_.
+
+    Examples
+    --------
+
+    .. testcode:: constructor
+
+        import finam as fm
+
+        adapter = fm.adapters.RegridConservative()
+
+        adapter = fm.adapters.RegridConservative(
+            in_grid=fm.UniformGrid(dims=(20, 10)),
+            out_grid=fm.UniformGrid(dims=(10, 5), spacing=(2.0, 2.0, 2.0)),
+        )
+
+    Parameters
+    ----------
+    in_grid : Grid or None (optional)
+        Input grid specification. Will be taken from source component if not specified.
+    out_grid : Grid or None (optional)
+        Output grid specification. Will be taken from target component if not specified.
+    out_mask : :any:`Mask` value or valid boolean mask for :any:`MaskedArray` or None, optional
+        masking specification of the regridding output. Options:
+            * :any:`Mask.FLEX`: data will be unmasked
+            * :any:`Mask.NONE`: data will be unmasked and given as plain numpy array
+            * valid boolean mask for MaskedArray
+            * None: will be determined by connected target
+    normalization : str, optional
+        Area to divide the overlap-weighted sum by. Options:
+            * ``"destarea"``: area of the output cell (default).
+              Conserves the integral, partially covered cells get lower values.
+            * ``"fracarea"``: overlapping area of the output cell.
+              Partially covered cells get the mean of the covering cells, the integral is not conserved there.
+    cache_dir : pathlike or None, optional
+        Directory to cache the overlap weights between runs. Default: no caching.
+    """
+
+    def __init__(
+        self,
+        in_grid=None,
+        out_grid=None,
+        out_mask=None,
+        normalization="destarea",
+        cache_dir=None,
+    ):
+        super().__init__(in_grid, out_grid, out_mask, cache_dir)
+        if normalization not in ("destarea", "fracarea"):
+            msg = f"RegridConservative: unknown normalization '{normalization}'"
+            raise ValueError(msg)
+        self.normalization = normalization
+        self.weights = None
+
+    def _update_grid_specs(self):
+        for grid in (self.input_grid, self.output_grid):
+            if not isinstance(grid, Grid) or grid.dim != 2:
+                msg = "RegridConservative: only 2D grids are supported"
+                raise FinamMetaDataError(msg)
+            if grid.data_location != Location.CELLS:
+                msg = "RegridConservative: only data on cells is supported"
+                raise FinamMetaDataError(msg)
+
+        if (
+            isinstance(self.input_grid, StructuredGrid)
+            and isinstance(self.output_grid, StructuredGrid)
+            and self.transformer is None
+        ):
+            overlaps, out_areas = _structured_overlaps(
+                self.input_grid, self.output_grid
+            )
+        else:
+            overlaps, out_areas = _polygon_overlaps(
+                _cell_polygons(self.input_grid),
+                _cell_polygons(self.output_grid, self.transformer),
+            )
+
+        # masked input cells don't contribute, data is compressed
+        if self._need_mask(self.input_mask):
+            in_valid = np.logical_not(
+                self.input_mask.ravel(order=self.input_grid.order)
+            )
+            overlaps = overlaps[:, in_valid]
+
+        covered = overlaps.sum(axis=1)
+        self.output_mask = self._mask_outliers(self.output_mask, covered <= 0)
+        self._out_mask_checked = False
+        self._check_and_set_out_mask()
+
+        if self._need_mask(self.output_mask):
+            out_valid = np.logical_not(
+                self.output_mask.ravel(order=self.output_grid.order)
+            )
+            overlaps, covered = overlaps[out_valid], covered[out_valid]
+            out_areas = out_areas[out_valid]
+
+        norm = covered if self.normalization == "fracarea" else out_areas
+        overlaps.data /= np.repeat(norm, np.diff(overlaps.indptr))
+        self.weights = overlaps
+
+    def _cache_options(self):
+        return (self.normalization,)
+
+    def _cache_arrays(self):
+        arrays = _sparse_arrays("weights", self.weights)
+        if isinstance(self.output_mask, np.ndarray):
+            # mask determined from outliers, nomask is stored as a scalar
+            arrays["output_mask"] = np.asarray(self.output_mask)
+        return arrays
+
+    def _load_cache_arrays(self, arrays):
+        if "output_mask" in arrays:
+            mask = np.array(arrays["output_mask"])
+            self.output_mask = np.ma.nomask if mask.ndim == 0 else mask
+        self._out_mask_checked = False
+        self._check_and_set_out_mask()
+        self.weights = _load_sparse(arrays, "weights")
+
+    def _get_data(self, time, target):
+        in_data = dtools.get_magnitude(
+            dtools.strip_time(self.pull_data(time, target), self.input_grid)
+        )
+        self._check_in_data(in_data)
+        in_data = dtools.to_compressed(in_data, order=self.input_grid.order)
+        return dtools.from_compressed(
+            self.weights @ np.asarray(in_data, dtype=np.double),
+            shape=self.output_grid.data_shape,
+            order=self.output_grid.order,
+            mask=self.output_mask,
+        )
+
+
+class RegridBlock(ARegridding):
+    """
+    Regrid cell data between aligned uniform grids by aggregating or repeating blocks of cells.
+
+    The spacing of each output axis needs to be an integer multiple or an integer fraction
+    of the respective input axis, with cell boundaries of the finer grid on the cell boundaries of the coarser one.
+    The output grid needs to be covered by the input grid.
+
+    Coarser output cells get the mean, sum, minimum or maximum of the input cells they contain,
+    as a reduction of a reshaped view of the data.
+    Finer output cells repeat the value of the input cell they are contained in,
+    divided by the number of output cells per input cell for ``"sum"``.
+
+    Masked input cells are ignored. Output cells are masked if all contained input cells are masked.
+
+    Examples
+    --------
+
+    .. testcode:: constructor
+
+        import finam as fm
+
+        adapter = fm.adapters.RegridBlock()
+
+        adapter = fm.adapters.RegridBlock(
+            in_grid=fm.UniformGrid(dims=(21, 11)),
+            out_grid=fm.UniformGrid(dims=(11, 6), spacing=(2.0, 2.0, 2.0)),
+            method="sum",
+        )
+
+    Parameters
+    ----------
+    in_grid : UniformGrid or None (optional)
+        Input grid specification. Will be taken from source component if not specified.
+    out_grid : UniformGrid or None (optional)
+        Output grid specification. Will be taken from target component if not specified.
+    out_mask : :any:`Mask` value or valid boolean mask for :any:`MaskedArray` or None, optional
+        masking specification of the regridding output. Options:
+            * :any:`Mask.FLEX`: data will be unmasked
+            * :any:`Mask.NONE`: data will be unmasked and given as plain numpy array
+            * valid boolean mask for MaskedArray
+            * None: will be determined by connected target
+    method : str, optional
+        Aggregation of blocks of input cells: ``"mean"`` (default), ``"sum"``, ``"min"`` or ``"max"``.
+    """
+
+    def __init__(self, in_grid=None, out_grid=None, out_mask=None, method="mean"):
+        super().__init__(in_grid, out_grid, out_mask)
+        if method not in ("mean", "sum", "min", "max"):
+            msg = f"RegridBlock: unknown method '{method}'"
+            raise ValueError(msg)
+        self.method = method
+        self.blocks = None
+
+    def _update_grid_specs(self):
+        for grid in (self.input_grid, self.output_grid):
+            if not isinstance(grid, UniformGrid):
+                msg = "RegridBlock: only uniform grids are supported"
+                raise FinamMetaDataError(msg)
+            if grid.data_location != Location.CELLS:
+                msg = "RegridBlock: only data on cells is supported"
+                raise FinamMetaDataError(msg)
+        if self.input_grid.dim != self.output_grid.dim:
+            msg = "Input grid and output grid have different dimensions"
+            raise FinamMetaDataError(msg)
+        if self.transformer is not None:
+            msg = "RegridBlock: input and output grid need the same CRS"
+            raise FinamMetaDataError(msg)
+
+        self.blocks = _uniform_blocks(self.input_grid, self.output_grid)
+
+        # output cells are masked if all their input cells are masked
+        outliers = np.zeros(self.output_grid.data_size, dtype=bool)
+        if self._need_mask(self.input_mask):
+            mask = _apply_blocks(
+                _axes_view(self.input_mask, self.input_grid), self.blocks, "all"
+            )
+            mask = _axes_view(mask, self.output_grid, inverse=True)
+            outliers = np.ravel(mask, order=self.output_grid.order)
+        self.output_mask = self._mask_outliers(self.output_mask, outliers)
+        self._out_mask_checked = False
+        self._check_and_set_out_mask()
+
+    def _get_data(self, time, target):
+        in_data = dtools.get_magnitude(
+            dtools.strip_time(self.pull_data(time, target), self.input_grid)
+        )
+        self._check_in_data(in_data)
+
+        res = _apply_blocks(
+            _axes_view(in_data, self.input_grid), self.blocks, self.method
+        )
+        res = _axes_view(res, self.output_grid, inverse=True)
+        if self._need_mask(self.output_mask):
+            return np.ma.array(np.ma.getdata(res), mask=self.output_mask)
+        return np.ma.getdata(res)
+
+
 class ToCRS(Adapter):
     """
     Convert Grid to another CRS.
@@ -548,6 +978,465 @@ class ToUnstructured(Adapter):
         )
 
 
+def _linear_stencil(axes, points):
+    """
+    Corner indices and weights for multi-linear interpolation on a rectilinear grid.
+
+    Follows :class:`scipy.interpolate.RegularGridInterpolator`, including the order of operations.
+    Axes need to be increasing.
+
+    Returns
+    -------
+    tuple of int
+        Data shape of the grid.
+    np.ndarray
+        Flat (C-order) data indices of the corners, shape (corners, points).
+    np.ndarray
+        Corner weights, shape (corners, factors, points).
+        Two factors to be applied one after the other for 2D grids, one otherwise.
+    np.ndarray
+        Boolean array indicating points outside the grid.
+    """
+    dim = len(axes)
+    shape = tuple(len(ax) for ax in axes)
+    outside = np.any(np.isnan(points), axis=1)
+    lower, dist = [], []
+    for ax, x in zip(axes, points.T):
+        outside |= (x < ax[0]) | (x > ax[-1])
+        if len(ax) == 1:
+            # index -1 wraps around to the single entry with weight 1
+            lower.append(np.full(len(x), -1, dtype=np.intp))
+            dist.append(np.zeros(len(x), dtype=np.double))
+            continue
+        idx = np.clip(np.searchsorted(ax, x, side="right") - 1, 0, len(ax) - 2)
+        lower.append(idx)
+        dist.append((x - ax[idx]) / (ax[idx + 1] - ax[idx]))
+
+    corners = list(itertools.product((0, 1), repeat=dim))
+    ids = np.empty((len(corners), len(points)), dtype=np.intp)
+    weights = np.empty((len(corners), 2 if dim == 2 else 1, len(points)))
+    for c, corner in enumerate(corners):
+        index = [(lower[i] + corner[i]) % shape[i] for i in range(dim)]
+        ids[c] = np.ravel_multi_index(index, shape)
+        factors = [dist[i] if corner[i] else 1 - dist[i] for i in range(dim)]
+        if dim == 2:
+            weights[c] = factors
+        else:
+            weights[c, 0] = 1.0
+            for factor in factors:
+                weights[c, 0] *= factor
+    return shape, ids, weights, outside
+
+
+def _apply_stencil(data, shape, ids, weights, outside):
+    """
+    Apply a linear stencil to data, with optional leading axes (e.g. time).
+
+    Points outside the grid are set to NaN.
+    """
+    flat = np.reshape(data, np.shape(data)[: np.ndim(data) - len(shape)] + (-1,))
+    res = None
+    for corner_ids, corner_weights in zip(ids, weights):
+        term = flat[..., corner_ids]
+        for weight in corner_weights:
+            term *= weight
+        if res is None:
+            res = term
+        else:
+            res += term
+    res[..., outside] = np.nan
+    return res
+
+
+def _linear_weights(tri, points, fill_ids=None):
+    """
+    Sparse matrix for linear interpolation in a triangulation.
+
+    Rows of points outside the triangulation contain the ``fill_ids`` if given, or are empty.
+    Barycentric coordinates are summed up in the same order as in
+    :class:`scipy.interpolate.LinearNDInterpolator`.
+
+    Returns
+    -------
+    csr_array
+        Interpolation matrix of shape (points, triangulation points).
+    np.ndarray
+        Boolean array indicating points outside the triangulation.
+    """
+    dim = tri.ndim
+    simplex = tri.find_simplex(points)
+    outside = simplex < 0
+    inside = np.logical_not(outside)
+
+    trans = tri.transform[simplex[inside]]
+    delta = points[inside] - trans[:, dim, :]
+    weights = np.empty((len(trans), dim + 1), dtype=np.double)
+    weights[:, dim] = 1.0
+    for i in range(dim):
+        weights[:, i] = 0.0
+        for j in range(dim):
+            weights[:, i] += trans[:, i, j] * delta[:, j]
+        weights[:, dim] -= weights[:, i]
+
+    counts = np.full(len(points), dim + 1, dtype=int)
+    counts[outside] = 0 if fill_ids is None else 1
+    indptr = np.concatenate(([0], np.cumsum(counts)))
+    data = np.empty(indptr[-1], dtype=np.double)
+    indices = np.empty(indptr[-1], dtype=np.intp)
+
+    pos = indptr[:-1][inside, np.newaxis] + np.arange(dim + 1)
+    data[pos] = weights
+    indices[pos] = tri.simplices[simplex[inside]]
+    if fill_ids is not None:
+        data[indptr[:-1][outside]] = 1.0
+        indices[indptr[:-1][outside]] = fill_ids
+
+    shape = (len(points), tri.npoints)
+    return csr_array((data, indices, indptr), shape=shape), outside
+
+
+def _axis_overlaps(in_axis, out_axis):
+    """
+    Overlap lengths of the cells of two increasing axes, as a sparse matrix (output cells, input cells).
+
+    Returns
+    -------
+    coo_array
+        Overlap lengths.
+    np.ndarray
+        Lengths of the output cells.
+    """
+    # the merged edges split both axes into segments within a single cell of each
+    edges = np.union1d(in_axis, out_axis)
+    centers = 0.5 * (edges[:-1] + edges[1:])
+    in_ids = np.searchsorted(in_axis, centers) - 1
+    out_ids = np.searchsorted(out_axis, centers) - 1
+    valid = (
+        (in_ids >= 0)
+        & (in_ids < len(in_axis) - 1)
+        & (out_ids >= 0)
+        & (out_ids < len(out_axis) - 1)
+    )
+    shape = (len(out_axis) - 1, len(in_axis) - 1)
+    overlaps = coo_array(
+        (np.diff(edges)[valid], (out_ids[valid], in_ids[valid])), shape=shape
+    )
+    return overlaps, np.diff(out_axis)
+
+
+def _structured_cell_ids(grid):
+    """Flat data indices of the cells of a structured grid, by C-ordered axes indices."""
+    dims = tuple(d - 1 for d in grid.dims)
+    index = np.indices(dims).reshape(len(dims), -1)
+    for i, increase in enumerate(grid.axes_increase):
+        if not increase:
+            index[i] = dims[i] - 1 - index[i]
+    order = point_order(grid.order, grid.axes_reversed)
+    return np.ravel_multi_index(index, dims, order=order)
+
+
+def _structured_overlaps(in_grid, out_grid):
+    """
+    Overlap areas of the cells of two 2D structured grids, computed per axis.
+
+    Returns
+    -------
+    csr_array
+        Overlap areas, shape (output cells, input cells) in flat data order.
+    np.ndarray
+        Areas of the output cells.
+    """
+    overlaps, areas = None, None
+    for in_axis, out_axis in zip(in_grid.axes, out_grid.axes):
+        axis_overlaps, lengths = _axis_overlaps(in_axis, out_axis)
+        if overlaps is None:
+            overlaps, areas = axis_overlaps, lengths
+        else:
+            overlaps = kron(overlaps, axis_overlaps, format="coo")
+            areas = np.multiply.outer(areas, lengths).ravel()
+
+    in_ids, out_ids = _structured_cell_ids(in_grid), _structured_cell_ids(out_grid)
+    out_areas = np.empty_like(areas)
+    out_areas[out_ids] = areas
+    overlaps = coo_array(
+        (overlaps.data, (out_ids[overlaps.row], in_ids[overlaps.col])),
+        shape=overlaps.shape,
+    )
+    return overlaps.tocsr(), out_areas
+
+
+def _cell_polygons(grid, transformer=None):
+    """
+    Vertices of the 2D cells of a grid, shape (cells, 4, 2), triangles with a repeated vertex.
+
+    Points are transformed with the given transformer.
+    """
+    if np.any((grid.cell_types != CellType.TRI) & (grid.cell_types != CellType.QUAD)):
+        msg = "RegridConservative: only triangle and quadrilateral cells are supported"
+        raise FinamMetaDataError(msg)
+    cells = np.array(grid.cells, dtype=np.intp).reshape(grid.cell_count, -1)
+    if cells.shape[1] < 4:
+        cells = np.pad(cells, ((0, 0), (0, 4 - cells.shape[1])), constant_values=-1)
+    # unused entries in "cells" are marked with "-1", repeat the last vertex
+    cells[:, 3] = np.where(cells[:, 3] < 0, cells[:, 2], cells[:, 3])
+    points = _transform_points(transformer, grid.points[:, :2])
+    return points[cells]
+
+
+def _polygon_areas(polygons, counts=None):
+    """Signed areas of polygons, shape (polygons, vertices, 2), with optional vertex counts."""
+    vertices = polygons.shape[1]
+    if counts is None:
+        following = np.roll(polygons, -1, axis=1)
+    else:
+        k = np.arange(vertices)
+        nxt = np.where(k + 1 >= counts[:, np.newaxis], 0, k + 1)
+        following = np.take_along_axis(polygons, nxt[..., np.newaxis], axis=1)
+    cross = polygons[..., 0] * following[..., 1] - following[..., 0] * polygons[..., 1]
+    if counts is not None:
+        cross[np.arange(vertices) >= counts[:, np.newaxis]] = 0.0
+    return 0.5 * np.sum(cross, axis=1)
+
+
+def _clip_areas(subject, clip):
+    """
+    Areas of the intersections of pairs of convex polygons, shape (pairs, 4, 2).
+
+    Vectorized Sutherland-Hodgman clipping of the subjects by the counter-clockwise clip polygons.
+    """
+    pairs, size = len(subject), 2 * subject.shape[1]
+    rows = np.arange(pairs)
+    polygons = np.zeros((pairs, size, 2))
+    polygons[:, : subject.shape[1]] = subject
+    counts = np.full(pairs, subject.shape[1])
+    for edge in range(clip.shape[1]):
+        start = clip[:, np.newaxis, edge]
+        direction = clip[:, np.newaxis, (edge + 1) % clip.shape[1]] - start
+        valid = np.arange(size) < counts[:, np.newaxis]
+        rel = polygons - start
+        side = direction[..., 0] * rel[..., 1] - direction[..., 1] * rel[..., 0]
+        # previous vertices, cycling within the valid ones
+        last = np.maximum(counts - 1, 0)
+        prev = np.concatenate(
+            (polygons[rows, last][:, np.newaxis], polygons[:, :-1]), axis=1
+        )
+        prev_side = np.concatenate((side[rows, last][:, np.newaxis], side[:, :-1]), 1)
+        inside, prev_inside = side >= 0, prev_side >= 0
+        crossing = valid & (inside != prev_inside)
+        denom = np.where(crossing, prev_side - side, 1.0)
+        t = np.where(crossing, prev_side / denom, 0.0)[..., np.newaxis]
+        # each vertex emits the crossing point before it and itself if inside
+        candidates = np.stack((prev + t * (polygons - prev), polygons), axis=2)
+        emit = np.stack((crossing, valid & inside), axis=2)
+        positions = np.cumsum(emit.reshape(pairs, -1), axis=1).reshape(emit.shape) - 1
+        # at most one more vertex per edge for convex polygons
+        emit &= positions < size
+        emit_rows = np.nonzero(emit)[0]
+        polygons = np.zeros_like(polygons)
+        polygons[emit_rows, positions[emit]] = candidates[emit]
+        counts = np.sum(emit, axis=(1, 2))
+    return np.abs(_polygon_areas(polygons, counts))
+
+
+def _polygon_overlaps(in_polygons, out_polygons, chunk_size=65536):
+    """
+    Overlap areas of the convex cells of two 2D grids, by polygon clipping.
+
+    Returns
+    -------
+    csr_array
+        Overlap areas, shape (output cells, input cells) in flat data order.
+    np.ndarray
+        Areas of the output cells.
+    """
+    out_areas = _polygon_areas(out_polygons)
+    # clip polygons need to be counter-clockwise
+    out_polygons = np.where(
+        (out_areas < 0)[:, np.newaxis, np.newaxis], out_polygons[:, ::-1], out_polygons
+    )
+    out_areas = np.abs(out_areas)
+
+    # candidate pairs by overlapping bounding circles
+    in_centers, out_centers = in_polygons.mean(axis=1), out_polygons.mean(axis=1)
+    in_radius = np.max(np.linalg.norm(in_polygons - in_centers[:, np.newaxis], axis=2))
+    out_radii = np.max(
+        np.linalg.norm(out_polygons - out_centers[:, np.newaxis], axis=2), axis=1
+    )
+    candidates = KDTree(in_centers).query_ball_point(out_centers, out_radii + in_radius)
+    out_ids = np.repeat(np.arange(len(candidates)), [len(c) for c in candidates])
+    in_ids = np.fromiter(
+        itertools.chain.from_iterable(candidates), dtype=np.intp, count=len(out_ids)
+    )
+    # bounding box check
+    in_min, in_max = in_polygons.min(axis=1), in_polygons.max(axis=1)
+    out_min, out_max = out_polygons.min(axis=1), out_polygons.max(axis=1)
+    hit = np.all(
+        (in_min[in_ids] < out_max[out_ids]) & (out_min[out_ids] < in_max[in_ids]),
+        axis=1,
+    )
+    in_ids, out_ids = in_ids[hit], out_ids[hit]
+
+    areas = np.empty(len(in_ids))
+    for start in range(0, len(in_ids), chunk_size):
+        part = slice(start, start + chunk_size)
+        areas[part] = _clip_areas(
+            in_polygons[in_ids[part]], out_polygons[out_ids[part]]
+        )
+    # drop overlaps from rounding errors of touching cells
+    keep = areas > 1e-12 * out_areas[out_ids]
+    shape = (len(out_polygons), len(in_polygons))
+    overlaps = coo_array((areas[keep], (out_ids[keep], in_ids[keep])), shape=shape)
+    return overlaps.tocsr(), out_areas
+
+
+def _uniform_blocks(in_grid, out_grid):
+    """
+    Blocks of cells of two aligned uniform grids, per axis in xyz order.
+
+    Returns
+    -------
+    list of tuple(slice, int, int, np.ndarray or None)
+        Per axis, the covered input cells, the number of input cells per output cell,
+        the number of output cells per input cell,
+        and the input cell of each output cell relative to the covered cells if the output is finer.
+    """
+    blocks = []
+    for in_axis, out_axis, in_step, out_step in zip(
+        in_grid.axes, out_grid.axes, in_grid.spacing, out_grid.spacing
+    ):
+        fine = min(in_step, out_step)
+        # all numbers in units of the finer spacing
+        ratios = np.array([in_step, out_step, out_axis[0] - in_axis[0]]) / fine
+        if not np.allclose(ratios, np.round(ratios), rtol=0.0, atol=1e-6):
+            msg = "RegridBlock: grids are not aligned with integer spacing ratios"
+            raise FinamMetaDataError(msg)
+        in_ratio, out_ratio, offset = np.round(ratios).astype(int)
+        in_cells, out_cells = len(in_axis) - 1, len(out_axis) - 1
+        if offset < 0 or offset + out_ratio * out_cells > in_ratio * in_cells:
+            msg = "RegridBlock: output grid is not covered by the input grid"
+            raise FinamMetaDataError(msg)
+        if in_ratio == 1:
+            covered = slice(offset, offset + out_ratio * out_cells)
+            blocks.append((covered, out_ratio, 1, None))
+        else:
+            ids = (offset + np.arange(out_cells)) // in_ratio
+            covered = slice(ids[0], ids[-1] + 1)
+            blocks.append((covered, 1, in_ratio, ids - ids[0]))
+    return blocks
+
+
+def _apply_blocks(data, blocks, method):
+    """
+    Aggregate or repeat blocks of cells of data in xyz order, with optional leading axes (e.g. time).
+
+    ``method`` is the name of an array reduction, like ``"mean"`` or ``"all"``.
+    """
+    lead = np.ndim(data) - len(blocks)
+    data = data[(Ellipsis,) + tuple(block[0] for block in blocks)]
+    # split coarsened axes into (cells, block), a view where the memory layout allows it
+    shape = np.shape(data)[:lead]
+    for (_, size, _, _), length in zip(blocks, np.shape(data)[lead:]):
+        shape += (length // size, size)
+    block_axes = tuple(lead + 2 * i + 1 for i in range(len(blocks)))
+    data = getattr(data.reshape(shape), method)(axis=block_axes)
+    # repeat input cells for refined axes
+    for i, (_, _, parts, ids) in enumerate(blocks):
+        if ids is not None:
+            data = np.take(data, ids, axis=lead + i)
+            if method == "sum":
+                data = data / parts
+    return data
+
+
+def _axes_view(data, grid, inverse=False):
+    """
+    View of data with spatial axes in xyz order, all increasing.
+
+    With ``inverse``, the view in data order of the grid from data in xyz order.
+    """
+    lead = np.ndim(data) - grid.dim
+    flip = tuple(lead + i for i, inc in enumerate(grid.axes_increase) if not inc)
+    order = tuple(range(lead)) + tuple(range(np.ndim(data) - 1, lead - 1, -1))
+    if not inverse and grid.axes_reversed:
+        data = np.transpose(data, order)
+    if flip:
+        data = np.flip(data, flip)
+    if inverse and grid.axes_reversed:
+        data = np.transpose(data, order)
+    return data
+
+
+def _sparse_arrays(name, matrix):
+    """Arrays of a CSR matrix for the cache."""
+    return {
+        f"{name}_data": matrix.data,
+        f"{name}_indices": matrix.indices,
+        f"{name}_indptr": matrix.indptr,
+        f"{name}_shape": np.asarray(matrix.shape),
+    }
+
+
+def _load_sparse(arrays, name):
+    """CSR matrix from arrays of the cache."""
+    return csr_array(
+        (arrays[f"{name}_data"], arrays[f"{name}_indices"], arrays[f"{name}_indptr"]),
+        shape=tuple(arrays[f"{name}_shape"]),
+    )
+
+
+def _structured_data_points(grid, start, stop):
+    """Data points of a structured grid in the range of flat data indices, generated from the axes."""
+    index = np.unravel_index(np.arange(start, stop), grid.data_shape, order=grid.order)
+    points = np.empty((stop - start, grid.dim), dtype=np.double)
+    # data axes are in data order, points in xyz order
+    for i, (axis, ids) in enumerate(zip(grid.data_axes, index)):
+        points[:, grid.dim - 1 - i if grid.axes_reversed else i] = axis[ids]
+    return points
+
+
+def _query_nearest(tree, points, workers=-1, chunk_size=_CHUNK_SIZE):
+    """IDs of the nearest neighbours in a tree for chunks of points, queried in parallel."""
+    ids = []
+    for chunk in points:
+        for start in range(0, len(chunk), chunk_size):
+            part = chunk[start : start + chunk_size]
+            ids.append(tree.query(part, workers=workers)[1])
+    return np.concatenate(ids) if ids else np.empty(0, dtype=np.intp)
+
+
+def _tree_options_key(options):
+    # options like ``boxsize`` change the tree queries
+    return tuple(sorted((options or {}).items()))
+
+
+def _mask_digest(mask):
+    if isinstance(mask, np.ndarray) and mask is not np.ma.nomask:
+        return content_digest(mask)
+    return repr(mask).encode()
+
+
+def _save_arrays(path, arrays):
+    """Save arrays as ``.npy`` files in a directory, created atomically."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = Path(tempfile.mkdtemp(dir=path.parent, prefix=f".{path.name}-"))
+    for name, array in arrays.items():
+        np.save(tmp / f"{name}.npy", array)
+    try:
+        os.replace(tmp, path)
+    except OSError:
+        # already stored by another process
+        for file in tmp.iterdir():
+            file.unlink()
+        tmp.rmdir()
+
+
+def _load_arrays(path):
+    """Load arrays saved by :func:`_save_arrays` memory-mapped. ``None`` if not present."""
+    if not path.is_dir():
+        return None
+    return {file.stem: np.load(file, mmap_mode="r") for file in path.glob("*.npy")}
+
+
 def _create_transformer(in_crs, out_crs):
     in_crs = None if in_crs is None else pyproj.crs.CRS(in_crs)
     out_crs = None if out_crs is None else pyproj.crs.CRS(out_crs)
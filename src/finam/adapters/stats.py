@@ -46,6 +46,10 @@ class Histogram(Adapter):
         step = (upper - lower) / bins
         self.grid = UniformGrid(dims=(bins + 1,), spacing=(step,), origin=(lower,))
 
+    @property
+    def is_pure(self):
+        return True
+
     def _get_data(self, time, target):
         d = get_magnitude(self.pull_data(time, target))
 
@@ -2,7 +2,6 @@
 Adapters that deal with time, like temporal interpolation and integration.
 """
 
-import os
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
 
@@ -13,6 +12,7 @@ from finam.interfaces import NoBranchAdapter, NoDependencyAdapter
 from ..data import tools as dtools
 from ..errors import FinamNoDataError, FinamTimeError
 from ..sdk import Adapter, TimeDelayAdapter
+from ..sdk.output import DataCache
 from ..tools.date_helper import is_timedelta
 from ..tools.log_helper import ErrorLogger
 
@@ -226,7 +226,7 @@ class TimeCachingAdapter(Adapter, NoBranchAdapter, ABC):
 
     def __init__(self):
         super().__init__()
-        self.data = []
+        self.data = DataCache()
 
     @property
     def needs_push(self):
@@ -243,7 +243,8 @@ class TimeCachingAdapter(Adapter, NoBranchAdapter, ABC):
         check_time(self.logger, time)
 
         data = dtools.strip_time(self.pull_data(time, self), self._input_info.grid)
-        self.data.append((time, self._pack(data)))
+        with self._cache_lock():
+            self.data.append((time, self._pack(data)))
 
     def _get_data(self, time, _target):
         """Get the output's data-set for the given time.
@@ -258,22 +259,24 @@ class TimeCachingAdapter(Adapter, NoBranchAdapter, ABC):
         array_like
             data-set for the requested time.
         """
-        if len(self.data) == 0:
-            raise FinamNoDataError(f"No data available in {self.name}")
+        with self._cache_lock():
+            if len(self.data) == 0:
+                raise FinamNoDataError(f"No data available in {self.name}")
 
-        check_time(self.logger, time, (self.data[0][0], self.data[-1][0]))
+            check_time(self.logger, time, (self.data[0][0], self.data[-1][0]))
 
-        data = self._interpolate(time)
-        self._clear_cached_data(time)
-        return data
+            data = self._interpolate(time)
+            self._clear_cached_data(time)
+            return data
 
     def _clear_cached_data(self, time):
-        while len(self.data) > 1 and self.data[1][0] <= time:
-            d = self.data.pop(0)
-            if isinstance(d[1], str):
-                os.remove(d[1])
-            else:
-                self._total_mem -= d[1].nbytes
+        with self._cache_lock():
+            while len(self.data) > 1 and self.data[1][0] <= time:
+                _t, d = self.data.popleft()
+                self._release(d)
+
+    def _unpack(self, where):
+        return dtools.to_quantity(super()._unpack(where))
 
     @abstractmethod
     def _interpolate(self, time):
@@ -27,7 +27,8 @@ class TimeIntegrationAdapter(TimeCachingAdapter, ABC):
         check_time(self.logger, time)
 
         data = tools.strip_time(self.pull_data(time, self), self._input_info.grid)
-        self.data.append((time, self._pack(data)))
+        with self._cache_lock():
+            self.data.append((time, self._pack(data)))
 
         if self._prev_time is None:
             self._prev_time = time
@@ -45,15 +46,16 @@ class TimeIntegrationAdapter(TimeCachingAdapter, ABC):
         array_like
             data-set for the requested time.
         """
-        if len(self.data) == 0:
-            raise FinamNoDataError(f"No data available in {self.name}")
+        with self._cache_lock():
+            if len(self.data) == 0:
+                raise FinamNoDataError(f"No data available in {self.name}")
 
-        check_time(self.logger, time, (self.data[0][0], self.data[-1][0]))
+            check_time(self.logger, time, (self.data[0][0], self.data[-1][0]))
 
-        sum_value = self._interpolate(time)
-        self._clear_cached_data(self._prev_time)
-        self._prev_time = time
-        return sum_value
+            sum_value = self._interpolate(time)
+            self._clear_cached_data(self._prev_time)
+            self._prev_time = time
+            return sum_value
 
 
 # pylint: disable=too-many-ancestors
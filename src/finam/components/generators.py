@@ -49,9 +49,12 @@ class CallbackGenerator(TimeComponent):
         Starting time.
     step : :class:`timedelta <datetime.timedelta>` or :class:`relativedelta <dateutil.relativedelta.relativedelta>`
         Time step.
+    on_demand : bool, optional
+        If ``True``, callbacks are only called for times that are needed by the consumers of the respective output,
+        see :class:`.OutputDemand`. Default ``False``, callbacks are called in every step.
     """
 
-    def __init__(self, callbacks, start, step):
+    def __init__(self, callbacks, start, step, on_demand=False):
         super().__init__()
 
         if not isinstance(start, datetime):
@@ -62,6 +65,7 @@ class CallbackGenerator(TimeComponent):
         self._callbacks = callbacks
         self._step = step
         self._time = start
+        self._on_demand = on_demand
         self._initial_data = None
 
     def _next_time(self):
@@ -114,8 +118,13 @@ class CallbackGenerator(TimeComponent):
         After the method call, the component should have status UPDATED or FINISHED.
         """
         self._time += self._step
+        next_push = self._time + self._step
 
         for key, (callback, _) in self._callbacks.items():
+            if self._on_demand and not self.outputs[key].demand.is_needed(
+                self._time, next_push
+            ):
+                continue
             data = callback(self._time)
             if data is not None:
                 self.outputs[key].push_data(data, self.time)
@@ -156,7 +156,7 @@ class WeightedSum(Component):
             if not mask_specified(mask):
                 out_mask = Mask.NONE
                 break
-            out_mask &= mask
+            out_mask = out_mask & mask
 
         return {"WeightedSum": base_info.copy_with(mask=out_mask)}
 
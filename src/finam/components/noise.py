@@ -99,7 +99,7 @@ class SimplexNoise(Component):
     def _initialize(self):
         self.outputs.add(
             io=CallbackOutput(
-                callback=self._generate_noise, name="Noise", info=self._info
+                callback=self._generate_noise, name="Noise", info=self._info, pure=True
             )
         )
         self.create_connector()
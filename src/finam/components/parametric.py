@@ -63,7 +63,7 @@ class ParametricGrid(Component):
     def _initialize(self):
         self.outputs.add(
             io=CallbackOutput(
-                callback=self._generate_grid, name="Grid", info=self._info
+                callback=self._generate_grid, name="Grid", info=self._info, pure=True
             )
         )
         self.create_connector()
@@ -131,9 +131,15 @@ class CsvReader(TimeComponent):
 
         After the method call, the component should have status UPDATED or FINISHED.
         """
-        self._time, _ = self._push_row(self._data.iloc[self._row_index], True)
+        row = self._data.iloc[self._row_index]
         self._row_index += 1
 
+        next_push = None
+        if self._row_index < self._data.shape[0]:
+            next_push = self._row_time(self._data.iloc[self._row_index])
+
+        self._time, _ = self._push_row(row, True, next_push)
+
         if self._row_index >= self._data.shape[0]:
             self.status = ComponentStatus.FINISHED
 
@@ -143,19 +149,22 @@ class CsvReader(TimeComponent):
         After the method call, the component should have status FINALIZED.
         """
 
-    def _push_row(self, row, push):
+    def _row_time(self, row):
         if self._date_format is None:
-            time = datetime.fromisoformat(row[self._time_column])
-        else:
-            time = datetime.strptime(row[self._time_column], self._date_format)
+            return datetime.fromisoformat(row[self._time_column])
+        return datetime.strptime(row[self._time_column], self._date_format)
+
+    def _push_row(self, row, push, next_push=None):
+        time = self._row_time(row)
 
         out_data = {
             name: quantify(row[name], units)
             for name, units in self._output_units.items()
+            if not push or self.outputs[name].demand.is_needed(time, next_push)
         }
 
         if push:
-            for o in self._output_units:
-                self.outputs[o].push_data(out_data[o], time)
+            for o, data in out_data.items():
+                self.outputs[o].push_data(data, time)
 
         return time, out_data
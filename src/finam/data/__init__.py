@@ -24,7 +24,9 @@ Grid tools
     check_axes_monotonicity
     check_axes_uniformity
     check_uniformity
+    content_digest
     equal_crs
+    intern_grid
     :noindex: CellType
     :noindex: Location
 
@@ -50,6 +52,7 @@ Data tools
     prepare
     strip_time
     check
+    ValidationPlan
     full
     full_like
     has_time_axis
@@ -64,8 +67,12 @@ Unit tools
    :toctree: generated
 
     :noindex: UNITS
+    LightQuantity
     quantify
+    to_quantity
     to_units
+    convert_units
+    intern_units
     is_quantified
     check_quantified
     get_dimensionality
@@ -109,16 +116,21 @@ from .grid_tools import (
     check_axes_monotonicity,
     check_axes_uniformity,
     check_uniformity,
+    content_digest,
     equal_crs,
+    intern_grid,
 )
 from .tools import (
     UNITS,
     Info,
+    LightQuantity,
     Mask,
+    ValidationPlan,
     assert_type,
     check,
     check_data_covers_domain,
     check_quantified,
+    convert_units,
     filled,
     from_compressed,
     full,
@@ -128,6 +140,7 @@ from .tools import (
     get_units,
     has_masked_values,
     has_time_axis,
+    intern_units,
     is_masked_array,
     is_quantified,
     mask_specified,
@@ -139,6 +152,7 @@ from .tools import (
     to_compressed,
     to_datetime,
     to_masked,
+    to_quantity,
     to_units,
 )
 
@@ -160,16 +174,21 @@ __all__ += [
     "check_axes_monotonicity",
     "check_axes_uniformity",
     "check_uniformity",
+    "content_digest",
     "equal_crs",
+    "intern_grid",
 ]
 __all__ += [
     "UNITS",
     "FinamDataError",
     "Info",
+    "LightQuantity",
     "Mask",
+    "ValidationPlan",
     "assert_type",
     "check",
     "check_quantified",
+    "convert_units",
     "full",
     "full_like",
     "get_dimensionality",
@@ -178,6 +197,8 @@ __all__ += [
     "has_time_axis",
     "prepare",
     "quantify",
+    "to_quantity",
+    "intern_units",
     "is_quantified",
     "strip_time",
     "to_datetime",
@@ -13,6 +13,7 @@ from .grid_tools import (
     VTK_TYPE_MAP,
     CellType,
     Location,
+    content_digest,
     equal_crs,
     flatten_cells,
     gen_cells,
@@ -23,6 +24,19 @@ from .grid_tools import (
     prepare_vtk_kwargs,
 )
 
+_GEOMETRY_CACHE = {}
+
+
+def _geometry_close(grid, other, compare):
+    # geometry comparison memoized by content digests
+    key = (grid.content_digest, other.content_digest)
+    if key[0] == key[1]:
+        return True
+    close = _GEOMETRY_CACHE.get(key)
+    if close is None:
+        close = _GEOMETRY_CACHE[key] = bool(compare())
+    return close
+
 
 class GridBase(ABC):
     """Abstract grid base."""
@@ -42,6 +56,28 @@ class GridBase(ABC):
     def data_shape(self):
         """tuple: Shape of the associated data."""
 
+    @property
+    def fingerprint(self):
+        """tuple: Hashable fingerprint of the grid. Equal fingerprints indicate equal grids."""
+        return (id(self),)
+
+    def clear_cache(self):
+        """Clear cached grid properties. Needs to be called after modifying the grid in place."""
+        self._content_digest = None
+        self._geometry_cache = {}
+
+    def _cached(self, name, generate):
+        # geometry arrays are generated once and stored read-only
+        cache = getattr(self, "_geometry_cache", None)
+        if cache is None:
+            cache = self._geometry_cache = {}
+        value = cache.get(name)
+        if value is None:
+            value = generate()
+            value.flags.writeable = False
+            cache[name] = value
+        return value
+
     def copy(self, deep=False):
         """
         Copy of this grid.
@@ -191,6 +227,29 @@ class Grid(GridBase):
         """list of str: Axes names of the data."""
         return ["id"]
 
+    @property
+    def content_digest(self):
+        """bytes: Digest of the grid geometry, computed once."""
+        digest = getattr(self, "_content_digest", None)
+        if digest is None:
+            digest = self._content_digest = self._gen_content_digest()
+        return digest
+
+    def _gen_content_digest(self):
+        return content_digest(self.points, self.cells, self.cell_types)
+
+    @property
+    def fingerprint(self):
+        """tuple: Hashable fingerprint of the grid. Equal fingerprints indicate equal grids."""
+        return (
+            "Grid",
+            self.dim,
+            str(self.crs),
+            self.order,
+            self.data_location,
+            self.content_digest,
+        )
+
     def compatible_with(self, other, check_location=True):
         """
         Check for compatibility with other Grid.
@@ -210,6 +269,9 @@ class Grid(GridBase):
         if not isinstance(other, Grid):
             return False
 
+        if self is other or self.fingerprint == other.fingerprint:
+            return True
+
         if isinstance(self, StructuredGrid) != isinstance(other, StructuredGrid):
             return False
 
@@ -224,10 +286,12 @@ class Grid(GridBase):
         if check_location and self.data_shape != other.data_shape:
             return False
 
-        return (
-            np.allclose(self.points, other.points)
+        return _geometry_close(
+            self,
+            other,
+            lambda: np.allclose(self.points, other.points)
             and np.all(self.cells == other.cells)
-            and np.all(self.cell_types == other.cell_types)
+            and np.all(self.cell_types == other.cell_types),
         )
 
     def __eq__(self, other):
@@ -335,28 +399,37 @@ class StructuredGrid(Grid):
 
     @property
     def points(self):
-        """np.ndarray: Grid points in given order starting top left corner."""
-        return gen_points(
-            axes=self.axes,
-            order=point_order(self.order, self.axes_reversed),
-            axes_increase=self.axes_increase,
+        """np.ndarray: Grid points in given order starting top left corner (read-only, cached)."""
+        return self._cached(
+            "points",
+            lambda: gen_points(
+                axes=self.axes,
+                order=point_order(self.order, self.axes_reversed),
+                axes_increase=self.axes_increase,
+            ),
         )
 
     @property
     def cells(self):
-        """np.ndarray: Cell nodes in ESMF format."""
-        return gen_cells(
-            dims=self.dims,
-            order=point_order(self.order, self.axes_reversed),
+        """np.ndarray: Cell nodes in ESMF format (read-only, cached)."""
+        return self._cached(
+            "cells",
+            lambda: gen_cells(
+                dims=self.dims,
+                order=point_order(self.order, self.axes_reversed),
+            ),
         )
 
     @property
     def cell_centers(self):
-        """np.ndarray: Grid cell centers in given order starting top left corner."""
-        return gen_points(
-            axes=self.cell_axes,
-            order=point_order(self.order, self.axes_reversed),
-            axes_increase=self.axes_increase,
+        """np.ndarray: Grid cell centers in given order starting top left corner (read-only, cached)."""
+        return self._cached(
+            "cell_centers",
+            lambda: gen_points(
+                axes=self.cell_axes,
+                order=point_order(self.order, self.axes_reversed),
+                axes_increase=self.axes_increase,
+            ),
         )
 
     @property
@@ -366,7 +439,10 @@ class StructuredGrid(Grid):
 
     @property
     def cell_types(self):
-        """np.ndarray: Cell types."""
+        """np.ndarray: Cell types (read-only, cached)."""
+        return self._cached("cell_types", self._gen_cell_types)
+
+    def _gen_cell_types(self):
         if self.mesh_dim == 0:
             return np.full(self.cell_count, CellType.VERTEX, dtype=int)
         if self.mesh_dim == 1:
@@ -400,6 +476,23 @@ class StructuredGrid(Grid):
             np.maximum(dims - 1, 1) if self.data_location == Location.CELLS else dims
         )
 
+    def _gen_content_digest(self):
+        return content_digest(*self.axes)
+
+    @property
+    def fingerprint(self):
+        """tuple: Hashable fingerprint of the grid. Equal fingerprints indicate equal grids."""
+        return (
+            "StructuredGrid",
+            self.dim,
+            str(self.crs),
+            self.order,
+            self.data_location,
+            self.axes_reversed,
+            tuple(bool(inc) for inc in self.axes_increase),
+            self.content_digest,
+        )
+
     def compatible_with(self, other, check_location=True):
         """
         Check for compatibility with other Grid.
@@ -422,6 +515,9 @@ class StructuredGrid(Grid):
         if not isinstance(other, StructuredGrid):
             return False
 
+        if self is other or self.fingerprint == other.fingerprint:
+            return True
+
         if not (
             self.dim == other.dim
             and equal_crs(self.crs, other.crs)
@@ -436,9 +532,15 @@ class StructuredGrid(Grid):
         ):
             return False
 
-        return all(np.allclose(a, b) for a, b in zip(self.axes, other.axes))
+        return _geometry_close(
+            self,
+            other,
+            lambda: all(np.allclose(a, b) for a, b in zip(self.axes, other.axes)),
+        )
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if not self.compatible_with(other):
             return False
 
@@ -577,16 +679,103 @@ class StructuredGrid(Grid):
 
         Returns
         -------
-        callable
-            data transformation
+        StructuredTransform or None
+            data transformation, None if the grids are equal
         """
         if not self.compatible_with(other):
             raise ValueError("get_transform_to: grids are not compatible.")
 
-        def trans(data):
-            """Transformation."""
-            # could be optimized
-            return other.from_canonical(self.to_canonical(data))
-
         # only use trans if grids are compatible but NOT equal
-        return None if self == other else trans
+        if self == other:
+            return None
+
+        # flips cancel out if both grids have the same axis direction
+        flip = [
+            self.dim - 1 - i if self.axes_reversed else i
+            for i in range(self.dim)
+            if self.axes_increase[i] != other.axes_increase[i]
+        ]
+        transpose = self.axes_reversed != other.axes_reversed
+        return StructuredTransform(self.data_shape, flip, transpose)
+
+
+class StructuredTransform:
+    """
+    Transformation of data between compatible structured grids.
+
+    Compiled once from the axes order and directions of both grids.
+    The transformation is a strided view of the data, flipping and transposing its axes,
+    without copying the data.
+
+    Parameters
+    ----------
+    data_shape : tuple of int
+        Data shape of the source grid.
+    flip : list of int
+        Data axes of the source grid to flip.
+    transpose : bool
+        Whether to reverse the order of the data axes after flipping.
+    """
+
+    __slots__ = ("data_shape", "flip", "transpose", "_index", "_axes")
+
+    def __init__(self, data_shape, flip, transpose):
+        self.data_shape = tuple(data_shape)
+        self.flip = tuple(flip)
+        self.transpose = transpose
+
+        dim = len(self.data_shape)
+        # index and axes for data with a leading time axis
+        self._index = (slice(None),) + tuple(
+            slice(None, None, -1) if i in self.flip else slice(None) for i in range(dim)
+        )
+        self._axes = (0,) + tuple(range(dim, 0, -1))
+
+    def __call__(self, data):
+        """
+        Transform data of a single time step.
+
+        Parameters
+        ----------
+        data : arraylike
+            Data in the shape of the source grid.
+
+        Returns
+        -------
+        arraylike
+            Transformed data, a view of the given data.
+
+        Raises
+        ------
+        ValueError
+            When data has wrong shape.
+        """
+        return self.stacked(np.expand_dims(data, 0))[0]
+
+    def stacked(self, data):
+        """
+        Transform data with a leading time axis in a single step.
+
+        Parameters
+        ----------
+        data : arraylike
+            Data in the shape of the source grid, with a leading time axis.
+
+        Returns
+        -------
+        arraylike
+            Transformed data, a view of the given data.
+
+        Raises
+        ------
+        ValueError
+            When data has wrong shape.
+        """
+        if np.shape(data)[1:] != self.data_shape:
+            msg = f"transform: data has wrong shape. Expected {self.data_shape}, got {np.shape(data)[1:]}."
+            raise ValueError(msg)
+        if self.flip:
+            data = data[self._index]
+        if self.transpose:
+            data = np.transpose(data, self._axes)
+        return data
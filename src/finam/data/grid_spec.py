@@ -87,6 +87,11 @@ class NoGrid(GridBase):
         """
         return isinstance(other, NoGrid) and self.data_shape == other.data_shape
 
+    @property
+    def fingerprint(self):
+        """tuple: Hashable fingerprint of the grid. Equal fingerprints indicate equal grids."""
+        return ("NoGrid", tuple(self.data_shape))
+
     def __eq__(self, other):
         return self.compatible_with(other)
 
@@ -143,6 +148,8 @@ class RectilinearGrid(StructuredGrid):
         self._crs = crs
         self._data_shape = None
         self._data_size = None
+        self._geometry_cache = {}
+        self._content_digest = self._gen_content_digest()
 
     def to_unstructured(self):
         """
@@ -153,10 +160,11 @@ class RectilinearGrid(StructuredGrid):
         UnstructuredGrid
             Grid as unstructured grid.
         """
+        # the unstructured grid owns its geometry
         return UnstructuredGrid(
-            points=self.points,
-            cells=self.cells,
-            cell_types=self.cell_types,
+            points=np.array(self.points),
+            cells=np.array(self.cells),
+            cell_types=np.array(self.cell_types),
             data_location=self.data_location,
             order=self.order,
             axes_attributes=self.axes_attributes,
@@ -183,6 +191,12 @@ class RectilinearGrid(StructuredGrid):
             self._data_size = super().data_size
         return self._data_size
 
+    def clear_cache(self):
+        """Clear cached grid properties. Needs to be called after modifying the grid in place."""
+        super().clear_cache()
+        self._data_shape = None
+        self._data_size = None
+
     @property
     def axes(self):
         """list of np.ndarray: Grid points."""
@@ -363,6 +377,7 @@ class UniformGrid(RectilinearGrid):
         )
         # pylint: disable-next=protected-access
         grid._axes_increase = self.axes_increase
+        grid.clear_cache()
         return grid
 
 
@@ -525,6 +540,7 @@ class UnstructuredGrid(Grid):
         if len(self.axes_names) != self.dim:
             raise ValueError("UnstructuredGrid: wrong length of 'axes_names'")
         self._crs = crs
+        self._content_digest = self._gen_content_digest()
 
     @property
     def dim(self):
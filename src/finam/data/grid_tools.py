@@ -1,5 +1,7 @@
 """Grid tools for FINAM."""
 
+import hashlib
+import weakref
 from enum import Enum, IntEnum
 from math import isclose, nan
 
@@ -27,9 +29,86 @@ def equal_crs(crs1, crs2):
         return True
     if crs1 is None or crs2 is None:
         return False
+    if isinstance(crs1, str) and crs1 == crs2:
+        return True
     return pyproj.crs.CRS(crs1) == pyproj.crs.CRS(crs2)
 
 
+def content_digest(*arrays):
+    """
+    Digest of the content of arrays, including their shapes and data types.
+
+    Parameters
+    ----------
+    *arrays : arraylike
+        Arrays to digest.
+
+    Returns
+    -------
+    bytes
+        16 byte digest. Equal digests indicate equal arrays.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(f"{array.dtype.str}{array.shape}".encode())
+        digest.update(array.view(np.uint8) if array.ndim else array.tobytes())
+    return digest.digest()
+
+
+_GRID_REGISTRY = weakref.WeakValueDictionary()
+
+
+def _freeze(value):
+    # hashable representation of nested metadata
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, np.ndarray):
+        return (value.dtype.str, value.shape, value.tobytes())
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+def intern_grid(grid):
+    """
+    Get a shared instance for the given grid.
+
+    Grids of the same class with equal :attr:`.GridBase.fingerprint`, axes names and axes attributes
+    are represented by the same instance,
+    so that comparisons are mostly identity checks and grid data is not held multiple times.
+    Grids are held by weak references, so the registry does not keep grids alive.
+
+    Interned grids are shared between components and should not be modified.
+
+    Parameters
+    ----------
+    grid : GridBase or None
+        The grid to intern.
+
+    Returns
+    -------
+    GridBase or None
+        The interned grid.
+    """
+    if grid is None:
+        return None
+    key = (
+        grid.__class__,
+        grid.fingerprint,
+        _freeze(getattr(grid, "axes_names", None)),
+        _freeze(getattr(grid, "axes_attributes", None)),
+    )
+    interned = _GRID_REGISTRY.get(key)
+    if interned is None:
+        _GRID_REGISTRY[key] = interned = grid
+    return interned
+
+
 def gen_axes_attributes(crs, axes_attributes=None):
     """
     Generate axes attributes from CRS.
@@ -1,6 +1,7 @@
 """Data tools for FINAM."""
 
 from .core import (
+    ValidationPlan,
     assert_type,
     check,
     full,
@@ -27,28 +28,35 @@ from .mask import (
 )
 from .units import (
     UNITS,
+    LightQuantity,
     check_quantified,
     clear_units_cache,
     compatible_units,
+    convert_units,
     equivalent_units,
     get_dimensionality,
     get_magnitude,
     get_units,
+    intern_units,
     is_quantified,
     quantify,
+    to_quantity,
     to_units,
 )
 
 __all__ = [
     "UNITS",
     "Info",
+    "LightQuantity",
     "Mask",
+    "ValidationPlan",
     "assert_type",
     "check",
     "check_data_covers_domain",
     "check_quantified",
     "clear_units_cache",
     "compatible_units",
+    "convert_units",
     "equivalent_units",
     "filled",
     "from_compressed",
@@ -59,6 +67,7 @@ __all__ = [
     "get_units",
     "has_masked_values",
     "has_time_axis",
+    "intern_units",
     "is_masked_array",
     "is_quantified",
     "is_sub_mask",
@@ -71,5 +80,6 @@ __all__ = [
     "to_compressed",
     "to_datetime",
     "to_masked",
+    "to_quantity",
     "to_units",
 ]
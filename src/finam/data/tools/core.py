@@ -5,16 +5,20 @@ import datetime
 
 import numpy as np
 import pandas as pd
+import pint
 
 from ...errors import FinamDataError
 from .. import grid_spec
 from ..grid_base import Grid
 from .units import (
     UNITS,
+    LightQuantity,
     check_quantified,
     compatible_units,
+    convert_units,
     equivalent_units,
     get_units,
+    intern_units,
     is_quantified,
 )
 
@@ -29,6 +33,7 @@ def prepare(data, info, time_entries=1, force_copy=False, report_conversion=Fals
 
     Checks tha shape of the data.
     Checks or adds units and time dimension.
+    Converts the data to the data type of the info, if it specifies one.
 
     Parameters
     ----------
@@ -63,6 +68,8 @@ def prepare(data, info, time_entries=1, force_copy=False, report_conversion=Fals
     """
     units_converted = None
     units = info.units
+    if isinstance(data, LightQuantity):
+        data = data.to_quantity()
     if is_quantified(data):
         if not compatible_units(data.units, units):
             raise FinamDataError(
@@ -81,7 +88,7 @@ def prepare(data, info, time_entries=1, force_copy=False, report_conversion=Fals
             )
         if not equivalent_units(data.units, units):
             units_converted = data.units, units
-            data = data.to(units)
+            data = convert_units(data, units)
         elif force_copy:
             data = data.copy()
     else:
@@ -108,6 +115,10 @@ def prepare(data, info, time_entries=1, force_copy=False, report_conversion=Fals
 
     data = _check_input_shape(data, info, time_entries)
 
+    dtype = info.dtype
+    if dtype is not None and data.magnitude.dtype != dtype:
+        data = UNITS.Quantity(data.magnitude.astype(dtype), data.units)
+
     if report_conversion:
         return data, units_converted
     return data
@@ -269,7 +280,7 @@ def full_like(xdata, value):
 
     Parameters
     ----------
-    xdata : :class:`pint.Quantity` or :class:`numpy.ndarray`
+    xdata : :class:`pint.Quantity` or :class:`LightQuantity` or :class:`numpy.ndarray`
         The reference object input.
     value : scalar
         Value to fill the new object with before returning it.
@@ -281,6 +292,8 @@ def full_like(xdata, value):
         with the data filled with fill_value.
         Units will be taken from the input if present.
     """
+    if isinstance(xdata, LightQuantity):
+        xdata = xdata.to_quantity()
     data = np.full_like(xdata, value)
     if is_quantified(xdata):
         return UNITS.Quantity(data, xdata.units)
@@ -337,6 +350,12 @@ def check(xdata, info):
             f"Got {get_units(xdata)}, expected {info.units}."
         )
 
+    if info.dtype is not None and xdata.magnitude.dtype != info.dtype:
+        raise FinamDataError(
+            f"check: given data has wrong data type. "
+            f"Got {xdata.magnitude.dtype}, expected {info.dtype}."
+        )
+
 
 def _check_shape(shape, grid):
     if isinstance(grid, Grid) and shape != grid.data_shape:
@@ -351,6 +370,221 @@ def _check_shape(shape, grid):
         )
 
 
+class ValidationPlan:
+    """
+    Validation plan for the data of a slot, compiled once from its :class:`.Info`.
+
+    Data that already has the expected units, shape, mask kind and data type passes
+    :meth:`.prepare`, :meth:`.pack` and :meth:`.check` with a few cheap comparisons.
+    All other data is handled by :func:`.prepare` and :func:`.check`, with the same results.
+
+    Parameters
+    ----------
+    info : Info
+        Info associated with the data. Must not be changed after the plan was created.
+    """
+
+    __slots__ = ("info", "units", "dtype", "_units", "_masked", "_data_shape", "_ndim")
+
+    def __init__(self, info):
+        self.info = info
+        self.units = intern_units(info.units)
+        self.dtype = info.dtype
+        self._units = self.units._units  # pylint: disable=protected-access
+        self._masked = info.is_masked
+
+        self._data_shape = None
+        self._ndim = None
+        if isinstance(info.grid, Grid):
+            self._data_shape = tuple(info.grid.data_shape)
+            self._ndim = len(self._data_shape) + 1
+
+    def prepare(self, data, report_conversion=False):
+        """
+        Prepares data in FINAM's internal transmission format.
+
+        See :func:`.prepare` for details.
+
+        Parameters
+        ----------
+        data : arraylike
+            The input data.
+        report_conversion : bool, optional
+            If true, returns a tuple with the second element indicating the unit conversion if it was required.
+
+        Returns
+        -------
+        pint.Quantity or tuple(pint.Quantity, tuple(pint.Unit, pint.Unit) or None)
+            The prepared data.
+
+        Raises
+        ------
+        FinamDataError
+            If the data doesn't match the info.
+        """
+        if isinstance(data, LightQuantity):
+            data = data.to_quantity()
+        if isinstance(data, pint.Quantity):
+            if self.matches(data):
+                return (data, None) if report_conversion else data
+        elif isinstance(data, np.ndarray) and self._passes_shape(data):
+            data = UNITS.Quantity(data, self.units)
+            return (data, None) if report_conversion else data
+
+        return prepare(data, self.info, report_conversion=report_conversion)
+
+    def pack(self, data, report_conversion=False):
+        """
+        Prepares data for transport between slots, as a :class:`.LightQuantity`.
+
+        Like :meth:`.prepare`, but data that matches the plan is wrapped without creating a :class:`pint.Quantity`.
+
+        Parameters
+        ----------
+        data : arraylike
+            The input data.
+        report_conversion : bool, optional
+            If true, returns a tuple with the second element indicating the unit conversion if it was required.
+
+        Returns
+        -------
+        LightQuantity or tuple(LightQuantity, tuple(pint.Unit, pint.Unit) or None)
+            The prepared data.
+
+        Raises
+        ------
+        FinamDataError
+            If the data doesn't match the info.
+        """
+        conversion = None
+        if isinstance(data, LightQuantity):
+            if not self.matches(data):
+                data, conversion = prepare(data, self.info, report_conversion=True)
+                data = LightQuantity(data.magnitude, self.units, data)
+        elif isinstance(data, pint.Quantity):
+            if not self.matches(data):
+                data, conversion = prepare(data, self.info, report_conversion=True)
+            data = LightQuantity(data.magnitude, self.units, data)
+        elif isinstance(data, np.ndarray) and self._passes_shape(data):
+            data = LightQuantity(data, self.units)
+        else:
+            data, conversion = prepare(data, self.info, report_conversion=True)
+            data = LightQuantity(data.magnitude, self.units, data)
+
+        return (data, conversion) if report_conversion else data
+
+    def pack_trusted(self, data, report_conversion=False):
+        """
+        Prepares trusted data for transport between slots, only checking its shape.
+
+        Used for data of slots that were validated before, e.g. in production runs.
+        The time dimension is added to data of the grid shape without further checks.
+        Data that needs unit conversion, masking, casting or reshaping is prepared by :meth:`.pack`.
+
+        Parameters
+        ----------
+        data : arraylike
+            The input data.
+        report_conversion : bool, optional
+            If true, returns a tuple with the second element indicating the unit conversion if it was required.
+
+        Returns
+        -------
+        LightQuantity or tuple(LightQuantity, tuple(pint.Unit, pint.Unit) or None)
+            The prepared data.
+
+        Raises
+        ------
+        FinamDataError
+            If the data shape doesn't match the grid shape.
+        """
+        if isinstance(data, LightQuantity):
+            units = data.units
+            array = data.magnitude
+        elif isinstance(data, pint.Quantity):
+            units = data.units
+            array = data.magnitude
+        else:
+            units = self.units
+            array = data
+
+        if (
+            self._data_shape is None
+            or not isinstance(array, np.ndarray)
+            or array.ndim < self._ndim - 1
+            or (units is not self.units and units != self.units)
+            or (self._masked and not np.ma.isMaskedArray(array))
+            or (self.dtype is not None and array.dtype != self.dtype)
+        ):
+            return self.pack(data, report_conversion=report_conversion)
+
+        if array.shape == self._data_shape:
+            array = array[np.newaxis, ...]
+        elif array.ndim != self._ndim or array.shape[1:] != self._data_shape:
+            raise FinamDataError(
+                f"Data shape doesn't match grid shape. "
+                f"Got {array.shape}, expected {self._data_shape}"
+            )
+
+        data = LightQuantity(array, self.units)
+        return (data, None) if report_conversion else data
+
+    def check(self, xdata):
+        """
+        Check if data matches the info.
+
+        See :func:`.check` for details.
+
+        Parameters
+        ----------
+        xdata : pint.Quantity or LightQuantity
+            The given data array.
+
+        Raises
+        ------
+        FinamDataError
+            If data doesn't match the info.
+        """
+        if not self.matches(xdata):
+            check(xdata, self.info)
+
+    def matches(self, xdata):
+        """
+        Whether data already has the expected units, shape, mask kind and data type.
+
+        Parameters
+        ----------
+        xdata : Any
+            The given data.
+
+        Returns
+        -------
+        bool
+            Whether the data matches the plan exactly.
+        """
+        if isinstance(xdata, LightQuantity):
+            units = xdata.units
+            if units is not self.units and units != self.units:
+                return False
+        elif isinstance(xdata, pint.Quantity):
+            units = xdata._units  # pylint: disable=protected-access
+            if units is not self._units and units != self._units:
+                return False
+        else:
+            return False
+        return self._passes_shape(xdata.magnitude)
+
+    def _passes_shape(self, array):
+        return (
+            self._data_shape is not None
+            and isinstance(array, np.ndarray)
+            and array.ndim == self._ndim
+            and array.shape[1:] == self._data_shape
+            and (not self._masked or np.ma.isMaskedArray(array))
+            and (self.dtype is None or array.dtype == self.dtype)
+        )
+
+
 def assert_type(cls, slot, obj, types):
     """Type assertion."""
     for t in types:
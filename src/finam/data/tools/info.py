@@ -2,13 +2,15 @@
 
 import copy
 import datetime
+import hashlib
 
 import numpy as np
 
 from ...errors import FinamMetaDataError
 from ..grid_base import GridBase
+from ..grid_tools import intern_grid
 from .mask import MASK_INDICATORS, Mask, mask_specified, masks_compatible, masks_equal
-from .units import UNITS, compatible_units
+from .units import compatible_units, intern_units
 
 
 def _format_mask(mask):
@@ -19,6 +21,10 @@ def _format_mask(mask):
     return str(mask)
 
 
+def _is_mask_array(mask):
+    return isinstance(mask, np.ndarray) and mask is not np.ma.nomask
+
+
 class Info:
     """Data info containing grid specification and metadata
 
@@ -38,6 +44,12 @@ class Info:
             * :any:`Mask.NONE`: data is unmasked and given as plain numpy array
             * valid boolean mask for MaskedArray
 
+    dtype : :class:`numpy.dtype` or str or None, optional
+        data type of the data, default: None (any data type).
+
+        Outputs convert pushed data to their data type.
+        If not given for an output, it is taken from the first target that requests one.
+        Inputs can request a different data type of the same kind, e.g. an upcast from ``float32`` to ``float64``.
     **meta_kwargs
         additional metadata by name, will overwrite entries in ``meta``
 
@@ -47,20 +59,30 @@ class Info:
         grid specification
     meta : dict
         dictionary of metadata
+
+    Notes
+    -----
+    Units and grids are interned (see :func:`.intern_units` and :func:`.intern_grid`),
+    so that equal units and grids share the same instance.
+    Mask arrays are compared by a digest that is computed once per mask,
+    so they should not be modified in place, but replaced.
     """
 
-    def __init__(self, time=None, grid=None, meta=None, mask=Mask.FLEX, **meta_kwargs):
-        self._time = self._grid = self._mask = None
+    __slots__ = ("_time", "_grid", "_mask", "_mask_key", "_dtype", "meta")
+
+    def __init__(
+        self, time=None, grid=None, meta=None, mask=Mask.FLEX, dtype=None, **meta_kwargs
+    ):
+        self._time = self._grid = self._mask = self._mask_key = self._dtype = None
         self.time = time
         self.grid = grid
         self.mask = mask
-        # set meta last (see __setattr__)
+        self.dtype = dtype
         self.meta = meta or {}
         self.meta.update(meta_kwargs)
         # handle units
         units = self.meta.get("units", "")
-        units = None if units is None else UNITS.Unit(units)
-        self.meta["units"] = units
+        self.meta["units"] = None if units is None else intern_units(units)
 
     @property
     def time(self):
@@ -84,7 +106,7 @@ class Info:
         if grid is not None and not isinstance(grid, GridBase):
             msg = "Grid in Info must be either None or of a sub-class of GridBase"
             raise FinamMetaDataError(msg)
-        self._grid = grid
+        self._grid = intern_grid(grid)
 
     @property
     def mask(self):
@@ -103,6 +125,22 @@ class Info:
                 msg = "Mask in Info not compatible with given grid."
                 raise FinamMetaDataError(msg)
         self._mask = mask
+        self._mask_key = None
+
+    @property
+    def dtype(self):
+        """numpy.dtype or None: data type."""
+        return self._dtype
+
+    @dtype.setter
+    def dtype(self, dtype):
+        if dtype is not None:
+            try:
+                dtype = np.dtype(dtype)
+            except TypeError as err:
+                msg = f"dtype in Info must be either None or a valid numpy dtype, got {dtype}"
+                raise FinamMetaDataError(msg) from err
+        self._dtype = dtype
 
     @property
     def grid_shape(self):
@@ -125,6 +163,36 @@ class Info:
         """Copies the info object"""
         return copy.copy(self)
 
+    def _shallow_copy(self, meta):
+        # copy without re-validating and re-parsing attributes
+        other = object.__new__(self.__class__)
+        for name in Info.__slots__:
+            object.__setattr__(other, name, getattr(self, name))
+        object.__setattr__(other, "meta", meta)
+        return other
+
+    def _mask_digest(self):
+        # digest of a mask array, computed once per mask
+        if self._mask_key is None:
+            mask = np.ascontiguousarray(self._mask)
+            digest = hashlib.blake2b(mask.view(np.uint8), digest_size=16).digest()
+            self._mask_key = (mask.shape, digest)
+        return self._mask_key
+
+    def _same_mask(self, other):
+        """Cheap check whether the masks of both infos are equal. False if undecided."""
+        this_array = _is_mask_array(self._mask)
+        if self._mask is other._mask and not this_array:
+            return True
+        # mask arrays are grid specific (reversed axes, decreasing axis)
+        if self._grid is not other._grid:
+            return False
+        if self._mask is other._mask:
+            return True
+        if not this_array or not _is_mask_array(other._mask):
+            return False
+        return self._mask_digest() == other._mask_digest()
+
     def copy_with(self, use_none=True, **kwargs):
         """Copies the info object and sets variables and meta values according to the kwargs
 
@@ -135,9 +203,7 @@ class Info:
         **kwargs
             key values pairs for properties to change
         """
-        other = Info(
-            time=self.time, grid=self.grid, meta=copy.copy(self.meta), mask=self.mask
-        )
+        other = self._shallow_copy(copy.copy(self.meta))
         for k, v in kwargs.items():
             if k == "time":
                 if v is not None or use_none:
@@ -148,9 +214,12 @@ class Info:
             elif k == "mask":
                 if v is not None or use_none:
                     other.mask = v
+            elif k == "dtype":
+                if v is not None or use_none:
+                    other.dtype = v
             elif k == "units":
                 if v is not None or use_none:
-                    other.meta[k] = v if v is None else UNITS.Unit(v)
+                    other.meta[k] = v if v is None else intern_units(v)
             else:
                 if v is not None or use_none:
                     other.meta[k] = v
@@ -161,7 +230,7 @@ class Info:
         """
         Tests whether this info can accept/is compatible with an incoming info.
 
-        Tested attributes are: "grid", "mask" and "units"
+        Tested attributes are: "grid", "mask", "units" and "dtype"
 
         Parameters
         ----------
@@ -182,13 +251,21 @@ class Info:
             return False
 
         success = True
-        if self.grid is not None and not self.grid.compatible_with(incoming.grid):
+        if (
+            self.grid is not None
+            and self.grid is not incoming.grid
+            and not self.grid.compatible_with(incoming.grid)
+        ):
             if not (incoming_downstream and incoming.grid is None):
                 fail_info["grid"] = (incoming.grid, self.grid)
                 success = False
 
-        if self.mask is not None and not masks_compatible(
-            self.mask, incoming.mask, incoming_downstream, self.grid, incoming.grid
+        if (
+            self.mask is not None
+            and not self._same_mask(incoming)
+            and not masks_compatible(
+                self.mask, incoming.mask, incoming_downstream, self.grid, incoming.grid
+            )
         ):
             if not (incoming_downstream and incoming.mask is None):
                 fail_info["mask"] = (incoming.mask, self.mask)
@@ -196,42 +273,61 @@ class Info:
 
         u1_none = (u1 := self.units) is None
         u2_none = (u2 := incoming.units) is None
-        if not u1_none and (u2_none or not compatible_units(u1, u2)):
+        if not u1_none and (u2_none or (u1 is not u2 and not compatible_units(u1, u2))):
             if not (incoming_downstream and u2_none):
                 fail_info["units"] = (u2, u1)
                 success = False
 
+        if self.dtype is not None and incoming.dtype is not None:
+            src, trg = (
+                (self.dtype, incoming.dtype)
+                if incoming_downstream
+                else (incoming.dtype, self.dtype)
+            )
+            if not np.can_cast(src, trg, casting="same_kind"):
+                fail_info["dtype"] = (incoming.dtype, self.dtype)
+                success = False
+
         return success
 
     def __copy__(self):
         """Shallow copy of the info"""
-        return Info(time=self.time, grid=self.grid, meta=self.meta, mask=self.mask)
+        return self._shallow_copy(self.meta)
 
     def __eq__(self, other):
         """Equality check for two infos
 
         Ignores time.
         """
+        if self is other:
+            return True
         if not isinstance(other, Info):
             return False
         return (
-            self.grid == other.grid
+            (self.grid is other.grid or self.grid == other.grid)
+            and self.dtype == other.dtype
             and self.meta == other.meta
-            and masks_equal(self.mask, other.mask, self.grid, other.grid)
+            and (
+                self._same_mask(other)
+                or masks_equal(self.mask, other.mask, self.grid, other.grid)
+            )
         )
 
     def __getattr__(self, name):
-        # only called if attribute is not present in class
-        if "meta" in self.__dict__ and name in self.meta:
+        # only called if attribute is not present in class or slot not yet set
+        if name in Info.__slots__:
+            raise AttributeError(f"'Info' object has no attribute '{name}'")
+        try:
             return self.meta[name]
-        raise AttributeError(f"'Info' object has no attribute '{name}'")
+        except KeyError:
+            raise AttributeError(f"'Info' object has no attribute '{name}'") from None
 
     def __setattr__(self, name, value):
-        # first check if attribute present or meta not yet present (e.g. grid)
-        if name in self.__dir__() or "meta" not in self.__dict__:
-            super().__setattr__(name, value)
+        # class attributes (properties, slots) are set directly, everything else goes to meta
+        if name in _INFO_ATTRIBUTES:
+            object.__setattr__(self, name, value)
         else:
-            self.__dict__["meta"][name] = value
+            self.meta[name] = value
 
     def __repr__(self):
         grid = self.grid.name if self.grid is not None else "None"
@@ -239,7 +335,8 @@ class Info:
         meta += ", ".join(
             f"{k}=" + ("None" if v is None else f"'{v}'") for k, v in self.meta.items()
         )
-        return f"Info(grid={grid}, mask={_format_mask(self.mask)}{meta})"
+        dtype = "" if self.dtype is None else f", dtype='{self.dtype}'"
+        return f"Info(grid={grid}, mask={_format_mask(self.mask)}{dtype}{meta})"
 
     def as_dict(self):
         """Returns a ``dict`` containing all metadata in this Info."""
@@ -248,4 +345,8 @@ class Info:
             "mask": _format_mask(self.mask),
             "grid": f"{self.grid}",
             "units": f"{self.units:~}",
+            "dtype": None if self.dtype is None else f"{self.dtype}",
         }
+
+
+_INFO_ATTRIBUTES = frozenset(dir(Info))
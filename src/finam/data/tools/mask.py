@@ -5,7 +5,7 @@ from enum import Enum
 import numpy as np
 
 from ...errors import FinamDataError
-from .units import UNITS, is_quantified, quantify
+from .units import UNITS, LightQuantity, is_quantified, quantify
 
 MASK_INDICATORS = ["_FillValue", "missing_value"]
 
@@ -52,6 +52,8 @@ def has_masked_values(data):
     bool
         Whether the data is a MaskedArray and has any masked values.
     """
+    if isinstance(data, LightQuantity):
+        data = data.to_quantity()
     return np.ma.is_masked(data)
 
 
@@ -138,6 +140,8 @@ def to_compressed(xdata, order="C", mask=None):
     :func:`numpy.ma.compressed`:
         Numpy routine doing the same but only for C-order.
     """
+    if isinstance(xdata, LightQuantity):
+        xdata = xdata.to_quantity()
     is_masked = is_masked_array(xdata)
     if is_masked or (mask is not None and mask_specified(mask)):
         data = np.ravel(xdata.data if is_masked else xdata, order)
@@ -189,6 +193,8 @@ def from_compressed(xdata, shape, order="C", mask=None, **kwargs):
     -----
     If both `mask` and `shape` are given, they need to match in size.
     """
+    if isinstance(xdata, LightQuantity):
+        xdata = xdata.to_quantity()
     if mask is None or mask is np.ma.nomask or not mask_specified(mask):
         if kwargs and mask is Mask.NONE:
             msg = "from_compressed: Can't create masked array with mask=Mask.NONE"
@@ -227,6 +233,8 @@ def check_data_covers_domain(data, mask=None):
     ValueError
         When mask is given and mask and data don't share the same shape.
     """
+    if isinstance(data, LightQuantity):
+        data = data.to_quantity()
     if not _is_single_mask_value(mask) and np.shape(mask) != np.shape(data):
         raise ValueError("check_data_covers_domain: mask and data shape differ.")
     if not has_masked_values(data):
@@ -14,6 +14,105 @@ pint.application_registry.default_format = "cf"
 UNITS = pint.application_registry
 
 _UNIT_PAIRS_CACHE = {}
+_INTERNED_UNITS = {}
+
+
+class LightQuantity:
+    """
+    Lightweight container of a data array and its units, used to transport data between slots.
+
+    Holds the magnitude and an interned :class:`pint.Unit` (see :func:`.intern_units`),
+    without the overhead of :class:`pint.Quantity` creation and attribute access.
+    A :class:`pint.Quantity` is only created by :meth:`.to_quantity`,
+    e.g. when an input hands the data to a component.
+
+    Accepted by the functions in :mod:`finam.data.tools` like a :class:`pint.Quantity`.
+    Functions that do not return the given data return a :class:`pint.Quantity`.
+
+    Parameters
+    ----------
+    magnitude : numpy.ndarray
+        The data array.
+    units : str or pint.Unit
+        Units of the data.
+    quantity : pint.Quantity, optional
+        Quantity the container was created from, returned by :meth:`.to_quantity`.
+    """
+
+    __slots__ = ("magnitude", "units", "_quantity")
+
+    def __init__(self, magnitude, units, quantity=None):
+        self.magnitude = magnitude
+        self.units = intern_units(units)
+        self._quantity = quantity
+
+    @property
+    def shape(self):
+        """tuple: Shape of the data."""
+        return self.magnitude.shape
+
+    @property
+    def ndim(self):
+        """int: Number of dimensions of the data."""
+        return self.magnitude.ndim
+
+    @property
+    def size(self):
+        """int: Number of elements of the data."""
+        return self.magnitude.size
+
+    @property
+    def nbytes(self):
+        """int: Number of bytes of the data."""
+        return self.magnitude.nbytes
+
+    @property
+    def dtype(self):
+        """numpy.dtype: Data type of the data."""
+        return self.magnitude.dtype
+
+    @property
+    def dimensionality(self):
+        """pint.UnitsContainer: Dimensionality of the data."""
+        return self.units.dimensionality
+
+    def to_quantity(self):
+        """
+        The data as a :class:`pint.Quantity`, sharing memory with the container.
+
+        Returns
+        -------
+        pint.Quantity
+            The quantified data.
+        """
+        if self._quantity is None:
+            self._quantity = _make_quantity(self.magnitude, self.units)
+        return self._quantity
+
+    def copy(self):
+        """
+        A copy of the container and its data.
+
+        Returns
+        -------
+        LightQuantity
+            The copied data.
+        """
+        return LightQuantity(self.magnitude.copy(), self.units)
+
+    def __getitem__(self, key):
+        return LightQuantity(self.magnitude[key], self.units)
+
+    def __len__(self):
+        return len(self.magnitude)
+
+    def __eq__(self, other):
+        if isinstance(other, LightQuantity):
+            other = other.to_quantity()
+        return self.to_quantity() == other
+
+    def __repr__(self):
+        return f"LightQuantity({self.magnitude!r}, '{self.units}')"
 
 
 def get_magnitude(xdata):
@@ -22,7 +121,7 @@ def get_magnitude(xdata):
 
     Parameters
     ----------
-    xdata : pint.Quantity
+    xdata : pint.Quantity or LightQuantity
         The given data array.
 
     Returns
@@ -58,7 +157,7 @@ def get_dimensionality(xdata):
 
     Parameters
     ----------
-    xdata : pint.Quantity
+    xdata : pint.Quantity or LightQuantity
         The given data array.
 
     Returns
@@ -70,13 +169,13 @@ def get_dimensionality(xdata):
     return xdata.dimensionality
 
 
-def to_units(xdata, units, check_equivalent=False, report_conversion=False):
+def to_units(xdata, units, check_equivalent=False, report_conversion=False, out=None):
     """
     Convert data to given units.
 
     Parameters
     ----------
-    xdata : pint.Quantity
+    xdata : pint.Quantity or LightQuantity
         The given data array.
     units : str or pint.Unit
         Desired units.
@@ -84,11 +183,14 @@ def to_units(xdata, units, check_equivalent=False, report_conversion=False):
         Checks for equivalent units and simply re-assigns if possible.
     report_conversion : bool, optional
         If true, returns a tuple with the second element indicating the unit conversion if it was required.
+    out : numpy.ndarray, optional
+        Array of the same shape to write the converted magnitude into, e.g. a reusable buffer.
+        Only used if a conversion is required.
 
     Returns
     -------
-    pint.Quantity or tuple(pint.Quantity, tuple(pint.Unit, pint.Unit) or None)
-        The converted data.
+    pint.Quantity or LightQuantity or tuple(pint.Quantity or LightQuantity, tuple(pint.Unit, pint.Unit) or None)
+        The converted data, of the same type as the given data.
 
         If ``report_conversion`` is ``True``, a tuple is returned with the second element
         indicating the unit conversion if it was required.
@@ -97,14 +199,17 @@ def to_units(xdata, units, check_equivalent=False, report_conversion=False):
         and a tuple of two :class:`pint.Unit` objects otherwise.
     """
     check_quantified(xdata, "to_units")
-    units = _get_pint_units(units)
+    units = intern_units(units)
     units2 = xdata.units
     conversion = None
-    if units != units2:
+    if units is not units2 and units != units2:
         if check_equivalent and equivalent_units(units, units2):
-            xdata = UNITS.Quantity(xdata.magnitude, units)
+            if isinstance(xdata, LightQuantity):
+                xdata = LightQuantity(xdata.magnitude, units)
+            else:
+                xdata = UNITS.Quantity(xdata.magnitude, units)
         else:
-            xdata = xdata.to(units)
+            xdata = convert_units(xdata, units, out=out)
             conversion = units2, units
 
     if report_conversion:
@@ -126,7 +231,27 @@ def is_quantified(xdata):
     bool
         Whether the data is a quantified DataArray.
     """
-    return isinstance(xdata, pint.Quantity)
+    return isinstance(xdata, (pint.Quantity, LightQuantity))
+
+
+def to_quantity(xdata):
+    """
+    Get quantified data as a :class:`pint.Quantity`.
+
+    Parameters
+    ----------
+    xdata : pint.Quantity or LightQuantity
+        The given data array.
+
+    Returns
+    -------
+    pint.Quantity
+        The data as a quantity, sharing memory with the given data.
+    """
+    if isinstance(xdata, LightQuantity):
+        return xdata.to_quantity()
+    check_quantified(xdata, "to_quantity")
+    return xdata
 
 
 def quantify(xdata, units=None):
@@ -177,12 +302,56 @@ def _get_pint_units(var):
     if isinstance(var, pint.Unit):
         return var
 
+    if isinstance(var, LightQuantity):
+        return var.units
+
     if isinstance(var, pint.Quantity):
         return var.units or UNITS.dimensionless
 
     return UNITS.Unit(var)
 
 
+def intern_units(units):
+    """
+    Get a shared :class:`pint.Unit` instance for the given units.
+
+    Equal units are represented by the same instance, so that comparisons are mostly identity checks.
+    Parsed strings are cached.
+
+    Parameters
+    ----------
+    units : UnitLike or Quantified
+        The given units.
+
+    Returns
+    -------
+    pint.Unit
+        The interned units.
+    """
+    if isinstance(units, pint.Unit):
+        key = units._units  # pylint: disable=protected-access
+    elif isinstance(units, str):
+        key = units
+    else:
+        return intern_units(_get_pint_units(units))
+
+    interned = _INTERNED_UNITS.get(key)
+    if interned is None:
+        unit = _get_pint_units(units)
+        # pylint: disable-next=protected-access
+        interned = _INTERNED_UNITS.setdefault(unit._units, unit)
+        _INTERNED_UNITS[key] = interned
+    return interned
+
+
+def _make_quantity(magnitude, units):
+    """Creates a quantity from an array and units, without the checks of the constructor."""
+    quantity = object.__new__(UNITS.Quantity)
+    quantity._magnitude = magnitude  # pylint: disable=protected-access
+    quantity._units = units._units  # pylint: disable=protected-access
+    return quantity
+
+
 def compatible_units(unit1, unit2):
     """
     Checks if two units are compatible/convertible.
@@ -231,19 +400,104 @@ def equivalent_units(unit1, unit2):
     return comp_equiv[1]
 
 
+def convert_units(xdata, units, out=None):
+    """
+    Convert data to given units, without checks for equivalence.
+
+    Uses the affine conversion ``value * scale + offset`` cached for the pair of units.
+    Falls back to :meth:`pint.Quantity.to` for non-affine conversions, like logarithmic units.
+
+    Parameters
+    ----------
+    xdata : pint.Quantity or LightQuantity
+        The given data array.
+    units : str or pint.Unit
+        Desired units.
+    out : numpy.ndarray, optional
+        Array of the same shape to write the converted magnitude into, e.g. a reusable buffer.
+        Must not be used for masked arrays.
+
+    Returns
+    -------
+    pint.Quantity or LightQuantity
+        The converted data, of the same type as the given data.
+
+    Raises
+    ------
+    FinamDataError
+        If the units are not compatible.
+    """
+    units = intern_units(units)
+    units2 = xdata.units
+    comp_equiv = _UNIT_PAIRS_CACHE.get((units2, units))
+    if comp_equiv is None:
+        comp_equiv = _cache_units(units2, units)
+
+    compat, _equiv, conversion = comp_equiv
+    if not compat:
+        raise FinamDataError(f"Can't convert units from {units2} to {units}")
+
+    light = isinstance(xdata, LightQuantity)
+    if conversion is None:
+        magnitude = to_quantity(xdata).to(units).magnitude
+        if out is not None:
+            out[...] = magnitude
+            magnitude = out
+    else:
+        scale, offset = conversion
+        magnitude = xdata.magnitude
+        if out is None:
+            magnitude = magnitude * scale
+            if offset != 0.0:
+                magnitude += offset
+        else:
+            magnitude = np.multiply(magnitude, scale, out=out)
+            if offset != 0.0:
+                np.add(magnitude, offset, out=magnitude)
+
+    if light:
+        return LightQuantity(magnitude, units)
+    return _make_quantity(magnitude, units)
+
+
 def _cache_units(unit1, unit2):
     equiv = False
     compat = False
+    conversion = None
     try:
         equiv = np.isclose((1.0 * unit1).to(unit2).magnitude, 1.0)
         compat = True
     except pint.errors.DimensionalityError:
         pass
 
-    _UNIT_PAIRS_CACHE[(unit1, unit2)] = compat, equiv
-    return compat, equiv
+    if compat:
+        conversion = _affine_conversion(unit1, unit2)
+
+    _UNIT_PAIRS_CACHE[(unit1, unit2)] = compat, equiv, conversion
+    return compat, equiv, conversion
+
+
+def _affine_conversion(unit1, unit2):
+    """Determines ``(scale, offset)`` of the conversion between two units, or None if it is not affine."""
+    try:
+        values = np.array([0.0, 1.0, 1000.0])
+        converted = UNITS.Quantity(values, unit1).to(unit2).magnitude
+    except pint.errors.PintError:
+        return None
+
+    offset = float(converted[0])
+    if offset == 0.0:
+        scale = float(converted[1])
+    else:
+        scale = float((converted[2] - converted[0]) / 1000.0)
+
+    if not np.allclose(converted, values * scale + offset, rtol=1e-12, atol=0.0):
+        return None
+
+    return scale, offset
 
 
 def clear_units_cache():
     """Clears the units cache"""
     _UNIT_PAIRS_CACHE.clear()
+    _INTERNED_UNITS.clear()
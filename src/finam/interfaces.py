@@ -16,6 +16,7 @@ Interfaces
     :noindex: Loggable
     :noindex: NoBranchAdapter
 """
+
 import logging
 from abc import ABC, abstractmethod
 from enum import Enum
@@ -370,8 +371,8 @@ class IOutput(ABC):
 
         Parameters
         ----------
-        data : array_like
-            Data set to push.
+        data : array_like or callable
+            Data set to push, or a deferred producer ``producer(time)`` returning the data set.
         time : :class:`datetime <datetime.datetime>`
             Simulation time of the data set.
         """
@@ -418,6 +419,21 @@ class IOutput(ABC):
             Raises the error if no data is available
         """
 
+    def notify_pull(self, time, target):
+        """Notifies the output that a target received data for the given time without pulling it.
+
+        Used by slots that share results among targets, like pure adapters,
+        so that upstream outputs can still clear their data cache.
+        Does nothing by default.
+
+        Parameters
+        ----------
+        time : :class:`datetime <datetime.datetime>`
+            Simulation time of the pull.
+        target : :class:`.IInput`
+            End point that received the data.
+        """
+
     @abstractmethod
     def get_info(self, info):
         """Exchange and get the output's data info.
@@ -10,9 +10,11 @@ Composition
     :noindex: Composition
 """
 
+import heapq
 import logging
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor, wait
 from datetime import datetime
 from pathlib import Path
 from time import strftime
@@ -36,7 +38,9 @@ from .interfaces import (
     NoBranchAdapter,
     NoDependencyAdapter,
 )
+from .sdk import Output, OutputDemand
 from .tools.log_helper import ErrorLogger, is_loggable
+from .tools.memory_helper import MemoryBudget, get_codec
 
 
 class Composition(Loggable):
@@ -77,8 +81,25 @@ class Composition(Loggable):
         When the limit is exceeded, data is stored to disk under the path of ``slot_memory_location``.
         Default: no limit (``None``).
     slot_memory_location : str, optional
-        Location for storing data when exceeding ``slot_memory_limit``.
+        Location for storing data when exceeding ``slot_memory_limit`` or ``memory_budget``.
         Default: "temp".
+    memory_budget : int, optional
+        Memory budget for the data of all outputs and adapters together, in bytes.
+        When the budget is exceeded, the least recently used data is stored to disk
+        under the path of ``slot_memory_location``.
+        Data is no longer accounted for as soon as no connected input needs it.
+        See :attr:`.memory_budget` for querying the current usage.
+        Default: no budget (``None``).
+    slot_memory_codec : str or Codec, optional
+        Codec for compressing data stored to disk.
+        One of ``"zlib"``, ``"lzma"`` and ``"shuffle"``, or a :class:`.tools.Codec`.
+        See :data:`.tools.CODECS` for details.
+        Default: no compression (``None``).
+    slot_validate_pushes : int, optional
+        Number of pushes to each output that are fully validated.
+        After that, pushed data is only checked for its shape, see :attr:`.Output.validate_pushes`.
+        Use this for production runs of compositions that were tested before.
+        Default: all pushes are validated (``None``).
     """
 
     def __init__(
@@ -90,6 +111,9 @@ class Composition(Loggable):
         log_level=logging.INFO,
         slot_memory_limit=None,
         slot_memory_location="temp",
+        memory_budget=None,
+        slot_memory_codec=None,
+        slot_validate_pushes=None,
     ):
         super().__init__()
         # setup logger
@@ -121,6 +145,9 @@ class Composition(Loggable):
         self._components = components
         self._adapters = set()
         self._dependencies = None
+        self._time_components = None
+        self._footprints = None
+        self._prefetch_slots = None
         self._input_owners = None
         self._output_owners = None
         self._is_connected = False
@@ -129,6 +156,12 @@ class Composition(Loggable):
 
         self._slot_memory_limit = slot_memory_limit
         self._slot_memory_location = slot_memory_location
+        with ErrorLogger(self.logger):
+            self._slot_memory_codec = get_codec(slot_memory_codec)
+        self._slot_validate_pushes = slot_validate_pushes
+        self._memory_budget = (
+            None if memory_budget is None else MemoryBudget(memory_budget)
+        )
 
         # initialize
         self.logger.info("init composition")
@@ -153,6 +186,13 @@ class Composition(Loggable):
                     out.memory_limit = self._slot_memory_limit
                 if out.memory_location is None:
                     out.memory_location = self._slot_memory_location
+                if isinstance(out, Output):
+                    if out.memory_budget is None:
+                        out.memory_budget = self._memory_budget
+                    if out.memory_codec is None:
+                        out.memory_codec = self._slot_memory_codec
+                    if out.validate_pushes is None:
+                        out.validate_pushes = self._slot_validate_pushes
 
             self._check_status(comp, [ComponentStatus.INITIALIZED])
 
@@ -195,6 +235,11 @@ class Composition(Loggable):
                 ada.memory_limit = self._slot_memory_limit
             if ada.memory_location is None:
                 ada.memory_location = self._slot_memory_location
+            if isinstance(ada, Output):
+                if ada.memory_budget is None:
+                    ada.memory_budget = self._memory_budget
+                if ada.memory_codec is None:
+                    ada.memory_codec = self._slot_memory_codec
 
         self._connect_components(start_time)
 
@@ -205,15 +250,25 @@ class Composition(Loggable):
 
         self._output_owners = _map_outputs(self._components)
         self._input_owners = _map_inputs(self._components)
+        self._dependencies = _compile_dependencies(
+            self._components, self._output_owners
+        )
+        self._time_components = set(time_components)
+        self._prefetch_slots = _collect_prefetch_slots(time_components)
+        _compile_demands(self._components, self._input_owners)
 
         self._is_connected = True
         self._time_frame = (start_time, None)
 
-    def run(self, start_time=None, end_time=None):
+    def run(self, start_time=None, end_time=None, executor=None):
         """Run this composition using the loop-based update strategy.
 
         Performs the connect phase if it ``connect()`` was not already called.
 
+        With an ``executor``, components that are due at the same time and
+        share no slots or dependencies are updated concurrently.
+        The result is the same as for the serial update.
+
         Parameters
         ----------
         start_time : :class:`datetime <datetime.datetime>`, optional
@@ -224,6 +279,12 @@ class Composition(Loggable):
         end_time : :class:`datetime <datetime.datetime>`, optional
             Simulation time up to which to simulate.
             Should be ``None`` if no components with time are present.
+        executor : :class:`Executor <concurrent.futures.Executor>`, optional
+            Executor for updating independent components concurrently,
+            e.g. a :class:`ThreadPoolExecutor <concurrent.futures.ThreadPoolExecutor>`.
+            Components are updated in the process they were created in,
+            so process-based executors are not supported.
+            Default: ``None``, components are updated one after another.
         """
         time_components = [m for m in self._components if isinstance(m, ITimeComponent)]
 
@@ -238,6 +299,11 @@ class Composition(Loggable):
                     raise ValueError(
                         "end must be of type datetime for a composition with time components"
                     )
+            if isinstance(executor, ProcessPoolExecutor):
+                raise ValueError(
+                    "executor can't be a ProcessPoolExecutor, "
+                    "as components need to be updated in the process they were created in"
+                )
 
         if not self._is_connected:
             self.connect(start_time)
@@ -245,74 +311,122 @@ class Composition(Loggable):
         self._time_frame = (self._time_frame[0], end_time)
 
         self.logger.info("run composition")
+        queue = _ComponentQueue(time_components, end_time)
         while len(time_components) > 0:
-            sort_components = list(time_components)
-            sort_components.sort(key=lambda m: m.time)
-            to_update = sort_components[0]
-            updated = self._update_recursive(to_update)
-            self._check_status(
-                updated, [ComponentStatus.VALIDATED, ComponentStatus.UPDATED]
-            )
+            if executor is None:
+                batch = [self._update_recursive(queue.first())]
+            else:
+                batch = self._update_concurrent(queue.ready(), executor)
 
-            any_running = False
-            for comp in time_components:
-                if comp.status != ComponentStatus.FINISHED and comp.time < end_time:
-                    any_running = True
-                    break
+            for updated in batch:
+                self._check_status(
+                    updated, [ComponentStatus.VALIDATED, ComponentStatus.UPDATED]
+                )
+                queue.update(updated)
+                if updated in self._prefetch_slots:
+                    for slot in self._prefetch_slots[updated]:
+                        slot.prefetch(updated.next_time)
 
-            if not any_running:
+            if not queue.any_running:
                 break
 
         self._finalize_components()
         self._finalize_composition()
 
-    def _update_recursive(self, comp, chain=None, target_time=None):
-        chain = chain or {}
-        if comp in chain:
-            with ErrorLogger(self.logger):
-                joined = " >> ".join(
-                    [
-                        f"({'*' if delayed else ''}{t or '-'}) {c.name}"
-                        for c, (t, delayed) in reversed(chain.items())
-                    ]
-                )
-                raise FinamCircularCouplingError(
-                    f"Unresolved circular coupling:\n"
-                    f"{comp.name} >> "
-                    f"{joined}\n"
-                    f"(Deltas are time lags of upstream components, * denotes delayed links)\n"
-                    f"You may need to insert a NoDependencyAdapter or ITimeDelayAdapter subclass somewhere, "
-                    f"or increase the adapter's delay."
-                )
-
-        chain[comp] = None
+    def _update_recursive(self, comp):
+        target = self._find_update_target(comp)
+        _update_component(target)
+        return target
+
+    def _update_concurrent(self, candidates, executor):
+        """Updates the targets of the longest prefix of candidates that are independent."""
+        if self._footprints is None:
+            self._footprints = {}
+
+        batch = []
+        batch_footprint = set()
+        for comp in candidates:
+            chain = {}
+            target = self._find_update_target(comp, chain)
+            footprint = set()
+            for c in chain:
+                footprint |= self._footprint(c)
+            footprint |= self._footprint(target)
+
+            if not footprint.isdisjoint(batch_footprint):
+                break
 
-        if isinstance(comp, ITimeComponent):
-            target_time = comp.next_time
+            batch.append(target)
+            batch_footprint |= footprint
+
+        if len(batch) == 1:
+            _update_component(batch[0])
+        else:
+            futures = [executor.submit(_update_component, c) for c in batch]
+            # finish all updates of the batch before raising errors
+            wait(futures)
+            for future in futures:
+                future.result()
+
+        return batch
+
+    def _footprint(self, comp):
+        footprint = self._footprints.get(comp)
+        if footprint is None:
+            footprint = _collect_footprint(
+                comp, self._input_owners, self._output_owners
+            )
+            self._footprints[comp] = footprint
+        return footprint
 
-        deps = _find_dependencies(comp, self._output_owners, target_time)
+    def _find_update_target(self, comp, chain=None, target_time=None):
+        """Finds the time component that needs to be updated to advance ``comp``.
 
-        for dep, (local_time, delayed) in deps.items():
-            c = self._output_owners[dep]
-            if isinstance(c, ITimeComponent):
-                if dep.time < local_time:
-                    chain[comp] = (local_time - dep.time, delayed)
-                    return self._update_recursive(c, chain)
-            else:
-                updated = self._update_recursive(c, chain, local_time)
-                if updated is not None:
-                    return updated
+        Walks the dependencies depth-first, using an explicit stack of
+        iterators over the dependencies of the components visited.
+        Components without time are descended into, and are left again if they
+        do not lead to a lagging time component.
+        Lagging time components are followed directly, as they will always return a target.
+        """
+        if chain is None:
+            chain = {}
+        time_components = self._time_components
+        stack = []
 
-        if isinstance(comp, ITimeComponent):
-            if comp.status != ComponentStatus.FINISHED:
-                comp.update()
+        while True:
+            if comp is not None:
+                if comp in chain:
+                    with ErrorLogger(self.logger):
+                        raise _circular_coupling_error(comp, chain)
+
+                chain[comp] = None
+
+                if comp in time_components:
+                    target_time = comp.next_time
+
+                deps = _resolve_dependencies(self._dependencies[comp], target_time)
+                stack.append((comp, iter(deps.items())))
+                comp = None
+
+            current, deps = stack[-1]
+            for dep, (local_time, delayed) in deps:
+                owner = self._output_owners[dep]
+                if owner in time_components:
+                    if dep.time < local_time:
+                        chain[current] = (local_time - dep.time, delayed)
+                        stack.clear()
+                        comp = owner
+                        break
+                else:
+                    comp = owner
+                    target_time = local_time
+                    break
             else:
-                raise FinamTimeError(
-                    f"Can't update dependency component {comp.name}, as it is already finished."
-                )
-            return comp
-
-        return None
+                stack.pop()
+                if current in time_components:
+                    return current
+                if len(stack) == 0:
+                    return None
 
     def _collect_adapters(self):
         for comp in self._components:
@@ -419,6 +533,20 @@ class Composition(Loggable):
         """Whether this class has a ``base_logger_name`` attribute. False."""
         return False
 
+    @property
+    def memory_budget(self):
+        """
+        The memory budget shared by all outputs and adapters, or None.
+
+        Can be queried during the run for the current usage, e.g. with
+        :attr:`.MemoryBudget.used`, :attr:`.MemoryBudget.spilled` and :meth:`.MemoryBudget.usage`.
+
+        Returns
+        -------
+        MemoryBudget or None
+        """
+        return self._memory_budget
+
     def _check_status(self, comp, desired_list):
         if comp.status not in desired_list:
             with ErrorLogger(comp.logger if is_loggable(comp) else self.logger):
@@ -524,6 +652,143 @@ class Composition(Loggable):
         }
 
 
+def _circular_coupling_error(comp, chain):
+    joined = " >> ".join(
+        [
+            f"({'*' if delayed else ''}{t or '-'}) {c.name}"
+            for c, (t, delayed) in reversed(chain.items())
+        ]
+    )
+    return FinamCircularCouplingError(
+        f"Unresolved circular coupling:\n"
+        f"{comp.name} >> "
+        f"{joined}\n"
+        f"(Deltas are time lags of upstream components, * denotes delayed links)\n"
+        f"You may need to insert a NoDependencyAdapter or ITimeDelayAdapter subclass somewhere, "
+        f"or increase the adapter's delay."
+    )
+
+
+def _update_component(comp):
+    if comp.status != ComponentStatus.FINISHED:
+        comp.update()
+    else:
+        raise FinamTimeError(
+            f"Can't update dependency component {comp.name}, as it is already finished."
+        )
+
+
+def _collect_footprint(component, input_owners, output_owners):
+    """Collects everything that is touched when a component is updated.
+
+    This comprises the component, its inputs and the upstream adapters and outputs it pulls from,
+    as well as its outputs and all downstream adapters and inputs notified on push.
+    Components without time that are reached are expanded as well, as they are executed on pull or push.
+    """
+    footprint = set()
+    components = [component]
+    while len(components) > 0:
+        comp = components.pop()
+        if comp in footprint:
+            continue
+        footprint.add(comp)
+
+        for inp in comp.inputs.values():
+            while isinstance(inp, IInput):
+                footprint.add(inp)
+                inp = inp.source
+            footprint.add(inp)
+            owner = output_owners[inp]
+            if not isinstance(owner, ITimeComponent):
+                components.append(owner)
+
+        for out in comp.outputs.values():
+            targets = [out]
+            while len(targets) > 0:
+                target = targets.pop()
+                footprint.add(target)
+                for trg in target.targets:
+                    if isinstance(trg, IOutput):
+                        targets.append(trg)
+                    else:
+                        footprint.add(trg)
+                        owner = input_owners[trg]
+                        if isinstance(owner, ITimeComponent):
+                            footprint.add(owner)
+                        else:
+                            components.append(owner)
+
+    return footprint
+
+
+class _ComponentQueue:
+    """Priority queue of time components, ordered by their current time.
+
+    Ties are broken by the position of the component in the initial list,
+    equivalent to a stable sort of the components by time.
+    Entries of components that were updated are invalidated lazily.
+
+    Parameters
+    ----------
+    components : list of ITimeComponent
+        Time components to schedule.
+    end_time : :class:`datetime <datetime.datetime>`
+        Simulation time up to which to simulate.
+    """
+
+    def __init__(self, components, end_time):
+        self._end_time = end_time
+        self._index = {comp: i for i, comp in enumerate(components)}
+        self._versions = [0] * len(components)
+        self._running = [self._is_running(comp) for comp in components]
+        self._running_count = sum(self._running)
+        self._heap = [(comp.time, i, 0, comp) for i, comp in enumerate(components)]
+        heapq.heapify(self._heap)
+
+    @property
+    def any_running(self):
+        """Whether any component is not finished and has not reached the end time."""
+        return self._running_count > 0
+
+    def first(self):
+        """The component with the earliest time."""
+        heap = self._heap
+        while True:
+            _time, idx, version, comp = heap[0]
+            if version == self._versions[idx]:
+                return comp
+            heapq.heappop(heap)
+
+    def ready(self):
+        """All components with the earliest time, in order."""
+        heap = self._heap
+        time = self.first().time
+        entries = []
+        while len(heap) > 0 and heap[0][0] == time:
+            entry = heapq.heappop(heap)
+            if entry[2] == self._versions[entry[1]]:
+                entries.append(entry)
+
+        for entry in entries:
+            heapq.heappush(heap, entry)
+
+        return [entry[3] for entry in entries]
+
+    def update(self, comp):
+        """Re-inserts a component after it was updated."""
+        idx = self._index[comp]
+        self._versions[idx] += 1
+        heapq.heappush(self._heap, (comp.time, idx, self._versions[idx], comp))
+
+        running = self._is_running(comp)
+        if running != self._running[idx]:
+            self._running[idx] = running
+            self._running_count += 1 if running else -1
+
+    def _is_running(self, comp):
+        return comp.status != ComponentStatus.FINISHED and comp.time < self._end_time
+
+
 def _collect_adapters_input(inp: IInput, out_adapters: set):
     src = inp.source
     if src is None:
@@ -664,26 +929,110 @@ def _map_inputs(components):
     return in_map
 
 
+def _collect_prefetch_slots(components):
+    """Maps components to the outputs and adapters upstream of their inputs that may store data on disk."""
+    slots = {}
+    for comp in components:
+        comp_slots = []
+        for _, inp in comp.inputs.items():
+            while isinstance(inp, IInput):
+                inp = inp.source
+                if (
+                    isinstance(inp, Output)
+                    and not inp.is_static
+                    and (inp.memory_limit is not None or inp.memory_budget is not None)
+                ):
+                    comp_slots.append(inp)
+        if comp_slots:
+            slots[comp] = comp_slots
+    return slots
+
+
+def _compile_demands(components, input_owners):
+    """Sets the :class:`.OutputDemand` of all non-static outputs of the components."""
+    for comp in components:
+        for _, out in comp.outputs.items():
+            if isinstance(out, Output) and not out.is_static:
+                out.demand = OutputDemand(out, _collect_consumers(out, input_owners))
+
+
+def _collect_consumers(out, input_owners):
+    """Collects the time components pulling from an output.
+
+    Returns ``None`` if the demand can't be determined, i.e. if the output is linked to
+    components without time, or through adapters that need push, delay time or break dependencies.
+    """
+    consumers = {}
+    targets = [out]
+    while len(targets) > 0:
+        target = targets.pop()
+        for trg in target.targets:
+            if isinstance(trg, IAdapter):
+                if trg.needs_push or isinstance(
+                    trg, (ITimeDelayAdapter, NoDependencyAdapter)
+                ):
+                    return None
+                targets.append(trg)
+            else:
+                owner = input_owners[trg]
+                if not isinstance(owner, ITimeComponent):
+                    return None
+                consumers[owner] = None
+
+    return list(consumers)
+
+
 def _find_dependencies(component, output_owners, target_time):
-    deps = {}
+    return _resolve_dependencies(
+        _compile_component_dependencies(component, output_owners), target_time
+    )
+
+
+def _compile_dependencies(components, output_owners):
+    return {
+        comp: _compile_component_dependencies(comp, output_owners)
+        for comp in components
+    }
+
+
+def _compile_component_dependencies(component, output_owners):
+    """Resolves the static dependency information of all inputs of a component.
+
+    Returns a list of tuples ``(output, owner_has_time, delay_adapter)``,
+    where ``delay_adapter`` is the :class:`.ITimeDelayAdapter` that determines the
+    time lag of the link, or ``None``.
+    Inputs that are static or linked through a :class:`.NoDependencyAdapter` are omitted.
+    """
+    dependencies = []
     for _, inp in component.inputs.items():
-        local_time = target_time
-        delayed = False
+        delay = None
         while isinstance(inp, IInput):
             inp = inp.source
             if isinstance(inp, NoDependencyAdapter):
                 break
             if isinstance(inp, ITimeDelayAdapter):
-                local_time = inp.with_delay(target_time)
-                delayed = True
+                delay = inp
 
         if not isinstance(inp, NoDependencyAdapter) and not inp.is_static:
-            comp = output_owners[inp]
-            if not isinstance(comp, ITimeComponent) or (
-                isinstance(comp, ITimeComponent) and inp.time < local_time
-            ):
-                if inp not in deps or local_time > deps[inp][0]:
-                    deps[inp] = (local_time, delayed)
+            owner = output_owners[inp]
+            dependencies.append((inp, isinstance(owner, ITimeComponent), delay))
+
+    return dependencies
+
+
+def _resolve_dependencies(dependencies, target_time):
+    deps = {}
+    for out, owner_has_time, delay in dependencies:
+        if delay is None:
+            local_time = target_time
+            delayed = False
+        else:
+            local_time = delay.with_delay(target_time)
+            delayed = True
+
+        if not owner_has_time or out.time < local_time:
+            if out not in deps or local_time > deps[out][0]:
+                deps[out] = (local_time, delayed)
 
     return deps
 
@@ -14,11 +14,12 @@ Software development kit
     :noindex: CallbackOutput
     :noindex: Input
     :noindex: Output
+    :noindex: OutputDemand
 """
 from .adapter import Adapter, TimeDelayAdapter
 from .component import Component, TimeComponent
 from .input import CallbackInput, Input
-from .output import CallbackOutput, Output
+from .output import CallbackOutput, Output, OutputDemand
 
 __all__ = [
     "Adapter",
@@ -29,4 +30,5 @@ __all__ = [
     "CallbackOutput",
     "Input",
     "Output",
+    "OutputDemand",
 ]
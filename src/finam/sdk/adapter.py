@@ -13,7 +13,7 @@ from ..errors import FinamLogError, FinamMetaDataError, FinamTimeError
 from ..interfaces import IAdapter, IOutput, ITimeDelayAdapter
 from ..tools.log_helper import ErrorLogger, is_loggable
 from .input import Input
-from .output import Output
+from .output import Output, TimeMemo
 
 
 class Adapter(IAdapter, Input, Output, ABC):
@@ -38,6 +38,7 @@ class Adapter(IAdapter, Input, Output, ABC):
         self._name = self.__class__.__name__
         self._source = None
         self._targets = []
+        self._memo = TimeMemo()
 
     def with_name(self, name):
         """Renames the adapter and returns self."""
@@ -74,6 +75,15 @@ class Adapter(IAdapter, Input, Output, ABC):
         """bool: if the adapter needs push."""
         return False
 
+    @property
+    def is_pure(self):
+        """bool: if the adapter is stateless, i.e. its data only depends on the pull time.
+
+        The data of pure adapters with multiple targets is computed only once per time.
+        Stateless adapters can overwrite this property to return ``True``.
+        """
+        return False
+
     @property
     def metadata(self):
         """
@@ -191,8 +201,8 @@ class Adapter(IAdapter, Input, Output, ABC):
             Simulation time of the notification.
         """
 
-    def get_data(self, time, target):
-        """Get the transformed data of this adapter.
+    def get_light_data(self, time, target):
+        """Get the transformed data of this adapter, for transport to an input.
 
         Internally calls :meth:`._get_data`.
 
@@ -205,7 +215,7 @@ class Adapter(IAdapter, Input, Output, ABC):
 
         Returns
         -------
-        :class:`pint.Quantity`
+        :class:`.LightQuantity`
             Transformed data-set for the requested time.
         """
         self.logger.debug("get data")
@@ -213,10 +223,23 @@ class Adapter(IAdapter, Input, Output, ABC):
             with ErrorLogger(self.logger):
                 raise FinamTimeError("Time must be of type datetime")
 
+        if not self.is_pure:
+            return self._transform_data(time, target)
+
+        if time is None or self._memo.target_count < 2:
+            return self._transform_data(time, target)
+        return self._memo.get(
+            time,
+            target,
+            lambda: self._transform_data(time, target),
+            lambda: self.notify_pull(time, target),
+        )
+
+    def _transform_data(self, time, target):
         data = self._get_data(time, target)
 
         with ErrorLogger(self.logger):
-            xdata, conv = tools.prepare(data, self._output_info, report_conversion=True)
+            xdata, conv = self._validation_plan().pack(data, report_conversion=True)
             if conv is not None:
                 self.logger.profile(
                     "converted units from %s to %s (%d entries)", *conv, xdata.size
@@ -285,8 +308,24 @@ class Adapter(IAdapter, Input, Output, ABC):
 
     def pinged(self, source):
         """Called when receiving a ping from a downstream input."""
+        self._memo.add_target(source)
         self._source.pinged(self if self.needs_push else source)
 
+    def notify_pull(self, time, target):
+        """Notifies the adapter that a target received data for the given time without pulling it.
+
+        Forwards the notification to the source, unless the adapter needs push.
+
+        Parameters
+        ----------
+        time : :class:`datetime <datetime.datetime>`
+            Simulation time of the pull.
+        target : :class:`.IInput`
+            End point that received the data.
+        """
+        if not self.needs_push:
+            self._source.notify_pull(time, target)
+
     @final
     def exchange_info(self, info=None):
         """Exchange the data info with the input's source.
@@ -365,6 +404,8 @@ class Adapter(IAdapter, Input, Output, ABC):
         """Called at the end of each run. Calls :meth:`._finalize`."""
         self.logger.debug("finalize")
         self._finalize()
+        self._clear_memory()
+        self._memo.clear()
 
     def _finalize(self):
         """Called at the end of each run. Overwrite this for cleanup."""
@@ -377,8 +418,8 @@ class TimeDelayAdapter(Adapter, ITimeDelayAdapter, ABC):
         super().__init__()
         self.initial_time = None
 
-    def get_data(self, time, target):
-        """Get the transformed data of this adapter.
+    def get_light_data(self, time, target):
+        """Get the transformed data of this adapter, for transport to an input.
 
         Internally calls :meth:`._get_data`.
 
@@ -391,7 +432,7 @@ class TimeDelayAdapter(Adapter, ITimeDelayAdapter, ABC):
 
         Returns
         -------
-        :class:`pint.Quantity`
+        :class:`.LightQuantity`
             Transformed data-set for the requested time.
         """
         self.logger.debug("get data")
@@ -405,13 +446,28 @@ class TimeDelayAdapter(Adapter, ITimeDelayAdapter, ABC):
         self._pulled(time)
 
         with ErrorLogger(self.logger):
-            xdata, conv = tools.prepare(data, self._output_info, report_conversion=True)
+            xdata, conv = self._validation_plan().pack(data, report_conversion=True)
             if conv is not None:
                 self.logger.profile(
                     "converted units from %s to %s (%d entries)", *conv, xdata.size
                 )
             return xdata
 
+    def notify_pull(self, time, target):
+        """Notifies the adapter that a target received data for the given time without pulling it.
+
+        Forwards the notification to the source, with the delayed time.
+
+        Parameters
+        ----------
+        time : :class:`datetime <datetime.datetime>`
+            Simulation time of the pull.
+        target : :class:`.IInput`
+            End point that received the data.
+        """
+        if not self.needs_push:
+            self._source.notify_pull(self.with_delay(time), target)
+
     def _get_data(self, time, target):
         """Get the output's data-set for the given time.
 
@@ -8,10 +8,12 @@ from datetime import datetime
 import numpy as np
 
 from ..data import tools
+from ..data.grid_base import StructuredTransform
 from ..data.tools import Info
 from ..errors import FinamMetaDataError
 from ..interfaces import IInput, IOutput, Loggable
 from ..tools.log_helper import ErrorLogger
+from .output import Output
 
 
 class Input(IInput, Loggable):
@@ -33,6 +35,7 @@ class Input(IInput, Loggable):
         self._in_info_exchanged = False
         self._cached_data = None
         self._transform = None
+        self._in_plan = None
 
     @property
     def name(self):
@@ -127,36 +130,67 @@ class Input(IInput, Loggable):
 
         if self.is_static:
             if self._cached_data is None:
-                data = self._source.get_data(time, target or self)
+                data = self._get_source_data(time, target or self)
                 with ErrorLogger(self.logger):
                     self._cached_data = self._convert_and_check(data)
             data = self._cached_data
         else:
-            data = self._source.get_data(time, target or self)
+            data = self._get_source_data(time, target or self)
             with ErrorLogger(self.logger):
                 data = self._convert_and_check(data)
 
         return data
 
+    def _get_source_data(self, time, target):
+        """Gets data from the source, as a :class:`.LightQuantity` if the source supports it.
+
+        Outputs overwriting :meth:`.Output.get_data` are pulled through their :meth:`.Output.get_data`.
+        """
+        source = self._source
+        if isinstance(source, Output) and type(source).get_data is Output.get_data:
+            return source.get_light_data(time, target)
+        return source.get_data(time, target)
+
     def _convert_and_check(self, data):
+        plan = self._in_plan
+        if plan is None or plan.info is not self._input_info:
+            plan = self._in_plan = tools.ValidationPlan(self._input_info)
+
         # transform compatible data between grids
         if self._transform is not None:
             with ErrorLogger(self.logger):
-                data = np.stack([self._transform(d) for d in data], axis=0)
+                if isinstance(self._transform, StructuredTransform):
+                    magnitude = self._transform.stacked(data.magnitude)
+                else:
+                    magnitude = np.stack(
+                        [self._transform(d) for d in data.magnitude], axis=0
+                    )
+                data = tools.LightQuantity(magnitude, data.units)
             self.logger.profile(
                 "converted data between compatible grids (%d entries)", data.size
             )
+        elif plan.matches(data):
+            return tools.to_quantity(data)
 
         # convert units
         data, conv = tools.to_units(
-            data, self._input_info.units, check_equivalent=True, report_conversion=True
+            data, plan.units, check_equivalent=True, report_conversion=True
         )
         if conv is not None:
             self.logger.profile(
                 "converted units from %s to %s (%d entries)", *conv, data.size
             )
-        tools.check(data, self._input_info)
-        return data
+        # convert data type
+        if plan.dtype is not None and data.dtype != plan.dtype:
+            self.logger.profile(
+                "converted data type from %s to %s (%d entries)",
+                data.dtype,
+                plan.dtype,
+                data.size,
+            )
+            data = tools.LightQuantity(data.magnitude.astype(plan.dtype), data.units)
+        plan.check(data)
+        return tools.to_quantity(data)
 
     def ping(self):
         """Pings upstream to inform outputs about the number of connected inputs.
@@ -209,7 +243,12 @@ class Input(IInput, Loggable):
                 )
 
         self._input_info = src_info.copy_with(
-            use_none=False, time=info.time, grid=info.grid, mask=info.mask, **info.meta
+            use_none=False,
+            time=info.time,
+            grid=info.grid,
+            mask=info.mask,
+            dtype=info.dtype,
+            **info.meta,
         )
         self._in_info_exchanged = True
         with ErrorLogger(self.logger):
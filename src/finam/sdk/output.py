@@ -2,9 +2,12 @@
 Implementations of IOutput
 """
 
+import bisect
+import contextlib
 import logging
 import os
 from datetime import datetime
+from itertools import islice
 
 import numpy as np
 
@@ -19,6 +22,7 @@ from ..errors import (
 )
 from ..interfaces import IAdapter, IInput, IOutput, Loggable
 from ..tools.log_helper import ErrorLogger
+from ..tools.memory_helper import ArenaBlock, MemoryArena, get_codec
 
 
 # pylint: disable=too-many-public-methods
@@ -28,7 +32,7 @@ class Output(IOutput, Loggable):
     def __init__(self, name=None, info=None, static=False, **info_kwargs):
         Loggable.__init__(self)
         self._targets = []
-        self.data = []
+        self.data = DataCache()
         self._output_info = None
         self.base_logger_name = None
         if name is None:
@@ -50,7 +54,13 @@ class Output(IOutput, Loggable):
         self._mem_limit = None
         self._mem_location = None
         self._total_mem = 0
-        self._mem_counter = 0
+        self._arena = None
+        self._mem_budget = None
+        self._mem_codec = None
+        self._out_plan = None
+        self._validate_pushes = None
+        self._pushes = 0
+        self._demand = OutputDemand(self)
 
     @property
     def name(self):
@@ -107,6 +117,53 @@ class Output(IOutput, Loggable):
         """The memory-mapping location for this slot"""
         self._mem_location = directory
 
+    @property
+    def memory_budget(self):
+        """The :class:`.MemoryBudget` shared with other slots, or None"""
+        return self._mem_budget
+
+    @memory_budget.setter
+    def memory_budget(self, budget):
+        """The :class:`.MemoryBudget` shared with other slots, or None"""
+        self._mem_budget = budget
+
+    @property
+    def memory_codec(self):
+        """The :class:`.Codec` for compressing data stored to disk, or None"""
+        return self._mem_codec
+
+    @memory_codec.setter
+    def memory_codec(self, codec):
+        """The :class:`.Codec` for compressing data stored to disk, or None.
+
+        Can also be the name of a codec, see :func:`.get_codec`.
+        """
+        self._mem_codec = get_codec(codec)
+
+    @property
+    def demand(self):
+        """:class:`.OutputDemand`: Demand for the output's data by downstream components."""
+        return self._demand
+
+    @demand.setter
+    def demand(self, demand):
+        """:class:`.OutputDemand`: Demand for the output's data by downstream components."""
+        self._demand = demand
+
+    @property
+    def validate_pushes(self):
+        """Number of pushes that are fully validated, or None for all pushes"""
+        return self._validate_pushes
+
+    @validate_pushes.setter
+    def validate_pushes(self, count):
+        """Number of pushes that are fully validated, or None for all pushes.
+
+        After that, pushed data is only checked for its shape (see :meth:`.ValidationPlan.pack_trusted`),
+        and not whether it shares memory with previously pushed data.
+        """
+        self._validate_pushes = count
+
     def has_info(self):
         """Returns if the output has a data info.
 
@@ -154,10 +211,15 @@ class Output(IOutput, Loggable):
 
         Should notify targets, and can handle the provided date.
 
+        Data can also be pushed as a deferred producer ``producer(time)``,
+        which is only called when a target pulls data resolving to this entry.
+        The result is validated and cached like directly pushed data.
+        The producer must not depend on state that changes in later steps.
+
         Parameters
         ----------
-        data : array_like
-            Data set to push.
+        data : array_like or callable
+            Data set to push, or a producer ``producer(time)`` returning the data set.
         time : :class:`datetime <datetime.datetime>`
             Simulation time of the data set.
         """
@@ -180,20 +242,39 @@ class Output(IOutput, Loggable):
                 )
             time = None
 
+        if callable(data):
+            with self._cache_lock():
+                self.data.append((time, _Deferred(data, time)))
+            self._time = time
+            self.logger.trace("data cache: %d (deferred)", len(self.data))
+            self.notify_targets(time)
+            return
+
+        validate = self._validates_push()
         with ErrorLogger(self.logger):
-            xdata, conv = tools.prepare(data, self.info, report_conversion=True)
-            if len(self.data) > 0 and not isinstance(self.data[-1][1], str):
-                d = self.data[-1][1]
-                if np.may_share_memory(d.data, xdata.data):
-                    raise FinamDataError(
-                        "Received data that shares memory with previously received data."
-                    )
+            plan = self._validation_plan()
+            if validate:
+                xdata, conv = plan.pack(data, report_conversion=True)
+            else:
+                xdata, conv = plan.pack_trusted(data, report_conversion=True)
             if conv is not None:
                 self.logger.profile(
                     "converted units from %s to %s (%d entries)", *conv, xdata.size
                 )
-            xdata = self._pack(xdata)
-            self.data.append((time, xdata))
+            with self._cache_lock():
+                if (
+                    validate
+                    and len(self.data) > 0
+                    and not isinstance(self.data[-1][1], (ArenaBlock, _Deferred))
+                ):
+                    d = self.data[-1][1]
+                    if np.may_share_memory(d.magnitude, xdata.magnitude):
+                        raise FinamDataError(
+                            "Received data that shares memory with previously received data."
+                        )
+                self._pushes += 1
+                xdata = self._pack(xdata)
+                self.data.append((time, xdata))
 
         self._time = time
 
@@ -214,6 +295,18 @@ class Output(IOutput, Loggable):
             with ErrorLogger(self.logger):
                 raise FinamMetaDataError("Metadata must be of type Info")
         self._output_info = info
+        self._out_plan = None
+
+    def _validates_push(self):
+        """Whether the next pushed data is fully validated, see :attr:`.validate_pushes`."""
+        return self._validate_pushes is None or self._pushes < self._validate_pushes
+
+    def _validation_plan(self):
+        """The validation plan for the output info, compiled at the first use."""
+        plan = self._out_plan
+        if plan is None or plan.info is not self._output_info:
+            plan = self._out_plan = tools.ValidationPlan(self._output_info)
+        return plan
 
     def notify_targets(self, time):
         """Notify all targets by calling their ``source_updated(time)`` method.
@@ -246,6 +339,32 @@ class Output(IOutput, Loggable):
         :class:`pint.Quantity`
             data-set for the requested time.
 
+        Raises
+        ------
+        FinamNoDataError
+            Raises the error if no data is available
+        """
+        return tools.to_quantity(self.get_light_data(time, target))
+
+    def get_light_data(self, time, target):
+        """Get the output's data-set for the given time, for transport to an input.
+
+        Like :meth:`.get_data`, but without creating a :class:`pint.Quantity`.
+        Used by :class:`.Input`, which creates the quantity only when handing the data to a component.
+        Subclasses overwriting :meth:`.get_data` must overwrite this method as well.
+
+        Parameters
+        ----------
+        time : :class:`datetime <datetime.datetime>`
+            simulation time to get the data for.
+        target : :class:`.IInput` or None
+            Requesting end point of this pull.
+
+        Returns
+        -------
+        :class:`.LightQuantity`
+            data-set for the requested time.
+
         Raises
         ------
         FinamNoDataError
@@ -260,58 +379,148 @@ class Output(IOutput, Loggable):
             raise FinamNoDataError(f"No data info available in {self.name}")
         if self._out_infos_exchanged < len(self._connected_inputs):
             raise FinamNoDataError(f"Data info was not yet exchanged in {self.name}")
-        if len(self.data) == 0:
-            raise FinamNoDataError(f"No data available in {self.name}")
 
-        with ErrorLogger(self.logger):
-            data = (
-                self._unpack(self.data[0][1])
-                if self.is_static
-                else self._interpolate(time)
-            )
+        with self._cache_lock():
+            if len(self.data) == 0:
+                raise FinamNoDataError(f"No data available in {self.name}")
 
-        if not self.is_static:
-            data_count = len(self.data)
-            self._clear_data(time, target)
+            with ErrorLogger(self.logger):
+                data = self._unpack_at(0) if self.is_static else self._interpolate(time)
 
-            if len(self.data) < data_count:
-                self.logger.trace(
-                    "reduced data cache: %d -> %d", data_count, len(self.data)
-                )
+            if not self.is_static:
+                data_count = len(self.data)
+                self._clear_data(time, target)
+
+                if len(self.data) < data_count:
+                    self.logger.trace(
+                        "reduced data cache: %d -> %d", data_count, len(self.data)
+                    )
 
         return data
 
+    def notify_pull(self, time, target):
+        """Notifies the output that a target received data for the given time without pulling it.
+
+        Parameters
+        ----------
+        time : :class:`datetime <datetime.datetime>`
+            Simulation time of the pull.
+        target : :class:`.IInput`
+            End point that received the data.
+        """
+        if not self.is_static and target in self._connected_inputs:
+            with self._cache_lock():
+                self._clear_data(time, target)
+
+    def _cache_lock(self):
+        # data of slots sharing a memory budget can be spilled by other slots and threads
+        budget = self.memory_budget
+        return contextlib.nullcontext() if budget is None else budget.lock
+
     def _pack(self, data):
         data_size = data.nbytes
-        if self.memory_limit is not None and 0 <= self.memory_limit < (
-            self._total_mem + data_size
-        ):
-            fn = os.path.join(
-                self.memory_location or "", f"{id(self)}-{self._mem_counter}.npy"
-            )
-            self.logger.profile(
-                "dumping data to file %s (total RAM %0.2f MB)",
-                fn,
-                self._total_mem / 1048576,
+        budget = self.memory_budget
+        if not data.dtype.hasobject and (
+            (
+                self.memory_limit is not None
+                and 0 <= self.memory_limit < (self._total_mem + data_size)
             )
-            self._mem_counter += 1
-            np.save(fn, data.magnitude)
-            return fn
+            or (budget is not None and not budget.reserve(data_size))
+        ):
+            return self._store(data)
 
         self._total_mem += data_size
+        if budget is not None and not data.dtype.hasobject:
+            budget.add(self, data)
         self.logger.trace(
             "keeping data in RAM (total RAM %0.2f MB)", self._total_mem / 1048576
         )
         return data
 
+    def _store(self, data):
+        if self._arena is None:
+            self._arena = MemoryArena(
+                os.path.join(self.memory_location or "", f"{id(self)}"),
+                asynchronous=True,
+                codec=self.memory_codec,
+            )
+        block = self._arena.store(data.magnitude)
+        self.logger.profile(
+            "dumping data to arena %s (total RAM %0.2f MB)",
+            self._arena.paths[block.segment],
+            self._total_mem / 1048576,
+        )
+        return block
+
+    def prefetch(self, time):
+        """Reads data for the given time ahead if it was stored to disk.
+
+        Called by the scheduler with the time of the next pull of downstream components.
+        Loading is done in the background, so that the next pull is faster.
+
+        Parameters
+        ----------
+        time : :class:`datetime <datetime.datetime>`
+            Simulation time of the next pull.
+        """
+        with self._cache_lock():
+            if self._arena is None or self.is_static or len(self.data) == 0:
+                return
+
+            i = self.data.bisect(time)
+            for j in (i - 1, i):
+                if 0 <= j < len(self.data):
+                    where = self.data[j][1]
+                    if isinstance(where, ArenaBlock):
+                        self._arena.prefetch(where)
+
+    def _spill(self, data):
+        for i, (t, d) in enumerate(self.data):
+            if d is data:
+                self._total_mem -= data.nbytes
+                self.data[i] = (t, self._store(data))
+                return True
+        return False
+
     def _unpack(self, where):
-        if isinstance(where, str):
-            self.logger.profile("reading data from file %s", where)
-            data = np.load(where, allow_pickle=True)
-            return tools.UNITS.Quantity(data, self.info.units)
+        if isinstance(where, ArenaBlock):
+            self.logger.profile("reading data from arena %s", where)
+            data = self._arena.load(where)
+            return tools.LightQuantity(data, self.info.units)
 
+        if self.memory_budget is not None:
+            self.memory_budget.touch(where)
         return where
 
+    def _unpack_at(self, index):
+        time, where = self.data[index]
+        if isinstance(where, _Deferred):
+            where = self._evaluate(where)
+            self.data[index] = (time, where)
+        return self._unpack(where)
+
+    def _evaluate(self, deferred):
+        self.logger.trace("evaluating deferred data")
+        data = deferred.producer(deferred.time)
+
+        with ErrorLogger(self.logger):
+            xdata, conv = self._validation_plan().pack(data, report_conversion=True)
+            if conv is not None:
+                self.logger.profile(
+                    "converted units from %s to %s (%d entries)", *conv, xdata.size
+                )
+            return self._pack(xdata)
+
+    def _release(self, where):
+        if isinstance(where, _Deferred):
+            return
+        if isinstance(where, ArenaBlock):
+            self._arena.free(where)
+        else:
+            self._total_mem -= where.nbytes
+            if self.memory_budget is not None:
+                self.memory_budget.remove(where)
+
     def _clear_data(self, time, target):
         self._connected_inputs[target] = time
         if any(t is None for t in self._connected_inputs.values()):
@@ -319,43 +528,42 @@ class Output(IOutput, Loggable):
 
         t_min = min(self._connected_inputs.values())
         while len(self.data) > 1 and self.data[1][0] <= t_min:
-            d = self.data.pop(0)
-            if isinstance(d[1], str):
-                os.remove(d[1])
-            else:
-                self._total_mem -= d[1].nbytes
+            _t, d = self.data.popleft()
+            self._release(d)
+
+    def _clear_memory(self):
+        with self._cache_lock():
+            if self.memory_budget is not None:
+                for _t, d in self.data:
+                    self.memory_budget.remove(d)
+            self.data.clear()
+            self._total_mem = 0
+            if self._arena is not None:
+                self._arena.close()
+                self._arena = None
 
     def finalize(self):
         """Finalize the output"""
-        for _t, d in self.data:
-            if isinstance(d, str):
-                os.remove(d)
-        self.data.clear()
+        self._clear_memory()
 
     def _interpolate(self, time):
         if time < self.data[0][0] or time > self.data[-1][0]:
             raise FinamTimeError(
                 f"Requested time {time} out of range [{self.data[0][0]}, {self.data[-1][0]}]"
             )
-        for i, (t, data) in enumerate(self.data):
-            if time > t:
-                continue
-            if time == t:
-                return self._unpack(data)
-
-            t_prev, data_prev = self.data[i - 1]
-            diff = t - t_prev
-            t_half = t_prev + diff / 2
+        i = self.data.bisect(time)
+        t = self.data[i][0]
+        if time == t:
+            return self._unpack_at(i)
 
-            if time < t_half:
-                return self._unpack(data_prev)
+        t_prev = self.data[i - 1][0]
+        diff = t - t_prev
+        t_half = t_prev + diff / 2
 
-            return self._unpack(data)
+        if time < t_half:
+            return self._unpack_at(i - 1)
 
-        raise FinamTimeError(
-            f"Time interpolation failed. This should not happen and is probably a bug. "
-            f"Time is {time}."
-        )
+        return self._unpack_at(i)
 
     def get_info(self, info):
         """Exchange and get the output's data info.
@@ -420,6 +628,9 @@ class Output(IOutput, Loggable):
 
                 self._output_info.time = info.time
 
+            if self._output_info.dtype is None and info.dtype is not None:
+                self._output_info.dtype = info.dtype
+
             for k, v in self._output_info.meta.items():
                 if v is None:
                     if k not in info.meta or info.meta[k] is None:
@@ -430,6 +641,7 @@ class Output(IOutput, Loggable):
                     self._output_info.meta[k] = info.meta[k]
 
         self._out_infos_exchanged += 1
+        self._out_plan = None
 
         return self._output_info
 
@@ -478,12 +690,33 @@ class CallbackOutput(Output):
     ----------
     callback : callable
         A callback ``callback(data, time)``, returning the transformed data.
+    name : str
+        Name of the output.
+    info : :class:`.Info`, optional
+        Data info of the output.
+    pure : bool, optional
+        Whether the callback's result only depends on the time. Default ``False``.
+
+        With multiple targets, the result of a pure callback is computed once per time.
+    **info_kwargs
+        Keyword arguments for the data info, if ``info`` is not given.
     """
 
-    def __init__(self, callback, name, info=None, **info_kwargs):
+    def __init__(self, callback, name, info=None, pure=False, **info_kwargs):
         super().__init__(name=name, info=info, static=False, **info_kwargs)
         self.callback = callback
         self.last_data = None
+        self._pure = pure
+        self._memo = TimeMemo()
+
+    @property
+    def is_pure(self):
+        """bool: Whether the callback's result only depends on the time."""
+        return self._pure
+
+    def pinged(self, source):
+        super().pinged(source)
+        self._memo.add_target(source)
 
     @property
     def needs_push(self):
@@ -498,8 +731,8 @@ class CallbackOutput(Output):
     def push_data(self, data, time):
         raise NotImplementedError("CallbackInput does not support push of data")
 
-    def get_data(self, time, target):
-        """Get the output's data-set for the given time.
+    def get_light_data(self, time, target):
+        """Get the output's data-set for the given time, for transport to an input.
 
         Parameters
         ----------
@@ -510,7 +743,7 @@ class CallbackOutput(Output):
 
         Returns
         -------
-        :class:`pint.Quantity`
+        :class:`.LightQuantity`
             Data-set for the requested time.
 
         Raises
@@ -528,19 +761,34 @@ class CallbackOutput(Output):
         if self._out_infos_exchanged < len(self._connected_inputs):
             raise FinamNoDataError(f"Data info was not yet exchanged in {self.name}")
 
+        if self._pure and self._memo.target_count > 1:
+            return self._memo.get(time, target, lambda: self._call(time))
+        return self._call(time)
+
+    def _call(self, time):
         data = self.callback(self, time)
 
         if data is None:
             raise FinamNoDataError(f"No data available in {self.name}")
 
+        validate = self._validates_push()
         with ErrorLogger(self.logger):
-            xdata, conv = tools.prepare(data, self.info, report_conversion=True)
-            if self.last_data is not None and np.may_share_memory(
-                tools.get_magnitude(self.last_data), tools.get_magnitude(xdata)
+            plan = self._validation_plan()
+            if validate:
+                xdata, conv = plan.pack(data, report_conversion=True)
+            else:
+                xdata, conv = plan.pack_trusted(data, report_conversion=True)
+            if (
+                validate
+                and self.last_data is not None
+                and np.may_share_memory(
+                    tools.get_magnitude(self.last_data), tools.get_magnitude(xdata)
+                )
             ):
                 raise FinamDataError(
                     "Received data that shares memory with previously received data."
                 )
+            self._pushes += 1
             if conv is not None:
                 self.logger.profile(
                     "converted units from %s to %s (%d entries)", *conv, xdata.size
@@ -550,6 +798,101 @@ class CallbackOutput(Output):
 
     def finalize(self):
         """Finalize the output"""
+        self._memo.clear()
+
+
+class DataCache:
+    """Time-ordered cache of ``(time, data)`` entries, as used by outputs.
+
+    Behaves like a list of tuples, but removing the oldest entry with :meth:`.popleft`
+    is O(1) and entries can be looked up by time with :meth:`.bisect` in O(log n).
+
+    Entries are stored in two parallel lists with a start offset.
+    Removed entries are released immediately, the lists are compacted
+    when more than half of them is unused.
+    """
+
+    __slots__ = ("_times", "_data", "_start")
+
+    def __init__(self):
+        self._times = []
+        self._data = []
+        self._start = 0
+
+    def append(self, entry):
+        """Appends a ``(time, data)`` entry. Times must not decrease."""
+        time, data = entry
+        self._times.append(time)
+        self._data.append(data)
+
+    def popleft(self):
+        """Removes and returns the oldest entry."""
+        if len(self) == 0:
+            raise IndexError("pop from an empty DataCache")
+
+        start = self._start
+        entry = (self._times[start], self._data[start])
+        self._data[start] = None
+        self._start += 1
+
+        if self._start > 16 and 2 * self._start > len(self._times):
+            del self._times[: self._start]
+            del self._data[: self._start]
+            self._start = 0
+
+        return entry
+
+    def bisect(self, time):
+        """Index of the first entry with a time not before ``time``."""
+        return bisect.bisect_left(self._times, time, self._start) - self._start
+
+    def clear(self):
+        """Removes all entries."""
+        self._times.clear()
+        self._data.clear()
+        self._start = 0
+
+    def __len__(self):
+        return len(self._times) - self._start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("DataCache index out of range")
+
+        index += self._start
+        return self._times[index], self._data[index]
+
+    def __setitem__(self, index, entry):
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("DataCache index out of range")
+
+        index += self._start
+        self._times[index], self._data[index] = entry
+
+    def __iter__(self):
+        return zip(
+            islice(self._times, self._start, None),
+            islice(self._data, self._start, None),
+        )
+
+    def __eq__(self, other):
+        if isinstance(other, (DataCache, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"DataCache({list(self)!r})"
 
 
 def _check_time(time, is_static):
@@ -559,3 +902,170 @@ def _check_time(time, is_static):
     else:
         if not isinstance(time, datetime):
             raise ValueError("Time must be of type datetime")
+
+
+class OutputDemand:
+    """Demand for the data of an output by downstream components.
+
+    Compiled by the :class:`.Composition` during connect, and available as :attr:`.Output.demand`.
+    Components can use it to skip the computation of data that is not consumed.
+
+    The demand is only known if all components reached from the output are time components,
+    linked without adapters that accumulate pushed data, delay time or break dependencies.
+    Otherwise, all data pushed to a connected output is considered to be needed.
+
+    Parameters
+    ----------
+    output : :class:`.Output`
+        The output.
+    consumers : list of :class:`.ITimeComponent` or None
+        Time components pulling from the output, or ``None`` if the demand is unknown.
+    """
+
+    __slots__ = ("_output", "_consumers")
+
+    def __init__(self, output, consumers=None):
+        self._output = output
+        self._consumers = consumers
+
+    @property
+    def connected(self):
+        """bool: Whether the output has any targets."""
+        return self._output.has_targets
+
+    @property
+    def is_known(self):
+        """bool: Whether the consumers of the output are known."""
+        return self._consumers is not None
+
+    @property
+    def next_time(self):
+        """:class:`datetime <datetime.datetime>` or None: Earliest time of the next pull by any consumer.
+
+        ``None`` if the demand is unknown, or the output has no consumers.
+        """
+        if not self._consumers:
+            return None
+        times = [comp.next_time for comp in self._consumers]
+        if None in times:
+            return None
+        return min(times)
+
+    @property
+    def coarsest_step(self):
+        """:class:`timedelta <datetime.timedelta>` or None: Coarsest current step of the consumers.
+
+        ``None`` if the demand is unknown, or the output has no consumers.
+        """
+        if not self._consumers:
+            return None
+        steps = []
+        for comp in self._consumers:
+            if comp.time is None or comp.next_time is None:
+                return None
+            steps.append(comp.next_time - comp.time)
+        return max(steps)
+
+    def is_needed(self, time, next_push=None):
+        """Whether data pushed for the given time may be pulled by any consumer.
+
+        Data is not needed if the output has no targets,
+        or if the following push is not after the next pull of all consumers.
+
+        Parameters
+        ----------
+        time : :class:`datetime <datetime.datetime>`
+            Simulation time of the push.
+        next_push : :class:`datetime <datetime.datetime>`, optional
+            Simulation time of the following push. Data is always needed if not given.
+
+        Returns
+        -------
+        bool
+            Whether the data should be pushed.
+        """
+        if not self.connected:
+            return False
+        if next_push is None or next_push <= time:
+            return True
+        next_time = self.next_time
+        return next_time is None or next_push > next_time
+
+
+class _Deferred:
+    """Data pushed as a producer, evaluated on the first pull."""
+
+    __slots__ = ("producer", "time")
+
+    def __init__(self, producer, time):
+        self.producer = producer
+        self.time = time
+
+
+class TimeMemo:
+    """Cache of results per time, for slots of stateless transformations with multiple end points.
+
+    Each result is computed once per time and shared by all end points.
+    Results are removed once all end points have pulled their time, or a later time.
+    """
+
+    __slots__ = ("_results", "_pulls")
+
+    def __init__(self):
+        self._results = {}
+        self._pulls = {}
+
+    def add_target(self, target):
+        """Registers an end point that pulls from the slot."""
+        self._pulls.setdefault(target, None)
+
+    @property
+    def target_count(self):
+        """int: Number of registered end points."""
+        return len(self._pulls)
+
+    def get(self, time, target, func, hit=None):
+        """Gets the result for the given time, calling ``func()`` if it is not cached yet.
+
+        Parameters
+        ----------
+        time : :class:`datetime <datetime.datetime>`
+            Simulation time of the pull.
+        target : :class:`.IInput`
+            Requesting end point of the pull.
+        func : callable
+            Function without arguments computing the result for the time.
+        hit : callable, optional
+            Function without arguments, called if the result was already cached.
+
+        Returns
+        -------
+        Any
+            The result for the given time.
+        """
+        result = self._results.get(time)
+        if result is None:
+            result = self._results[time] = func()
+        elif hit is not None:
+            hit()
+
+        self._pulls[target] = time
+        self._evict()
+        return result
+
+    def _evict(self):
+        pulls = self._pulls.values()
+        if None in pulls:
+            return
+        t_min = min(pulls)
+        for t in [t for t in self._results if t <= t_min]:
+            del self._results[t]
+
+    def clear(self):
+        """Removes all results and pull times."""
+        self._results.clear()
+        for target in self._pulls:
+            self._pulls[target] = None
+
+    def __len__(self):
+        return len(self._results)
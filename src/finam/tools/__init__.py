@@ -47,6 +47,19 @@ Inspection helper
 
     inspect
 
+Memory helper
+=============
+
+.. autosummary::
+   :toctree: generated
+
+    ArenaBlock
+    MemoryArena
+    MemoryBudget
+    Codec
+    CODECS
+    get_codec
+
 Connect helper
 ==============
 
@@ -58,6 +71,7 @@ Connect helper
     FromOutput
     FromValue
 """
+
 from .connect_helper import ConnectHelper, FromInput, FromOutput, FromValue
 from .cwd_helper import execute_in_cwd, set_directory
 from .date_helper import is_timedelta
@@ -71,6 +85,14 @@ from .log_helper import (
     add_logging_level,
     is_loggable,
 )
+from .memory_helper import (
+    CODECS,
+    ArenaBlock,
+    Codec,
+    MemoryArena,
+    MemoryBudget,
+    get_codec,
+)
 
 __all__ = ["execute_in_cwd", "set_directory"]
 __all__ += ["is_timedelta"]
@@ -84,4 +106,12 @@ __all__ += [
     "LogStdOutStdErr",
     "LogCStdOutStdErr",
 ]
+__all__ += [
+    "ArenaBlock",
+    "MemoryArena",
+    "MemoryBudget",
+    "Codec",
+    "CODECS",
+    "get_codec",
+]
 __all__ += ["ConnectHelper", "FromInput", "FromOutput", "FromValue"]
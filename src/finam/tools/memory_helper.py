@@ -0,0 +1,641 @@
+"""Memory-mapped storage for data exceeding slot memory limits."""
+
+import functools
+import lzma
+import mmap
+import os
+import threading
+import weakref
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+_ALIGNMENT = 64
+_MIN_SEGMENT_SIZE = 1 << 20
+_MIN_ASYNC_SIZE = 1 << 18
+
+_IO_EXECUTOR = None
+_IO_LOCK = threading.Lock()
+
+
+def _io_executor():
+    """The background thread shared by all arenas for writing and prefetching."""
+    global _IO_EXECUTOR  # pylint: disable=global-statement
+    with _IO_LOCK:
+        if _IO_EXECUTOR is None:
+            _IO_EXECUTOR = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="finam-io"
+            )
+        return _IO_EXECUTOR
+
+
+class ArenaBlock:
+    """Handle to an array stored in a :class:`.MemoryArena`.
+
+    Parameters
+    ----------
+    segment : int
+        Index of the arena segment.
+    offset : int
+        Offset of the data in the segment, in bytes.
+    size : int
+        Reserved size in bytes.
+    dtype : numpy.dtype
+        Data type of the array.
+    shape : tuple of int
+        Shape of the array.
+    mask : ArenaBlock or None
+        Block holding the mask of a masked array.
+    fill_value : any, optional
+        Fill value of a masked array.
+    codec : Codec or None
+        Codec the data was encoded with.
+    length : int, optional
+        Length of the encoded data in bytes.
+    """
+
+    __slots__ = (
+        "segment",
+        "offset",
+        "size",
+        "dtype",
+        "shape",
+        "mask",
+        "fill_value",
+        "codec",
+        "length",
+        "pending",
+    )
+
+    def __init__(
+        self,
+        segment,
+        offset,
+        size,
+        dtype,
+        shape,
+        mask=None,
+        fill_value=None,
+        codec=None,
+        length=None,
+    ):
+        self.segment = segment
+        self.offset = offset
+        self.size = size
+        self.dtype = dtype
+        self.shape = shape
+        self.mask = mask
+        self.fill_value = fill_value
+        self.codec = codec
+        self.length = length
+        self.pending = None
+
+    @property
+    def nbytes(self):
+        """Number of bytes of the stored data, including the mask."""
+        nbytes = int(np.prod(self.shape, dtype=np.int64)) * self.dtype.itemsize
+        if self.mask is not None:
+            nbytes += self.mask.nbytes
+        return nbytes
+
+    def __repr__(self):
+        return (
+            f"ArenaBlock(segment={self.segment}, offset={self.offset}, "
+            f"dtype={self.dtype}, shape={self.shape}, masked={self.mask is not None})"
+        )
+
+
+class MemoryArena:
+    """Memory-mapped storage for arrays.
+
+    Arrays are written into memory-mapped segment files ``<prefix>-<n>.arena``.
+    Space of freed blocks is reused by later arrays.
+    New segments are added with increasing size when the existing ones are full,
+    so that existing mappings never need to be resized.
+
+    Loaded arrays are views into the mapped files, without copying.
+    The space of a freed block is only reused after all arrays loaded from it were released.
+
+    With ``asynchronous=True``, arrays are written by a background thread,
+    so that :meth:`.store` returns immediately.
+    Small arrays are always written immediately, as the hand-over would take longer.
+    The stored arrays must not be modified until they are written.
+    Loading or freeing a block waits for its write to complete.
+    Data that is expected to be loaded soon can be read ahead with :meth:`.prefetch`.
+
+    With a ``codec``, arrays are compressed before they are written.
+    Loading then returns decoded copies instead of views.
+
+    Parameters
+    ----------
+    prefix : str or os.PathLike
+        Path prefix for the segment files.
+    asynchronous : bool, optional
+        Whether to write arrays in a background thread. Default: False.
+    codec : Codec or str, optional
+        Codec for compressing arrays, see :func:`.get_codec`. Default: None.
+    """
+
+    def __init__(self, prefix, asynchronous=False, codec=None):
+        self._prefix = str(prefix)
+        self._asynchronous = asynchronous
+        self._codec = get_codec(codec)
+        self._segments = []
+        self._free = []
+        self._views = {}
+        self._pending = []
+        self._jobs = []
+
+    @property
+    def paths(self):
+        """list of str: Paths of the segment files."""
+        return [_segment_path(self._prefix, i) for i in range(len(self._segments))]
+
+    @property
+    def capacity(self):
+        """int: Total size of all segments, in bytes."""
+        return sum(seg.size for seg in self._segments)
+
+    def store(self, data):
+        """Stores an array in the arena.
+
+        Parameters
+        ----------
+        data : numpy.ndarray or numpy.ma.MaskedArray
+            The array to store. Must not have an object dtype.
+
+        Returns
+        -------
+        ArenaBlock
+            Handle to the stored data.
+        """
+        block, arrays = self._allocate_block(data)
+        if self._asynchronous and block.nbytes >= _MIN_ASYNC_SIZE:
+            block.pending = self._submit(self._write, arrays)
+        else:
+            self._write(arrays)
+        return block
+
+    def prefetch(self, block):
+        """Reads a stored array ahead in the background, so that loading it is fast.
+
+        Parameters
+        ----------
+        block : ArenaBlock
+            Handle to the stored data.
+        """
+        if block.pending is not None and not block.pending.done():
+            # data is still being written and in the page cache
+            return
+        self._submit(self._read_ahead, block)
+
+    def wait(self):
+        """Waits for all background writes and prefetches of the arena to complete."""
+        for job in self._jobs:
+            job.result()
+        self._jobs.clear()
+
+    def load(self, block):
+        """Loads an array from the arena.
+
+        Parameters
+        ----------
+        block : ArenaBlock
+            Handle to the stored data.
+
+        Returns
+        -------
+        numpy.ndarray or numpy.ma.MaskedArray
+            View of the stored data in the mapped file, or a decoded copy.
+        """
+        _wait(block)
+        if block.codec is not None:
+            data = block.codec.decode(self._view(block), block.dtype, block.shape)
+        else:
+            data = self._view(block)
+            views = [v for v in self._views.get(id(block), []) if v() is not None]
+            views.append(weakref.ref(data))
+            self._views[id(block)] = views
+        if block.mask is not None:
+            return np.ma.MaskedArray(
+                data, mask=self.load(block.mask), fill_value=block.fill_value
+            )
+        if block.fill_value is not None:
+            return np.ma.MaskedArray(data, fill_value=block.fill_value)
+        return data
+
+    def free(self, block):
+        """Frees the space of a stored array.
+
+        The space is reused as soon as all arrays loaded from the block are released.
+
+        Parameters
+        ----------
+        block : ArenaBlock
+            Handle to the stored data.
+        """
+        _wait(block)
+        if block.mask is not None:
+            self.free(block.mask)
+
+        views = [v for v in self._views.pop(id(block), []) if v() is not None]
+        if views:
+            self._pending.append((block, views))
+        else:
+            self._release(block.segment, block.offset, block.size)
+
+    def close(self):
+        """Closes the arena and removes all segment files."""
+        self.wait()
+        paths = self.paths
+        self._segments.clear()
+        self._free.clear()
+        self._views.clear()
+        self._pending.clear()
+        for path in paths:
+            if os.path.isfile(path):
+                os.remove(path)
+
+    def _allocate_block(self, data):
+        """Allocates blocks for an array and its mask, without writing."""
+        arrays = []
+        mask = None
+        fill_value = None
+        if np.ma.isMaskedArray(data):
+            if data.mask is not np.ma.nomask:
+                mask, arrays = self._allocate_block(np.ma.getmaskarray(data))
+            fill_value = data.fill_value
+            data = data.data
+
+        data = np.asarray(data)
+        if data.dtype.hasobject:
+            raise ValueError("Arrays with object dtype can't be stored in the arena")
+
+        if self._codec is None:
+            segment, offset, size = self._allocate(data.nbytes)
+            block = ArenaBlock(
+                segment, offset, size, data.dtype, data.shape, mask, fill_value
+            )
+            arrays.append((self._view(block), data))
+            return block, arrays
+
+        encoded = np.frombuffer(self._codec.encode(data), dtype=np.uint8)
+        segment, offset, size = self._allocate(encoded.nbytes)
+        block = ArenaBlock(
+            segment,
+            offset,
+            size,
+            data.dtype,
+            data.shape,
+            mask,
+            fill_value,
+            codec=self._codec,
+            length=encoded.nbytes,
+        )
+        arrays.append((self._view(block), encoded))
+        return block, arrays
+
+    def _submit(self, func, *args):
+        self._jobs = [job for job in self._jobs if not job.done()]
+        job = _io_executor().submit(func, *args)
+        self._jobs.append(job)
+        return job
+
+    @staticmethod
+    def _write(arrays):
+        for view, data in arrays:
+            view[...] = data
+
+    def _read_ahead(self, block):
+        # touch one byte per page to load the pages of the block from disk
+        segment = self._segments[block.segment]
+        start = block.offset - block.offset % mmap.PAGESIZE
+        np.add.reduce(segment[start : block.offset + block.size : mmap.PAGESIZE])
+        if block.mask is not None:
+            self._read_ahead(block.mask)
+
+    def _view(self, block):
+        if block.codec is not None:
+            return self._segments[block.segment][
+                block.offset : block.offset + block.length
+            ]
+        return np.ndarray(
+            shape=block.shape,
+            dtype=block.dtype,
+            buffer=self._segments[block.segment],
+            offset=block.offset,
+        )
+
+    def _allocate(self, nbytes):
+        size = max(_ALIGNMENT, -(-nbytes // _ALIGNMENT) * _ALIGNMENT)
+        self._collect_pending()
+
+        for segment, free in enumerate(self._free):
+            for i, (offset, free_size) in enumerate(free):
+                if free_size >= size:
+                    if free_size == size:
+                        del free[i]
+                    else:
+                        free[i] = (offset + size, free_size - size)
+                    return segment, offset, size
+
+        last_size = self._segments[-1].size if self._segments else 0
+        seg_size = max(_MIN_SEGMENT_SIZE, 2 * last_size, size)
+        segment = len(self._segments)
+        self._segments.append(
+            np.memmap(
+                _segment_path(self._prefix, segment),
+                dtype=np.uint8,
+                mode="w+",
+                shape=(seg_size,),
+            )
+        )
+        self._free.append([])
+        if seg_size > size:
+            self._free[segment].append((size, seg_size - size))
+
+        return segment, 0, size
+
+    def _collect_pending(self):
+        if not self._pending:
+            return
+
+        pending = []
+        for block, views in self._pending:
+            views = [v for v in views if v() is not None]
+            if views:
+                pending.append((block, views))
+            else:
+                self._release(block.segment, block.offset, block.size)
+        self._pending = pending
+
+    def _release(self, segment, offset, size):
+        free = self._free[segment]
+        i = 0
+        while i < len(free) and free[i][0] < offset:
+            i += 1
+
+        if i < len(free) and offset + size == free[i][0]:
+            size += free[i][1]
+            del free[i]
+        if i > 0 and free[i - 1][0] + free[i - 1][1] == offset:
+            offset = free[i - 1][0]
+            size += free[i - 1][1]
+            del free[i - 1]
+            i -= 1
+
+        free.insert(i, (offset, size))
+
+
+class MemoryBudget:
+    """Memory budget shared by the data caches of multiple slots.
+
+    Tracks the bytes of data kept in RAM by all registered slots.
+    When adding data would exceed the budget, the least recently used entries
+    are spilled to disk by their slots, until the new data fits.
+
+    Slots register their data with :meth:`.add` and report use and removal
+    with :meth:`.touch` and :meth:`.remove`.
+    For spilling, slots must implement a method ``_spill(data)``
+    that moves the given data from RAM to disk and returns whether it succeeded.
+
+    As data of one slot may be spilled while another slot adds data,
+    slots must hold :attr:`.lock` while modifying their data cache.
+
+    Parameters
+    ----------
+    limit : int
+        Memory budget in bytes.
+    """
+
+    def __init__(self, limit):
+        self._limit = limit
+        self._entries = OrderedDict()
+        self._used = 0
+        self._spilled = 0
+        self._lock = threading.RLock()
+
+    @property
+    def lock(self):
+        """threading.RLock: Lock guarding the budget and the data caches of the registered slots."""
+        return self._lock
+
+    @property
+    def limit(self):
+        """int: Memory budget in bytes. Lowering the limit spills data immediately."""
+        return self._limit
+
+    @limit.setter
+    def limit(self, limit):
+        with self._lock:
+            self._limit = limit
+            self.reserve(0)
+
+    @property
+    def used(self):
+        """int: Bytes of data currently kept in RAM."""
+        return self._used
+
+    @property
+    def available(self):
+        """int: Bytes still available in the budget."""
+        return max(0, self._limit - self._used)
+
+    @property
+    def spilled(self):
+        """int: Total bytes spilled to disk to stay within the budget."""
+        return self._spilled
+
+    def usage(self):
+        """Bytes of data kept in RAM, per slot.
+
+        Returns
+        -------
+        dict
+            Mapping from slots to bytes.
+        """
+        usage = {}
+        with self._lock:
+            for slot, data in self._entries.values():
+                usage[slot] = usage.get(slot, 0) + data.nbytes
+        return usage
+
+    def reserve(self, nbytes):
+        """Spills least recently used data until ``nbytes`` fit into the budget.
+
+        Parameters
+        ----------
+        nbytes : int
+            Number of bytes to reserve.
+
+        Returns
+        -------
+        bool
+            Whether the bytes fit into the budget.
+        """
+        with self._lock:
+            while self._entries and self._used + nbytes > self._limit:
+                _key, (slot, data) = self._entries.popitem(last=False)
+                self._used -= data.nbytes
+                if slot._spill(data):  # pylint: disable=protected-access
+                    self._spilled += data.nbytes
+
+            return self._used + nbytes <= self._limit
+
+    def add(self, slot, data):
+        """Registers data kept in RAM by a slot.
+
+        Parameters
+        ----------
+        slot : IOutput
+            The slot holding the data.
+        data : array_like
+            The data.
+        """
+        with self._lock:
+            self._entries[id(data)] = (slot, data)
+            self._used += data.nbytes
+
+    def touch(self, data):
+        """Marks data as recently used.
+
+        Parameters
+        ----------
+        data : array_like
+            The data.
+        """
+        with self._lock:
+            if id(data) in self._entries:
+                self._entries.move_to_end(id(data))
+
+    def remove(self, data):
+        """Unregisters data, e.g. when it is no longer needed by any input.
+
+        Parameters
+        ----------
+        data : array_like
+            The data.
+        """
+        with self._lock:
+            entry = self._entries.pop(id(data), None)
+            if entry is not None:
+                self._used -= entry[1].nbytes
+
+    def __repr__(self):
+        return f"MemoryBudget(limit={self._limit}, used={self._used})"
+
+
+class Codec:
+    """Lossless codec for compressing arrays stored in a :class:`.MemoryArena`.
+
+    Parameters
+    ----------
+    compress : callable
+        Function ``compress(data) -> bytes``, e.g. :func:`zlib.compress`.
+    decompress : callable
+        Function ``decompress(data) -> bytes``, e.g. :func:`zlib.decompress`.
+    shuffle : bool, optional
+        Whether to shuffle bytes before compression, i.e. to store the first bytes of all values,
+        then the second bytes and so on.
+        Improves compression of smooth numeric fields. Default: False.
+    """
+
+    def __init__(self, compress, decompress, shuffle=False):
+        self.compress = compress
+        self.decompress = decompress
+        self.shuffle = shuffle
+
+    def encode(self, data):
+        """Encodes an array.
+
+        Parameters
+        ----------
+        data : numpy.ndarray
+            The array to encode.
+
+        Returns
+        -------
+        bytes
+            The encoded data.
+        """
+        data = np.ascontiguousarray(data)
+        if self.shuffle and data.dtype.itemsize > 1:
+            data = np.ascontiguousarray(
+                data.reshape(-1).view(np.uint8).reshape(-1, data.dtype.itemsize).T
+            )
+        return self.compress(data)
+
+    def decode(self, encoded, dtype, shape):
+        """Decodes an array.
+
+        Parameters
+        ----------
+        encoded : buffer
+            The encoded data.
+        dtype : numpy.dtype
+            Data type of the array.
+        shape : tuple of int
+            Shape of the array.
+
+        Returns
+        -------
+        numpy.ndarray
+            The decoded array.
+        """
+        decoded = np.frombuffer(self.decompress(encoded), dtype=np.uint8)
+        if self.shuffle and dtype.itemsize > 1:
+            decoded = decoded.reshape(dtype.itemsize, -1).T.copy()
+        else:
+            decoded = decoded.copy()
+        return decoded.view(dtype).reshape(shape)
+
+
+CODECS = {
+    "zlib": Codec(functools.partial(zlib.compress, level=6), zlib.decompress),
+    "lzma": Codec(
+        functools.partial(lzma.compress, preset=1), lzma.decompress, shuffle=True
+    ),
+    "shuffle": Codec(
+        functools.partial(zlib.compress, level=1), zlib.decompress, shuffle=True
+    ),
+}
+"""dict: Named codecs for :func:`.get_codec`.
+
+* ``"zlib"``: :mod:`zlib`, compression level 6
+* ``"lzma"``: byte-shuffle and :mod:`lzma`, preset 1. Strongest, but slowest
+* ``"shuffle"``: byte-shuffle and :mod:`zlib`, compression level 1. Fast
+"""
+
+
+def get_codec(codec):
+    """Resolves a codec for compressing arrays.
+
+    Parameters
+    ----------
+    codec : Codec or str or None
+        A codec, the name of a codec in :data:`.CODECS`, or None for no compression.
+
+    Returns
+    -------
+    Codec or None
+        The codec.
+    """
+    if codec is None or isinstance(codec, Codec):
+        return codec
+    if codec not in CODECS:
+        raise ValueError(
+            f"Unknown codec '{codec}'. Available codecs: {', '.join(CODECS)}"
+        )
+    return CODECS[codec]
+
+
+def _wait(block):
+    if block.pending is not None:
+        block.pending.result()
+        block.pending = None
+
+
+def _segment_path(prefix, segment):
+    return f"{prefix}-{segment}.arena"
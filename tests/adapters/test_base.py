@@ -93,6 +93,41 @@ class TestScale(unittest.TestCase):
         unit_out = self.adapter_units.get_data(datetime(2000, 1, 3), None)
         self.assertEqual(unit_out.magnitude, 4)
 
+    def test_scale_fan_out(self):
+        start = datetime(2000, 1, 1)
+        source = CallbackGenerator(
+            callbacks={"Step": (lambda t: t.day - 1, Info(None, grid=NoGrid()))},
+            start=start,
+            step=timedelta(days=1),
+        )
+        consumers = [
+            fm.components.DebugConsumer(
+                inputs={"In": Info(None, grid=NoGrid())},
+                start=start,
+                step=timedelta(days=step),
+            )
+            for step in (1, 5)
+        ]
+
+        comp = fm.Composition([source] + consumers)
+
+        adapter = Scale(scale=1.0)
+        source.outputs["Step"] >> adapter
+        for consumer in consumers:
+            adapter >> consumer.inputs["In"]
+
+        comp.run(end_time=datetime(2000, 1, 20))
+
+        self.assertEqual(
+            set(source.outputs["Step"]._connected_inputs),
+            {consumer.inputs["In"] for consumer in consumers},
+        )
+        for consumer in consumers:
+            self.assertEqual(
+                consumer.data["In"].magnitude, (consumer.time - start).days
+            )
+        self.assertLessEqual(len(source.outputs["Step"].data), 6)
+
 
 class TestGridToValue(unittest.TestCase):
     def setUp(self):
@@ -2,11 +2,15 @@
 Unit tests for data info propagation.
 """
 
+import os
+import tempfile
 import unittest
 from datetime import datetime, timedelta
 
 import numpy as np
 import pyproj as pp
+from scipy.interpolate import LinearNDInterpolator, RegularGridInterpolator
+from scipy.spatial import KDTree
 
 from finam import (
     UNITS,
@@ -17,12 +21,22 @@ from finam import (
     FinamMetaDataError,
     Info,
     Location,
+    Mask,
     RectilinearGrid,
     UniformGrid,
     UnstructuredGrid,
+    UnstructuredPoints,
 )
 from finam import data as fdata
-from finam.adapters.regrid import RegridLinear, RegridNearest, ToCRS
+from finam.adapters.regrid import (
+    RegridBlock,
+    RegridConservative,
+    RegridLinear,
+    RegridNearest,
+    ToCRS,
+    _apply_stencil,
+    _linear_stencil,
+)
 from finam.components import debug, generators
 
 
@@ -538,6 +552,404 @@ class TestRegrid(unittest.TestCase):
         self.assertEqual(sink.data["Input"][0, 1], 0.5 * UNITS.meter)
         self.assertEqual(sink.data["Input"][0, 9], 0.5 * UNITS.meter)
 
+    def test_regrid_linear_stencil(self):
+        rng = np.random.default_rng(1234)
+        for shape in [(7,), (7, 5), (6, 5, 4), (1, 5)]:
+            axes = [np.sort(rng.random(n)) * 10 if n > 1 else [0.5] for n in shape]
+            points = rng.random((500, len(shape))) * 12 - 1
+            # points on grid nodes
+            for i, ax in enumerate(axes):
+                points[:50, i] = rng.choice(ax, 50)
+            values = rng.random(shape)
+
+            inter = RegularGridInterpolator(axes, values, bounds_error=False)
+            expected = inter(points)
+            stencil = _linear_stencil(axes, points)
+            res = _apply_stencil(values, *stencil)
+            np.testing.assert_array_equal(res, expected)
+
+            # leading time axis
+            res = _apply_stencil(np.stack([values, 2 * values]), *stencil)
+            np.testing.assert_array_equal(res[0], expected)
+            np.testing.assert_array_equal(res[1], _apply_stencil(2 * values, *stencil))
+
+    def test_regrid_linear_unstructured_weights(self):
+        rng = np.random.default_rng(1234)
+        in_grid = UnstructuredPoints(rng.random((200, 2)))
+        out_grid = UnstructuredPoints(rng.random((300, 2)) * 1.2 - 0.1)
+        in_data = rng.random(200)
+
+        for fill in (False, True):
+            regrid = RegridLinear(
+                in_grid=in_grid, out_grid=out_grid, fill_with_nearest=fill
+            )
+            regrid.input_mask = regrid.output_mask = Mask.FLEX
+            regrid._update_grid_specs()
+            res = regrid.weights @ in_data
+
+            expected = LinearNDInterpolator(in_grid.points, in_data)(regrid.out_coords)
+            outside = np.isnan(expected)
+            np.testing.assert_array_equal(res[~outside], expected[~outside])
+            if fill:
+                self.assertTrue(np.any(outside))
+                tree = KDTree(in_grid.points)
+                nearest = tree.query(regrid.out_coords[outside])[1]
+                np.testing.assert_array_equal(res[outside], in_data[nearest])
+            else:
+                # outliers are masked
+                self.assertFalse(np.any(outside))
+                self.assertTrue(np.any(regrid.output_mask))
+
+    def test_regrid_cache(self):
+        in_grids = [
+            UniformGrid(dims=(10, 12), spacing=(1.0, 1.0), data_location="POINTS"),
+            UnstructuredPoints(np.random.default_rng(1234).random((100, 2)) * 11.0),
+        ]
+        out_grid = UniformGrid(
+            dims=(15, 10),
+            spacing=(1.0, 1.0),
+            origin=(-2.0, 1.0),
+            data_location="POINTS",
+        )
+
+        def run(in_grid, regrid):
+            in_info = Info(time=None, grid=in_grid, units="m")
+            in_data = np.arange(in_grid.data_size, dtype=float).reshape(
+                in_grid.data_shape, order=in_grid.order
+            )
+            source = generators.CallbackGenerator(
+                callbacks={"Output": (lambda t: in_data, in_info)},
+                start=datetime(2000, 1, 1),
+                step=timedelta(days=1),
+            )
+            sink = debug.DebugConsumer(
+                {"Input": Info(None, grid=out_grid, units=None)},
+                start=datetime(2000, 1, 1),
+                step=timedelta(days=1),
+            )
+            composition = Composition([source, sink])
+            source.outputs["Output"] >> regrid >> sink.inputs["Input"]
+            composition.connect()
+            return sink.data["Input"]
+
+        for in_grid in in_grids:
+            for regrid in (
+                lambda **kw: RegridNearest(**kw),
+                lambda **kw: RegridLinear(**kw),
+                lambda **kw: RegridLinear(fill_with_nearest=True, **kw),
+            ):
+                expected = run(in_grid, regrid())
+                with tempfile.TemporaryDirectory() as tmp:
+                    first = run(in_grid, regrid(cache_dir=tmp))
+                    self.assertEqual(len(os.listdir(tmp)), 1)
+                    second = run(in_grid, regrid(cache_dir=tmp))
+                    self.assertEqual(len(os.listdir(tmp)), 1)
+
+                for data in (first, second):
+                    np.testing.assert_array_equal(
+                        np.ma.getmaskarray(data), np.ma.getmaskarray(expected)
+                    )
+                    np.testing.assert_array_equal(
+                        np.ma.filled(data.magnitude, -1.0),
+                        np.ma.filled(expected.magnitude, -1.0),
+                    )
+
+    def test_regrid_cache_key(self):
+        grid1 = UniformGrid(dims=(10, 12), data_location="POINTS")
+        grid2 = UniformGrid(dims=(10, 13), data_location="POINTS")
+
+        def key(regrid, in_grid, out_grid):
+            regrid.input_grid, regrid.output_grid = in_grid, out_grid
+            regrid.input_mask = Mask.NONE
+            return regrid._cache_key()
+
+        linear = key(RegridLinear(), grid1, grid2)
+        self.assertEqual(linear, key(RegridLinear(), grid1, grid2.copy(deep=True)))
+        self.assertNotEqual(linear, key(RegridLinear(), grid2, grid1))
+        self.assertNotEqual(linear, key(RegridNearest(), grid1, grid2))
+        self.assertNotEqual(
+            linear, key(RegridLinear(fill_with_nearest=True), grid1, grid2)
+        )
+        self.assertNotEqual(linear, key(RegridLinear(out_mask=Mask.NONE), grid1, grid2))
+
+        # grids differing only in data order have different keys
+        grid2_c = UniformGrid(dims=(10, 13), data_location="POINTS", order="C")
+        self.assertNotEqual(linear, key(RegridLinear(), grid1, grid2_c))
+        nearest = key(RegridNearest(), grid1, grid2)
+        self.assertNotEqual(nearest, key(RegridNearest(), grid1, grid2_c))
+
+        # tree options only matter if the tree is used
+        tree_options = {"boxsize": 100.0}
+        self.assertNotEqual(
+            nearest, key(RegridNearest(tree_options=tree_options), grid1, grid2)
+        )
+        self.assertEqual(
+            linear, key(RegridLinear(tree_options=tree_options), grid1, grid2)
+        )
+        fill = key(RegridLinear(fill_with_nearest=True), grid1, grid2)
+        self.assertNotEqual(
+            fill,
+            key(
+                RegridLinear(fill_with_nearest=True, tree_options=tree_options),
+                grid1,
+                grid2,
+            ),
+        )
+
+    def test_regrid_nearest_chunks(self):
+        in_grid = UniformGrid(dims=(20, 10), data_location="POINTS", crs="EPSG:32632")
+        out_grids = [
+            UniformGrid(
+                dims=(29, 14),
+                spacing=(0.7, 0.7),
+                axes_reversed=True,
+                axes_increase=(True, False),
+                crs="EPSG:25832",
+            ),
+            UniformGrid(
+                dims=(29, 14), spacing=(0.7, 0.7), crs="EPSG:25832"
+            ).to_unstructured(),
+        ]
+        for out_grid in out_grids:
+            out_mask = np.zeros(out_grid.data_shape, dtype=bool)
+            out_mask.flat[::3] = True
+            regrid = RegridNearest(
+                in_grid=in_grid, out_grid=out_grid, out_mask=out_mask, workers=1
+            )
+            regrid.input_mask = Mask.NONE
+            regrid.transformer = pp.Transformer.from_crs(
+                out_grid.crs, in_grid.crs, always_xy=True
+            )
+            regrid._update_grid_specs()
+
+            chunks = list(regrid._iter_out_coords(chunk_size=50))
+            self.assertEqual(len(chunks), int(np.ceil(out_grid.data_size / 50)))
+            np.testing.assert_array_equal(
+                np.concatenate(chunks), regrid._get_out_coords()
+            )
+
+            tree = KDTree(in_grid.data_points)
+            np.testing.assert_array_equal(
+                regrid.ids, tree.query(regrid._get_out_coords())[1]
+            )
+
+    def test_regrid_conservative(self):
+        in_grid = UniformGrid(dims=(11, 7), spacing=(1.0, 1.5))
+        out_grid = UniformGrid(dims=(6, 4), spacing=(2.0, 3.0))
+
+        in_data = np.random.default_rng(1234).random(in_grid.data_shape)
+        in_info = Info(time=None, grid=in_grid, units="m")
+
+        source = generators.CallbackGenerator(
+            callbacks={"Output": (lambda t: in_data, in_info)},
+            start=datetime(2000, 1, 1),
+            step=timedelta(days=1),
+        )
+        sink = debug.DebugConsumer(
+            {"Input": Info(None, grid=out_grid, units=None)},
+            start=datetime(2000, 1, 1),
+            step=timedelta(days=1),
+        )
+        composition = Composition([source, sink])
+        (source.outputs["Output"] >> RegridConservative() >> sink.inputs["Input"])
+        composition.connect()
+
+        out_data = sink.data["Input"][0].magnitude
+        self.assertEqual(out_data.shape, out_grid.data_shape)
+        # integral is conserved
+        self.assertAlmostEqual(np.sum(out_data) * 6.0, np.sum(in_data) * 1.5)
+        # each output cell covers 2x2 input cells
+        self.assertAlmostEqual(out_data[0, 0], np.mean(in_data[:2, :2]))
+
+    def test_regrid_conservative_unstructured(self):
+        in_grid = UniformGrid(dims=(11, 7), spacing=(1.0, 1.5), axes_reversed=True)
+        out_grid = UniformGrid(
+            dims=(5, 4),
+            spacing=(2.3, 3.0),
+            origin=(0.5, 0.3),
+            axes_increase=(True, False),
+        )
+        tris = np.concatenate((in_grid.cells[:, :3], in_grid.cells[:, [0, 2, 3]]))
+        in_tris = UnstructuredGrid(
+            points=in_grid.points,
+            cells=tris,
+            cell_types=np.full(len(tris), CellType.TRI),
+            data_location=Location.CELLS,
+        )
+
+        def regrid(in_grid, out_grid, **kwargs):
+            regrid = RegridConservative(in_grid=in_grid, out_grid=out_grid, **kwargs)
+            regrid.input_mask = Mask.NONE
+            regrid._update_grid_specs()
+            return regrid
+
+        structured = regrid(in_grid, out_grid)
+        polygons = regrid(in_grid, out_grid.to_unstructured())
+        # output cells partly covered by the input grid have lower values
+        np.testing.assert_allclose(
+            structured.weights.toarray(), polygons.weights.toarray(), atol=1e-12
+        )
+        self.assertTrue(np.all(structured.weights.sum(axis=1) <= 1.0 + 1e-12))
+        self.assertFalse(np.all(structured.weights.sum(axis=1) >= 1.0 - 1e-12))
+
+        # triangles half the size, with each quad data on both
+        frac = regrid(in_grid, out_grid, normalization="fracarea")
+        frac_tris = regrid(in_tris, out_grid, normalization="fracarea")
+        np.testing.assert_allclose(frac.weights.sum(axis=1), 1.0)
+        in_data = np.random.default_rng(1234).random(in_grid.cell_count)
+        np.testing.assert_allclose(
+            frac.weights @ in_data,
+            frac_tris.weights @ np.concatenate((in_data, in_data)),
+        )
+
+        with self.assertRaises(ValueError):
+            RegridConservative(normalization="unknown")
+        with self.assertRaises(FinamMetaDataError):
+            regrid(UniformGrid(dims=(11, 7), data_location="POINTS"), out_grid)
+
+    def test_regrid_conservative_masked(self):
+        in_grid = UniformGrid(dims=(11, 7), spacing=(1.0, 1.5))
+        out_grid = UniformGrid(dims=(7, 5), spacing=(2.0, 3.0))
+        in_mask = np.zeros(in_grid.data_shape, dtype=bool)
+        in_mask[:2, :2] = True
+
+        regrid = RegridConservative(in_grid=in_grid, out_grid=out_grid)
+        regrid.input_mask = in_mask
+        regrid._update_grid_specs()
+        # first output cell fully masked, last row and column outside
+        expected = np.zeros(out_grid.data_shape, dtype=bool)
+        expected[0, 0] = expected[-1, :] = expected[:, -1] = True
+        np.testing.assert_array_equal(regrid.output_mask, expected)
+        self.assertEqual(regrid.weights.shape, (np.sum(~expected), np.sum(~in_mask)))
+
+        regrid = RegridConservative(
+            in_grid=in_grid, out_grid=out_grid, out_mask=Mask.NONE
+        )
+        regrid.input_mask = in_mask
+        with self.assertRaises(FinamDataError):
+            regrid._update_grid_specs()
+
+    def test_regrid_block(self):
+        in_grid = EsriGrid(ncols=12, nrows=8, cellsize=1.0)
+        out_grid = EsriGrid(
+            ncols=4, nrows=2, cellsize=2.0, xllcorner=2.0, yllcorner=4.0
+        )
+
+        in_data = np.random.default_rng(1234).random(in_grid.data_shape)
+        in_info = Info(time=None, grid=in_grid, units="m")
+
+        source = generators.CallbackGenerator(
+            callbacks={"Output": (lambda t: in_data, in_info)},
+            start=datetime(2000, 1, 1),
+            step=timedelta(days=1),
+        )
+        sink = debug.DebugConsumer(
+            {"Input": Info(None, grid=out_grid, units=None)},
+            start=datetime(2000, 1, 1),
+            step=timedelta(days=1),
+        )
+        composition = Composition([source, sink])
+        (source.outputs["Output"] >> RegridBlock() >> sink.inputs["Input"])
+        composition.connect()
+
+        out_data = sink.data["Input"][0].magnitude
+        self.assertEqual(out_data.shape, out_grid.data_shape)
+        # esri grids start at the top left corner
+        self.assertAlmostEqual(out_data[0, 0], np.mean(in_data[:2, 2:4]))
+        self.assertAlmostEqual(out_data[-1, -1], np.mean(in_data[2:4, 8:10]))
+
+    def test_regrid_block_methods(self):
+        grids = [
+            (
+                UniformGrid(dims=(13, 9)),
+                UniformGrid(dims=(4, 3), spacing=(3.0, 2.0), origin=(1.0, 2.0)),
+            ),
+            (
+                UniformGrid(
+                    dims=(13, 9), axes_reversed=True, axes_increase=(True, False)
+                ),
+                UniformGrid(
+                    dims=(4, 3), spacing=(3.0, 2.0), origin=(1.0, 2.0), order="C"
+                ),
+            ),
+            (
+                EsriGrid(ncols=6, nrows=4, cellsize=2.0),
+                UniformGrid(dims=(9, 6), spacing=(0.5, 1.0), origin=(1.5, 2.0)),
+            ),
+            (
+                UniformGrid(dims=(7, 5), spacing=(2.0, 1.0)),
+                UniformGrid(
+                    dims=(9, 8),
+                    spacing=(1.0, 0.5),
+                    origin=(1.0, 0.5),
+                    axes_increase=(False, False),
+                ),
+            ),
+        ]
+        rng = np.random.default_rng(1234)
+
+        def regrid(cls, in_grid, out_grid, in_data, **kwargs):
+            regrid = cls(in_grid=in_grid, out_grid=out_grid, **kwargs)
+            regrid.input_mask = Mask.NONE
+            regrid._update_grid_specs()
+            regrid.pull_data = lambda time, target: UNITS.Quantity(in_data, "m")
+            return regrid._get_data(None, None)
+
+        for in_grid, out_grid in grids:
+            in_data = rng.random(in_grid.data_shape)
+            mean = regrid(RegridBlock, in_grid, out_grid, in_data)
+            # aligned cells are fully covered, so conservative regridding is the block mean
+            expected = regrid(RegridConservative, in_grid, out_grid, in_data)
+            np.testing.assert_allclose(mean, expected, rtol=1e-12)
+
+            # integral is conserved
+            total = regrid(RegridBlock, in_grid, out_grid, in_data, method="sum")
+            np.testing.assert_allclose(
+                total * np.prod(in_grid.spacing) / np.prod(out_grid.spacing), mean
+            )
+
+            low = regrid(RegridBlock, in_grid, out_grid, in_data, method="min")
+            high = regrid(RegridBlock, in_grid, out_grid, in_data, method="max")
+            self.assertTrue(np.all(low <= mean + 1e-12))
+            self.assertTrue(np.all(mean <= high + 1e-12))
+
+        with self.assertRaises(ValueError):
+            RegridBlock(method="median")
+
+        for out_grid in (
+            UniformGrid(dims=(4, 3), spacing=(2.5, 2.0)),
+            UniformGrid(dims=(4, 3), spacing=(2.0, 2.0), origin=(0.5, 0.0)),
+            UniformGrid(dims=(8, 3), spacing=(2.0, 2.0)),
+            UniformGrid(dims=(4, 3), spacing=(2.0, 2.0), data_location="POINTS"),
+        ):
+            with self.assertRaises(FinamMetaDataError):
+                regrid(RegridBlock, UniformGrid(dims=(13, 9)), out_grid, None)
+
+    def test_regrid_block_masked(self):
+        in_grid = UniformGrid(dims=(7, 5))
+        out_grid = UniformGrid(dims=(4, 3), spacing=(2.0, 2.0))
+        in_mask = np.zeros(in_grid.data_shape, dtype=bool)
+        in_mask[:2, :2] = in_mask[2, 0] = True
+        in_data = np.ma.array(np.arange(24.0).reshape(6, 4), mask=in_mask)
+
+        regrid = RegridBlock(in_grid=in_grid, out_grid=out_grid)
+        regrid.input_mask = in_mask
+        regrid._update_grid_specs()
+        regrid.pull_data = lambda time, target: UNITS.Quantity(in_data, "m")
+        out_data = regrid._get_data(None, None)
+
+        expected = np.zeros(out_grid.data_shape, dtype=bool)
+        expected[0, 0] = True
+        np.testing.assert_array_equal(regrid.output_mask, expected)
+        np.testing.assert_array_equal(out_data.mask, expected)
+        # masked cells are ignored
+        self.assertAlmostEqual(out_data[1, 0], (9.0 + 12.0 + 13.0) / 3)
+
+        regrid = RegridBlock(in_grid=in_grid, out_grid=out_grid, out_mask=Mask.NONE)
+        regrid.input_mask = in_mask
+        with self.assertRaises(FinamDataError):
+            regrid._update_grid_specs()
+
     def test_remap_crs(self):
         time = datetime(2000, 1, 1)
 
@@ -309,6 +309,34 @@ class TestLinearInterpolation(unittest.TestCase):
             self.adapter.get_data(100, None)
 
 
+class TestLinearInterpolationDtype(unittest.TestCase):
+    def test_linear_interpolation_dtype(self):
+        start = datetime(2000, 1, 1)
+        source = CallbackGenerator(
+            callbacks={"Step": (lambda t: t.day - 1.0, Info(None, grid=NoGrid()))},
+            start=start,
+            step=timedelta(1.0),
+        )
+        adapter = LinearTime()
+
+        source.initialize()
+        source.outputs["Step"] >> adapter
+        adapter.get_info(Info(None, grid=NoGrid(), dtype="float32"))
+
+        source.connect(start)
+        source.connect(start)
+        source.validate()
+
+        self.assertEqual(adapter.in_info.dtype, np.float32)
+        self.assertEqual(adapter.info.dtype, np.float32)
+
+        source.update()
+        data = adapter.get_data(datetime(2000, 1, 1, 12), None)
+        self.assertEqual(data.dtype, np.float32)
+        self.assertEqual(data, 0.5)
+        self.assertTrue(all(d.dtype == np.float32 for _t, d in adapter.data))
+
+
 class TestLinearGridInterpolation(unittest.TestCase):
     def setUp(self):
         start = datetime(2000, 1, 1)
@@ -1,9 +1,10 @@
 import unittest
-from datetime import datetime
+from datetime import datetime, timedelta
 from os import path
 from tempfile import TemporaryDirectory
 
-from finam import UNITS, ComponentStatus, Info, Input, NoGrid
+from finam import UNITS, ComponentStatus, Composition, Info, Input, NoGrid
+from finam.components import DebugConsumer
 from finam.components.readers import CsvReader
 
 
@@ -99,6 +100,44 @@ class TestCsvReader(unittest.TestCase):
             reader.finalize()
             self.assertEqual(reader.status, ComponentStatus.FINALIZED)
 
+    def test_read_file_demand(self):
+        import pandas
+
+        with TemporaryDirectory() as tmp:
+            start = datetime(2000, 1, 1)
+            file = path.join(tmp, "test.csv")
+
+            data = pandas.DataFrame()
+            data["T"] = [f"2000-01-{d:02d}" for d in range(1, 11)]
+            data["X"] = list(range(1, 11))
+            data["Y"] = list(range(1, 11))
+            data.to_csv(file, sep=";", index=False)
+
+            reader = CsvReader(file, time_column="T", outputs={"X": "", "Y": ""})
+            received = []
+            sink = DebugConsumer(
+                inputs={"In": Info(None, grid=NoGrid(), units=None)},
+                start=start,
+                step=timedelta(days=3),
+                callbacks={"In": lambda _n, d, _t: received.append(d.magnitude[0])},
+            )
+            composition = Composition([reader, sink])
+            reader.outputs["X"] >> sink.inputs["In"]
+
+            pushed = []
+            push_data = reader.outputs["X"].push_data
+            reader.outputs["X"].push_data = lambda d, t: (
+                pushed.append(t.day),
+                push_data(d, t),
+            )
+
+            composition.run(end_time=datetime(2000, 1, 10))
+
+            self.assertTrue(reader.outputs["X"].demand.is_known)
+            self.assertFalse(reader.outputs["Y"].demand.connected)
+            self.assertEqual(pushed, [1, 4, 7, 10])
+            self.assertEqual(received, [1, 4, 7, 10])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -2,12 +2,16 @@
 Unit tests for the driver/scheduler.
 """
 
+import inspect
 import logging
 import os
 import pprint
+import sys
 import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from tempfile import TemporaryDirectory
+from time import sleep
 
 import numpy as np
 
@@ -31,14 +35,19 @@ from finam import (
 )
 from finam._version import __version__
 from finam.adapters.base import Scale
-from finam.adapters.time import DelayFixed, NextTime
+from finam.adapters.time import DelayFixed, LinearTime, NextTime
 from finam.components import (
     CallbackComponent,
     CallbackGenerator,
     DebugPushConsumer,
     debug,
 )
-from finam.schedule import _check_dead_links, _find_dependencies
+from finam.schedule import (
+    _check_dead_links,
+    _ComponentQueue,
+    _find_dependencies,
+    _resolve_dependencies,
+)
 
 
 class NoTimeComponent(Component):
@@ -559,6 +568,50 @@ class TestComposition(unittest.TestCase):
             {module3.outputs["Output"]: (datetime(2000, 1, 3), True)},
         )
 
+    def test_dependencies_compiled(self):
+        module1 = MockupComponent(
+            callbacks={"Output": lambda t: 1.0}, step=timedelta(1.0)
+        )
+        module2 = MockupCircularComponent(step=timedelta(1.0))
+        module3 = MockupDependentComponent(step=timedelta(1.0))
+
+        composition = Composition([module1, module2, module3])
+
+        module1.outputs["Output"] >> Scale(1.0) >> module2.inputs["Input"]
+        (
+            module2.outputs["Output"]
+            >> Scale(1.0)
+            >> DelayFixed(timedelta(days=2))
+            >> Scale(1.0)
+            >> module3.inputs["Input"]
+        )
+
+        composition.connect(datetime(2000, 1, 1))
+
+        self.assertEqual(composition._dependencies[module1], [])
+        self.assertEqual(len(composition._dependencies[module2]), 1)
+        self.assertEqual(len(composition._dependencies[module3]), 1)
+
+        out, owner_has_time, delay = composition._dependencies[module3][0]
+        self.assertIs(out, module2.outputs["Output"])
+        self.assertTrue(owner_has_time)
+        self.assertIsInstance(delay, DelayFixed)
+
+        for module in [module1, module2, module3]:
+            for day in range(1, 6):
+                time = datetime(2000, 1, day)
+                self.assertEqual(
+                    _resolve_dependencies(composition._dependencies[module], time),
+                    _find_dependencies(module, composition._output_owners, time),
+                )
+
+        self.assertEqual(
+            _resolve_dependencies(
+                composition._dependencies[module3], datetime(2000, 1, 5)
+            ),
+            {module2.outputs["Output"]: (datetime(2000, 1, 3), True)},
+        )
+
     def test_static_run(self):
         info = fm.Info(time=None, grid=fm.NoGrid())
 
@@ -670,6 +723,60 @@ class TestComposition(unittest.TestCase):
             ],
         )
 
+    def test_output_demand(self):
+        start = datetime(2000, 1, 1)
+
+        generated = {"Out1": [], "Out2": [], "Out3": []}
+        received = []
+
+        def callback(name):
+            def generate(t):
+                generated[name].append(t.day)
+                return t.day
+
+            return generate, Info(time=None, grid=NoGrid())
+
+        source = CallbackGenerator(
+            callbacks={name: callback(name) for name in generated},
+            start=start,
+            step=timedelta(days=1),
+            on_demand=True,
+        )
+        sink = debug.DebugConsumer(
+            inputs={
+                "In1": Info(time=None, grid=NoGrid()),
+                "In2": Info(time=None, grid=NoGrid()),
+            },
+            start=start,
+            step=timedelta(days=5),
+            callbacks={"In1": lambda _n, data, _t: received.append(data.magnitude[0])},
+        )
+        composition = Composition([source, sink])
+
+        source.outputs["Out1"] >> Scale(1.0) >> sink.inputs["In1"]
+        source.outputs["Out2"] >> NextTime() >> sink.inputs["In2"]
+
+        composition.connect()
+
+        demand = source.outputs["Out1"].demand
+        self.assertTrue(demand.connected)
+        self.assertTrue(demand.is_known)
+        self.assertEqual(demand.next_time, datetime(2000, 1, 6))
+        self.assertEqual(demand.coarsest_step, timedelta(days=5))
+        self.assertFalse(demand.is_needed(start, datetime(2000, 1, 6)))
+        self.assertTrue(demand.is_needed(datetime(2000, 1, 6), datetime(2000, 1, 7)))
+
+        self.assertFalse(source.outputs["Out2"].demand.is_known)
+        self.assertTrue(source.outputs["Out2"].demand.connected)
+        self.assertFalse(source.outputs["Out3"].demand.connected)
+
+        composition.run(end_time=datetime(2000, 1, 16))
+
+        self.assertEqual(generated["Out1"], [1, 6, 11, 16])
+        self.assertEqual(generated["Out2"], list(range(1, 17)))
+        self.assertEqual(generated["Out3"], [1])
+        self.assertEqual(received, [1, 6, 11, 16])
+
     def test_dependencies_schedule_no_push(self):
         start = datetime(2000, 1, 1)
         info = fm.Info(time=start, grid=fm.NoGrid())
@@ -789,6 +896,532 @@ class TestComposition(unittest.TestCase):
             ],
         )
 
+    def test_schedule_order(self):
+        updates = []
+
+        def make_callback(name):
+            def callback(t):
+                updates.append((name, t))
+                return 1.0
+
+            return callback
+
+        module1 = MockupComponent(
+            callbacks={"Output": make_callback("A")}, step=timedelta(days=2)
+        )
+        module2 = MockupComponent(
+            callbacks={"Output": make_callback("B")}, step=timedelta(days=1)
+        )
+        module3 = MockupComponent(
+            callbacks={"Output": make_callback("C")}, step=timedelta(days=2)
+        )
+        composition = Composition([module1, module2, module3])
+        composition.connect(datetime(2000, 1, 1))
+        updates.clear()
+
+        composition.run(end_time=datetime(2000, 1, 4))
+
+        self.assertEqual(
+            updates,
+            [
+                ("A", datetime(2000, 1, 3)),
+                ("B", datetime(2000, 1, 2)),
+                ("C", datetime(2000, 1, 3)),
+                ("B", datetime(2000, 1, 3)),
+                ("A", datetime(2000, 1, 5)),
+                ("B", datetime(2000, 1, 4)),
+                ("C", datetime(2000, 1, 5)),
+            ],
+        )
+
+    def test_component_queue(self):
+        module1 = MockupComponent(callbacks={}, step=timedelta(days=2))
+        module2 = MockupComponent(callbacks={}, step=timedelta(days=1))
+        composition = Composition([module1, module2])
+        composition.connect(datetime(2000, 1, 1))
+
+        queue = _ComponentQueue([module1, module2], datetime(2000, 1, 3))
+        self.assertTrue(queue.any_running)
+        self.assertIs(queue.first(), module1)
+
+        module1.update()
+        queue.update(module1)
+        self.assertIs(queue.first(), module2)
+        self.assertTrue(queue.any_running)
+
+        module2.update()
+        queue.update(module2)
+        self.assertIs(queue.first(), module2)
+
+        module2.update()
+        queue.update(module2)
+        self.assertIs(queue.first(), module1)
+        self.assertFalse(queue.any_running)
+
+    def _build_concurrent_composition(self, updates):
+        start = datetime(2000, 1, 1)
+        info = fm.Info(time=None, grid=fm.NoGrid())
+
+        def record(label, time, value):
+            updates.setdefault(label, []).append(time)
+            return value
+
+        def receive(name, data, t):
+            updates.setdefault(name, []).append((t, float(data.magnitude[0])))
+
+        components = []
+        for i in range(3):
+            generator = CallbackGenerator(
+                callbacks={
+                    "Out": (
+                        lambda t, i=i: record(f"Gen{i}", t, i * 100.0 + t.day),
+                        info.copy(),
+                    )
+                },
+                start=start,
+                step=timedelta(days=1 + i),
+            )
+            transform = CallbackComponent(
+                inputs={"In": info.copy()},
+                outputs={"Out": info.copy()},
+                callback=lambda inp, t, i=i: {
+                    "Out": record(f"Transform{i}", t, inp["In"] * 2.0)
+                },
+                start=start,
+                step=timedelta(days=2),
+            )
+            consumer = debug.DebugConsumer(
+                inputs={f"In1_{i}": info.copy(), f"In2_{i}": info.copy()},
+                callbacks={f"In1_{i}": receive, f"In2_{i}": receive},
+                start=start,
+                step=timedelta(days=3),
+            )
+            components.append((generator, transform, consumer))
+
+        # two components with the same step, sharing an upstream output
+        shared = [
+            CallbackComponent(
+                inputs={"In": info.copy()},
+                outputs={},
+                callback=lambda inp, t, i=i: record(
+                    f"Shared{i}", (t, float(inp["In"][0].magnitude)), {}
+                ),
+                start=start,
+                step=timedelta(days=4),
+            )
+            for i in range(2)
+        ]
+
+        composition = Composition([c for comps in components for c in comps] + shared)
+
+        for i, (generator, transform, consumer) in enumerate(components):
+            generator["Out"] >> Scale(1.0) >> transform["In"]
+            transform["Out"] >> consumer[f"In1_{i}"]
+            generator["Out"] >> consumer[f"In2_{i}"]
+
+        for comp in shared:
+            components[0][0]["Out"] >> comp["In"]
+
+        return composition, components, shared
+
+    def test_run_executor(self):
+        updates_serial = {}
+        composition, _, _ = self._build_concurrent_composition(updates_serial)
+        composition.run(end_time=datetime(2000, 2, 1))
+
+        updates = {}
+        composition, _, _ = self._build_concurrent_composition(updates)
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            composition.run(end_time=datetime(2000, 2, 1), executor=executor)
+
+        self.assertEqual(updates.keys(), updates_serial.keys())
+        # each component is updated in the same order as in a serial run
+        for label, times in updates_serial.items():
+            self.assertEqual(updates[label], times, label)
+            self.assertGreater(len(times), 1)
+
+        self.assertEqual(updates["Shared0"], updates["Shared1"])
+        self.assertEqual(
+            updates["Shared0"],
+            [
+                (t, float(t.day))
+                for t in (
+                    datetime(2000, 1, 1) + timedelta(days=4 * k) for k in range(1, 9)
+                )
+            ],
+        )
+
+    def test_run_executor_batch(self):
+        composition, components, shared = self._build_concurrent_composition({})
+        composition.connect()
+
+        generators = [comps[0] for comps in components]
+        consumers = [comps[2] for comps in components]
+        queue = _ComponentQueue(generators, datetime(2000, 2, 1))
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            batch = composition._update_concurrent(queue.ready(), executor)
+            self.assertEqual(batch, generators)
+
+            queue = _ComponentQueue(consumers, datetime(2000, 2, 1))
+            batch = composition._update_concurrent(queue.ready(), executor)
+            # the first generator lags behind the transform's next time
+            self.assertEqual(
+                batch, [components[0][0], components[1][1], components[2][1]]
+            )
+
+            # transform and consumer of the same chain are not independent
+            queue = _ComponentQueue(
+                [components[0][1], components[0][2]], datetime(2000, 2, 1)
+            )
+            batch = composition._update_concurrent(queue.ready(), executor)
+            self.assertEqual(len(batch), 1)
+
+            # components sharing an upstream output are not independent
+            for _ in range(4):
+                components[0][0].update()
+            queue = _ComponentQueue(shared, datetime(2000, 2, 1))
+            batch = composition._update_concurrent(queue.ready(), executor)
+            self.assertEqual(batch, shared[:1])
+
+    def test_run_executor_schedule(self):
+        start = datetime(2000, 1, 1)
+        info = fm.Info(time=start, grid=fm.NoGrid())
+        updates = []
+
+        module1 = CallbackGenerator(
+            callbacks={"Out": (lambda t: updates.append("A") or t.day, info)},
+            start=start,
+            step=timedelta(days=1),
+        )
+        module2 = CallbackComponent(
+            inputs={"In": fm.Info(time=None, grid=fm.NoGrid())},
+            outputs={"Out": fm.Info(time=None, grid=fm.NoGrid())},
+            callback=lambda inp, _t: updates.append("B") or {"Out": inp["In"]},
+            start=start,
+            step=timedelta(days=3),
+        )
+        composition = Composition([module1, module2])
+        module1.outputs["Out"] >> Scale(1.0) >> module2.inputs["In"]
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            composition.run(end_time=datetime(2000, 1, 4), executor=executor)
+
+        self.assertEqual(updates, ["A", "B", "A", "A", "A", "B"])
+
+    def test_memory_budget(self):
+        start = datetime(2000, 1, 1)
+        info = fm.Info(time=None, grid=fm.UniformGrid((51, 51)), units="")
+        nbytes = 50 * 50 * 8
+
+        gen1 = CallbackGenerator(
+            callbacks={"Out": (lambda t: np.full((50, 50), float(t.day)), info)},
+            start=start,
+            step=timedelta(days=1),
+        )
+        gen2 = CallbackGenerator(
+            callbacks={"Out": (lambda t: np.full((50, 50), float(t.day)), info)},
+            start=start,
+            step=timedelta(days=1),
+        )
+
+        usage = []
+        received = {}
+
+        def callback(name, data, time):
+            usage.append(composition.memory_budget.used)
+            received.setdefault(name, []).append((time, float(data.magnitude.flat[0])))
+
+        consumer = debug.DebugConsumer(
+            inputs={"In1": info.copy_with(), "In2": info.copy_with()},
+            start=start,
+            step=timedelta(days=10),
+            callbacks={"In1": callback, "In2": callback},
+        )
+
+        with TemporaryDirectory() as tmp:
+            composition = Composition(
+                [gen1, gen2, consumer],
+                slot_memory_location=tmp,
+                memory_budget=5 * nbytes,
+            )
+
+            gen1.outputs["Out"] >> consumer.inputs["In1"]
+            gen2.outputs["Out"] >> NextTime() >> consumer.inputs["In2"]
+
+            composition.connect()
+            self.assertIs(gen1.outputs["Out"].memory_budget, composition.memory_budget)
+            composition.run(end_time=datetime(2000, 1, 30))
+
+            budget = composition.memory_budget
+            self.assertEqual(budget.limit, 5 * nbytes)
+            self.assertGreater(budget.spilled, 0)
+            self.assertTrue(all(u <= 5 * nbytes for u in usage))
+            self.assertEqual(
+                received["In1"],
+                [(datetime(2000, 1, d), float(d)) for d in [1, 11, 21, 31]],
+            )
+            self.assertEqual(received["In1"], received["In2"])
+
+            self.assertEqual(budget.used, 0)
+            self.assertEqual(budget.usage(), {})
+
+    def test_memory_budget_executor(self):
+        start = datetime(2000, 1, 1)
+        info = fm.Info(time=None, grid=fm.UniformGrid((21, 21)), units="")
+        nbytes = 20 * 20 * 8
+
+        def run(tmp, adapter=None, executor=None):
+            received = {}
+            spills = []
+
+            def receive(name, data, time):
+                received[name].append((time, float(data.magnitude.flat[0])))
+
+            components = []
+            for i in range(4):
+                generator = CallbackGenerator(
+                    callbacks={
+                        "Out": (
+                            lambda t, i=i: np.full((20, 20), i * 100.0 + t.day),
+                            info.copy(),
+                        )
+                    },
+                    start=start,
+                    step=timedelta(days=1),
+                )
+                consumer = debug.DebugConsumer(
+                    inputs={f"In{i}": info.copy()},
+                    callbacks={f"In{i}": receive},
+                    start=start,
+                    step=timedelta(days=2 + i),
+                )
+                received[f"In{i}"] = []
+                components.append((generator, consumer))
+
+            composition = Composition(
+                [c for comps in components for c in comps],
+                slot_memory_location=tmp,
+                memory_budget=3 * nbytes,
+            )
+            for i, (generator, consumer) in enumerate(components):
+                if adapter is None:
+                    generator["Out"] >> consumer[f"In{i}"]
+                    continue
+
+                ada = adapter()
+                spill = ada._spill
+                ada._spill = lambda data, spill=spill: spills.append(1) or spill(data)
+                generator["Out"] >> ada >> consumer[f"In{i}"]
+
+            composition.run(end_time=datetime(2000, 1, 30), executor=executor)
+            return received, composition.memory_budget, spills
+
+        for adapter in [None, LinearTime, NextTime]:
+            with self.subTest(adapter=adapter):
+                with TemporaryDirectory() as tmp:
+                    received_serial, _budget, _spills = run(
+                        os.path.join(tmp, "serial"), adapter
+                    )
+                    with ThreadPoolExecutor(max_workers=4) as executor:
+                        received, budget, spills = run(
+                            os.path.join(tmp, "concurrent"), adapter, executor
+                        )
+
+                self.assertGreater(budget.spilled, 0)
+                self.assertEqual(budget.used, 0)
+                self.assertEqual(received, received_serial)
+                for values in received.values():
+                    self.assertGreater(len(values), 1)
+                # data cached by the adapters is spilled as well
+                if adapter is not None:
+                    self.assertGreater(len(spills), 0)
+
+    def test_prefetch_slots(self):
+        start = datetime(2000, 1, 1)
+        info = fm.Info(time=None, grid=fm.UniformGrid((11, 11)), units="")
+
+        gen = CallbackGenerator(
+            callbacks={
+                "Out1": (lambda t: np.full((10, 10), float(t.day)), info),
+                "Out2": (lambda t: np.full((10, 10), float(t.day)), info),
+            },
+            start=start,
+            step=timedelta(days=1),
+        )
+        received = []
+        consumer = debug.DebugConsumer(
+            inputs={"In1": info.copy_with(), "In2": info.copy_with()},
+            start=start,
+            step=timedelta(days=3),
+            callbacks={
+                "In2": lambda n, d, t: received.append(float(d.magnitude.flat[0]))
+            },
+        )
+
+        with TemporaryDirectory() as tmp:
+            composition = Composition(
+                [gen, consumer], slot_memory_location=tmp, slot_memory_limit=0
+            )
+
+            adapter = NextTime()
+            gen.outputs["Out1"] >> consumer.inputs["In1"]
+            gen.outputs["Out2"] >> adapter >> consumer.inputs["In2"]
+
+            composition.connect()
+            self.assertEqual(
+                composition._prefetch_slots,
+                {consumer: [gen.outputs["Out1"], adapter, gen.outputs["Out2"]]},
+            )
+
+            composition.run(end_time=datetime(2000, 1, 10))
+            self.assertEqual(received, [1.0, 4.0, 7.0, 10.0])
+
+    def test_slot_memory_codec(self):
+        start = datetime(2000, 1, 1)
+        info = fm.Info(time=None, grid=fm.UniformGrid((11, 11)), units="")
+
+        gen = CallbackGenerator(
+            callbacks={"Out": (lambda t: np.full((10, 10), float(t.day)), info)},
+            start=start,
+            step=timedelta(days=1),
+        )
+        received = []
+        consumer = debug.DebugConsumer(
+            inputs={"In": info.copy_with()},
+            start=start,
+            step=timedelta(days=3),
+            callbacks={
+                "In": lambda n, d, t: received.append(float(d.magnitude.flat[0]))
+            },
+        )
+
+        with TemporaryDirectory() as tmp:
+            composition = Composition(
+                [gen, consumer],
+                slot_memory_location=tmp,
+                slot_memory_limit=0,
+                slot_memory_codec="zlib",
+            )
+            adapter = NextTime()
+            gen.outputs["Out"] >> adapter >> consumer.inputs["In"]
+
+            composition.run(end_time=datetime(2000, 1, 10))
+            self.assertIs(gen.outputs["Out"].memory_codec, fm.tools.CODECS["zlib"])
+            self.assertIs(adapter.memory_codec, fm.tools.CODECS["zlib"])
+            self.assertEqual(received, [1.0, 4.0, 7.0, 10.0])
+
+        with self.assertRaises(ValueError):
+            Composition([], slot_memory_codec="gzip")
+
+    def test_slot_validate_pushes(self):
+        start = datetime(2000, 1, 1)
+        info = fm.Info(time=None, grid=fm.UniformGrid((3, 3)), units="")
+        data = np.zeros((2, 2))
+
+        for validate, fails in [(None, True), (1, False)]:
+            gen = CallbackGenerator(
+                callbacks={"Out": (lambda t: data, info)},
+                start=start,
+                step=timedelta(days=1),
+            )
+            consumer = debug.DebugConsumer(
+                inputs={"In": info.copy_with()},
+                start=start,
+                step=timedelta(days=1),
+            )
+            composition = Composition(
+                [gen, consumer], print_log=False, slot_validate_pushes=validate
+            )
+            gen.outputs["Out"] >> consumer.inputs["In"]
+
+            self.assertEqual(gen.outputs["Out"].validate_pushes, validate)
+            if fails:
+                with self.assertRaises(fm.errors.FinamDataError):
+                    composition.run(end_time=datetime(2000, 1, 5))
+            else:
+                composition.run(end_time=datetime(2000, 1, 5))
+
+    def test_run_executor_error(self):
+        start = datetime(2000, 1, 1)
+        info = fm.Info(time=None, grid=fm.NoGrid())
+        finished = []
+
+        def fail(t):
+            if t > start:
+                raise ValueError("update failed")
+            return 0.0
+
+        def slow(t):
+            if t > start:
+                sleep(0.2)
+                finished.append(t)
+            return 0.0
+
+        gen1 = CallbackGenerator(
+            callbacks={"Out": (fail, info.copy())}, start=start, step=timedelta(days=1)
+        )
+        gen2 = CallbackGenerator(
+            callbacks={"Out": (slow, info.copy())}, start=start, step=timedelta(days=1)
+        )
+        composition = Composition([gen1, gen2], print_log=False)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            with self.assertRaises(ValueError):
+                composition.run(end_time=datetime(2000, 1, 3), executor=executor)
+            # the other update of the batch was completed before raising
+            self.assertEqual(finished, [datetime(2000, 1, 2)])
+
+    def test_run_executor_fail(self):
+        module = MockupComponent(callbacks={"Output": lambda t: t}, step=timedelta(1.0))
+        composition = Composition([module])
+
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            with self.assertRaises(ValueError):
+                composition.run(end_time=datetime(2000, 1, 2), executor=executor)
+
+    def test_update_target_deep_chain(self):
+        start = datetime(2000, 1, 1)
+        info = fm.Info(time=None, grid=fm.NoGrid(), mask=fm.Mask.NONE)
+
+        source = CallbackGenerator(
+            callbacks={"Out": (lambda t: 1.0, info.copy())},
+            start=start,
+            step=timedelta(days=1),
+        )
+        weights = fm.components.StaticCallbackGenerator(
+            callbacks={"Weight": (lambda: 1.0, info.copy())}
+        )
+        stages = [fm.components.WeightedSum(inputs=["In"]) for _ in range(200)]
+        sink = debug.DebugConsumer(
+            inputs={"In": info.copy()},
+            start=start,
+            step=timedelta(days=1),
+        )
+        composition = Composition([source, weights] + stages + [sink])
+
+        slot = source["Out"]
+        for stage in stages:
+            slot >> stage["In"]
+            weights["Weight"] >> stage["In_weight"]
+            slot = stage["WeightedSum"]
+        slot >> sink["In"]
+
+        composition.connect()
+
+        # chain is deeper than the remaining recursion depth
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(len(inspect.stack()) + 100)
+        try:
+            target = composition._find_update_target(sink)
+        finally:
+            sys.setrecursionlimit(limit)
+
+        self.assertIs(target, source)
+        source.update()
+        self.assertIs(composition._find_update_target(sink), sink)
+        self.assertIs(composition._find_update_target(source), source)
+
     def test_dependency_fail(self):
         start = datetime(2000, 1, 1)
         info = fm.Info(time=start, grid=fm.NoGrid())
@@ -820,9 +1453,15 @@ class TestComposition(unittest.TestCase):
 
         composition.connect(start)
 
-        with self.assertRaises(FinamCircularCouplingError):
+        with self.assertRaises(FinamCircularCouplingError) as context:
             composition.run(end_time=datetime(2000, 1, 2))
 
+        self.assertIn(
+            "CallbackComponent >> (8 days, 0:00:00) CallbackComponent >> "
+            "(5 days, 0:00:00) CallbackComponent",
+            str(context.exception),
+        )
+
     def test_starting_time(self):
         start_1 = datetime(2000, 1, 1)
         start_2 = datetime(2000, 1, 8)
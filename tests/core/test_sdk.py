@@ -9,6 +9,7 @@ import unittest
 from datetime import datetime, timedelta
 
 import numpy as np
+import pint
 
 import finam as fm
 from finam import (
@@ -33,6 +34,7 @@ from finam import (
     UniformGrid,
 )
 from finam.sdk.component import IOList
+from finam.sdk.output import DataCache, TimeMemo
 
 
 class MockupAdapter(Adapter):
@@ -43,6 +45,20 @@ class MockupAdapter(Adapter):
         return time
 
 
+class MockupPureAdapter(Adapter):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    @property
+    def is_pure(self):
+        return True
+
+    def _get_data(self, time, target):
+        self.calls += 1
+        return self.pull_data(time, target) * 2.0
+
+
 class MockupComponent(TimeComponent):
     def __init__(self):
         super().__init__()
@@ -213,7 +229,7 @@ class TestOutput(unittest.TestCase):
         in1 = Input(name="In1")
         in2 = Input(name="In1")
 
-        ada = fm.adapters.Scale(2.0)
+        ada = fm.adapters.Callback(lambda data, _t: data)
 
         out >> ada
         ada >> in1
@@ -227,6 +243,22 @@ class TestOutput(unittest.TestCase):
         with self.assertRaises(ValueError):
             in1.ping()
 
+    def test_know_targets_pure_adapter(self):
+        out = Output(name="Output")
+        in1 = Input(name="In1")
+        in2 = Input(name="In1")
+
+        ada = fm.adapters.Scale(2.0)
+
+        out >> ada
+        ada >> in1
+        ada >> in2
+
+        in1.ping()
+        in2.ping()
+
+        self.assertEqual(out._connected_inputs, {in1: None, in2: None})
+
     def test_know_targets_adapter(self):
         out = Output(name="Output")
         in1 = Input(name="In1")
@@ -340,6 +372,51 @@ class TestOutput(unittest.TestCase):
         in2.pull_data(datetime(2000, 1, 10))
         self.assertEqual(len(out.data), 1)
 
+    def test_push_deferred(self):
+        t = datetime(2000, 1, 1)
+        info = Info(time=t, grid=NoGrid(), units="m")
+
+        out = Output(name="Output")
+        in1 = Input(name="Input")
+        in2 = Input(name="Input")
+
+        out >> in1
+        out >> in2
+
+        in1.ping()
+        in2.ping()
+
+        out.push_info(info)
+        in1.exchange_info(info)
+        in2.exchange_info(Info(time=t, grid=NoGrid(), units="km"))
+
+        evaluated = []
+
+        def produce(time):
+            evaluated.append(time)
+            return float(time.day)
+
+        for i in range(10):
+            out.push_data(produce, t + timedelta(days=i))
+
+        self.assertEqual(len(out.data), 10)
+        self.assertEqual(out.time, t + timedelta(days=9))
+        self.assertEqual(evaluated, [])
+
+        data = in1.pull_data(datetime(2000, 1, 5, 6))
+        self.assertEqual(data[0], 5.0 * fm.UNITS.meter)
+        self.assertEqual(evaluated, [datetime(2000, 1, 5)])
+
+        data = in2.pull_data(datetime(2000, 1, 5))
+        self.assertEqual(data[0], 0.005 * fm.UNITS.kilometer)
+        self.assertEqual(evaluated, [datetime(2000, 1, 5)])
+        self.assertEqual(len(out.data), 6)
+
+        in1.pull_data(datetime(2000, 1, 10))
+        in2.pull_data(datetime(2000, 1, 10))
+        self.assertEqual(evaluated, [datetime(2000, 1, 5), datetime(2000, 1, 10)])
+        self.assertEqual(len(out.data), 1)
+
     def test_push_static(self):
         t = datetime(2000, 1, 1)
         info = Info(time=t, grid=NoGrid())
@@ -378,6 +455,160 @@ class TestOutput(unittest.TestCase):
         with self.assertRaises(FinamDataError):
             out.push_data(in_data, t)
 
+    def test_data_copied_trusted(self):
+        t = datetime(2000, 1, 1)
+        info = Info(time=t, grid=fm.UniformGrid((1, 1)))
+
+        out = Output(name="Output")
+        out.validate_pushes = 1
+        in1 = Input(name="Input")
+
+        out >> in1
+
+        in1.ping()
+
+        out.push_info(info)
+        in1.exchange_info(info)
+
+        in_data = fm.data.full(0.0, info)
+        out.push_data(in_data, t)
+        out.push_data(in_data, t)
+
+        with self.assertRaises(FinamDataError):
+            out.push_data(np.zeros((1, 2)), t)
+
+    def test_data_trusted_dtype(self):
+        t = datetime(2000, 1, 1)
+        info = Info(time=t, grid=fm.UniformGrid((3, 4)), units="m", dtype="float32")
+
+        out = Output(name="Output")
+        out.validate_pushes = 1
+        in1 = Input(name="Input")
+
+        out >> in1
+        in1.ping()
+
+        out.push_info(info)
+        in1.exchange_info(info)
+
+        for i in range(3):
+            out.push_data(np.full((2, 3), float(i)), t + timedelta(days=i))
+            self.assertEqual(out.data[-1][1].dtype, np.float32)
+
+        data = in1.pull_data(t + timedelta(days=2))
+        self.assertEqual(data.dtype, np.float32)
+        self.assertEqual(data[0, 0, 0], 2.0 * fm.UNITS.meter)
+
+    def test_light_transport(self):
+        t = datetime(2000, 1, 1)
+        info1 = Info(time=t, grid=fm.UniformGrid((3, 3)), units="m")
+        info2 = Info(time=t, grid=fm.UniformGrid((3, 3)), units="km")
+
+        out = Output(name="Output")
+        in1 = Input(name="Input")
+
+        out >> in1
+
+        in1.ping()
+
+        out.push_info(info1)
+        in1.exchange_info(info2)
+
+        in_data = np.full((1, 2, 2), 1000.0)
+        out.push_data(in_data, t)
+
+        cached = out.data[0][1]
+        self.assertIsInstance(cached, fm.data.LightQuantity)
+        self.assertIs(cached.magnitude, in_data)
+
+        light = out.get_light_data(t, in1)
+        self.assertIs(light, cached)
+        data = out.get_data(t, in1)
+        self.assertIsInstance(data, pint.Quantity)
+        self.assertIs(data.magnitude, in_data)
+
+        out_data = in1.pull_data(t, in1)
+        self.assertIsInstance(out_data, pint.Quantity)
+        self.assertEqual(out_data.units, fm.UNITS.kilometer)
+        np.testing.assert_allclose(out_data.magnitude, 1.0)
+
+    def test_light_transport_get_data_override(self):
+        t = datetime(2000, 1, 1)
+        info = Info(time=t, grid=fm.UniformGrid((3, 3)), units="m")
+
+        class ScaledOutput(Output):
+            def get_data(self, time, target):
+                return super().get_data(time, target) * 2.0
+
+        out = ScaledOutput(name="Output")
+        in1 = Input(name="Input")
+
+        out >> in1
+        in1.ping()
+
+        out.push_info(info)
+        in1.exchange_info(info)
+
+        out.push_data(np.full((1, 2, 2), 1.0), t)
+
+        out_data = in1.pull_data(t, in1)
+        self.assertIsInstance(out_data, pint.Quantity)
+        self.assertEqual(out_data.units, fm.UNITS.meter)
+        np.testing.assert_allclose(out_data.magnitude, 2.0)
+
+    def test_dtype(self):
+        t = datetime(2000, 1, 1)
+        info = Info(time=t, grid=UniformGrid((2, 3)), units="m")
+
+        out = Output(name="Output")
+        in1 = Input(name="In1")
+        in2 = Input(name="In2")
+        in3 = Input(name="In3")
+        out >> in1
+        out >> in2
+        out >> in3
+        in1.ping()
+        in2.ping()
+        in3.ping()
+
+        out.push_info(info)
+        in1.exchange_info(info.copy_with(dtype="float32"))
+        in2.exchange_info(info.copy_with(dtype="float64"))
+        in3.exchange_info(info)
+
+        self.assertEqual(out.info.dtype, np.float32)
+        self.assertEqual(in1.info.dtype, np.float32)
+        self.assertEqual(in2.info.dtype, np.float64)
+        self.assertEqual(in3.info.dtype, np.float32)
+
+        out.memory_limit = 0
+        with tempfile.TemporaryDirectory() as td:
+            out.memory_location = td
+            out.push_data(fm.data.full(1.5, info), t)
+            self.assertEqual(out.data[0][1].dtype, np.float32)
+
+            data1 = in1.pull_data(t)
+            data2 = in2.pull_data(t)
+            data3 = in3.pull_data(t)
+            self.assertEqual(data1.dtype, np.float32)
+            self.assertEqual(data2.dtype, np.float64)
+            self.assertEqual(data3.dtype, np.float32)
+            np.testing.assert_allclose(data2.magnitude, 1.5)
+            out.finalize()
+
+    def test_dtype_fail(self):
+        t = datetime(2000, 1, 1)
+        info = Info(time=t, grid=NoGrid(), units="m", dtype="float64")
+
+        out = Output(name="Output")
+        inp = Input(name="Input")
+        out >> inp
+        inp.ping()
+        out.push_info(info)
+
+        with self.assertRaises(FinamMetaDataError):
+            inp.exchange_info(info.copy_with(dtype="int32"))
+
     def test_data_copied_units(self):
         t = datetime(2000, 1, 1)
         info1 = Info(time=t, grid=fm.UniformGrid((1, 1)), units="m")
@@ -422,24 +653,136 @@ class TestOutput(unittest.TestCase):
 
             in_data = fm.data.full(0.0, info)
             out.push_data(np.copy(in_data), datetime(2000, 1, 1))
-            out.push_data(np.copy(in_data), datetime(2000, 1, 2))
+            out.push_data(np.copy(in_data) + 1.0, datetime(2000, 1, 2))
 
-            self.assertTrue(os.path.isfile(os.path.join(td, f"{oid}-{0}.npy")))
-            self.assertTrue(os.path.isfile(os.path.join(td, f"{oid}-{1}.npy")))
+            arena_file = os.path.join(td, f"{oid}-0.arena")
+            self.assertTrue(os.path.isfile(arena_file))
+            self.assertEqual(out._total_mem, 0)
 
             data = in1.pull_data(datetime(2000, 1, 2), in1)
 
-            np.testing.assert_allclose(data.magnitude, in_data.magnitude)
+            np.testing.assert_allclose(data.magnitude, in_data.magnitude + 1.0)
             self.assertEqual(data.units, in_data.units)
             self.assertEqual(data.units, info.units)
+            self.assertEqual(len(out.data), 1)
+
+            out.finalize()
+
+            self.assertFalse(os.path.isfile(arena_file))
 
-            self.assertFalse(os.path.isfile(os.path.join(td, f"{oid}-{0}.npy")))
-            self.assertTrue(os.path.isfile(os.path.join(td, f"{oid}-{1}.npy")))
+    def test_memory_limit_codec(self):
+        t = datetime(2000, 1, 1)
+        info = Info(time=t, grid=fm.UniformGrid((100, 100)), units="m")
+        info2 = Info(time=t, grid=fm.UniformGrid((100, 100)), units="km")
+
+        with tempfile.TemporaryDirectory() as td:
+            out = Output(name="Output")
+            out.memory_limit = 0
+            out.memory_location = td
+            out.memory_codec = "shuffle"
+
+            in1 = Input(name="Input")
+            out >> in1
+            in1.ping()
+
+            out.push_info(info)
+            in1.exchange_info(info2)
+
+            in_data = fm.data.full(1000.0, info)
+            in_data = fm.data.to_masked(in_data, mask=in_data.magnitude > 0)
+            in_data.magnitude.mask[..., :10] = False
+            out.push_data(in_data, t)
+
+            arena_file = os.path.join(td, f"{id(out)}-0.arena")
+            self.assertTrue(os.path.isfile(arena_file))
+            self.assertEqual(out.data[0][1].codec, out.memory_codec)
+
+            data = in1.pull_data(t, in1)
+            self.assertEqual(data.units, fm.UNITS.Unit("km"))
+            self.assertTrue(fm.data.is_masked_array(data))
+            np.testing.assert_equal(data.magnitude.mask, in_data.magnitude.mask)
+            np.testing.assert_allclose(data.magnitude.compressed(), 1.0)
 
             out.finalize()
 
-            self.assertFalse(os.path.isfile(os.path.join(td, f"{oid}-{0}.npy")))
-            self.assertFalse(os.path.isfile(os.path.join(td, f"{oid}-{1}.npy")))
+        with self.assertRaises(ValueError):
+            out.memory_codec = "gzip"
+
+
+class TestDataCache(unittest.TestCase):
+    def test_cache(self):
+        t = datetime(2000, 1, 1)
+        cache = DataCache()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache, [])
+
+        for i in range(100):
+            cache.append((t + timedelta(days=i), i))
+
+        self.assertEqual(len(cache), 100)
+        self.assertEqual(cache[0], (t, 0))
+        self.assertEqual(cache[-1], (t + timedelta(days=99), 99))
+        self.assertEqual(cache.bisect(t), 0)
+        self.assertEqual(cache.bisect(t + timedelta(days=10)), 10)
+        self.assertEqual(cache.bisect(t + timedelta(days=9, hours=1)), 10)
+
+        for i in range(60):
+            self.assertEqual(cache.popleft(), (t + timedelta(days=i), i))
+
+        self.assertEqual(len(cache), 40)
+        self.assertEqual(cache[0], (t + timedelta(days=60), 60))
+        self.assertEqual(cache[1:3], [(t + timedelta(days=i), i) for i in [61, 62]])
+        self.assertEqual(cache.bisect(t), 0)
+        self.assertEqual(cache.bisect(t + timedelta(days=70)), 10)
+        self.assertEqual(cache, [(t + timedelta(days=i), i) for i in range(60, 100)])
+
+        with self.assertRaises(IndexError):
+            _ = cache[40]
+        with self.assertRaises(IndexError):
+            _ = cache[-41]
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        with self.assertRaises(IndexError):
+            cache.popleft()
+
+
+class TestTimeMemo(unittest.TestCase):
+    def test_memo(self):
+        t = datetime(2000, 1, 1)
+        memo = TimeMemo()
+        memo.add_target("a")
+        memo.add_target("b")
+        memo.add_target("a")
+        self.assertEqual(memo.target_count, 2)
+
+        calls = 0
+
+        def func():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        self.assertEqual(memo.get(t, "a", func), 1)
+        self.assertEqual(memo.get(t + timedelta(days=1), "a", func), 2)
+        self.assertEqual(len(memo), 2)
+
+        hits = []
+        self.assertEqual(memo.get(t, "b", func, lambda: hits.append(t)), 1)
+        self.assertEqual(hits, [t])
+        self.assertEqual(calls, 2)
+        self.assertEqual(len(memo), 1)
+
+        self.assertEqual(memo.get(t + timedelta(days=1), "b", func), 2)
+        self.assertEqual(calls, 2)
+        self.assertEqual(len(memo), 0)
+
+        memo.get(t + timedelta(days=2), "a", func)
+        memo.clear()
+        self.assertEqual(len(memo), 0)
+        self.assertEqual(memo.target_count, 2)
+        self.assertEqual(memo.get(t + timedelta(days=2), "b", func), 4)
+        self.assertEqual(len(memo), 1)
 
 
 class TestInput(unittest.TestCase):
@@ -543,6 +886,10 @@ class TestInput(unittest.TestCase):
         self.assertEqual(in_data.shape, (1, 199, 299))
         self.assertEqual(out_data.shape, (1, 299, 199))
 
+        # a strided view, without copying the data
+        self.assertTrue(np.shares_memory(out_data.magnitude, in_data.magnitude))
+        np.testing.assert_array_equal(out_data.magnitude[0], in_data.magnitude[0].T)
+
 
 class TestCallbackInput(unittest.TestCase):
     def test_callback_input(self):
@@ -611,6 +958,38 @@ class TestCallbackOutput(unittest.TestCase):
         with self.assertRaises(FinamNoDataError):
             _data = out.get_data(t, None)
 
+    def test_callback_output_pure(self):
+        counter = 0
+        t = datetime(2000, 1, 1)
+
+        def callback(_clr, time):
+            nonlocal counter
+            counter += 1
+            return float(time.day)
+
+        out = CallbackOutput(callback=callback, name="callback", pure=True)
+        in1 = Input(name="In1")
+        in2 = Input(name="In2")
+
+        out >> in1
+        out >> in2
+        in1.ping()
+        in2.ping()
+
+        self.assertTrue(out.is_pure)
+
+        out.push_info(Info(time=t, grid=NoGrid(), units="m"))
+        in1.exchange_info(Info(time=t, grid=NoGrid(), units="m"))
+        in2.exchange_info(Info(time=t, grid=NoGrid(), units="m"))
+
+        for i in range(3):
+            time = t + timedelta(days=i)
+            self.assertEqual(in1.pull_data(time)[0], (i + 1) * fm.UNITS.meter)
+            self.assertEqual(in2.pull_data(time)[0], (i + 1) * fm.UNITS.meter)
+
+        self.assertEqual(counter, 3)
+        self.assertEqual(len(out._memo), 0)
+
 
 class TestIOList(unittest.TestCase):
     def test_io_list(self):
@@ -735,6 +1114,44 @@ class TestAdapter(unittest.TestCase):
         adapter = MockupAdapter()
         self.assertFalse(adapter.is_static)
 
+    def test_adapter_pure(self):
+        t = datetime(2000, 1, 1)
+        info = Info(time=t, grid=NoGrid(), units="m")
+
+        out = Output(name="Output")
+        adapter = MockupPureAdapter()
+        in1 = Input(name="In1")
+        in2 = Input(name="In2")
+
+        out >> adapter
+        adapter >> in1
+        adapter >> in2
+        in1.ping()
+        in2.ping()
+
+        self.assertTrue(adapter.is_pure)
+        self.assertFalse(MockupAdapter().is_pure)
+
+        out.push_info(info)
+        in1.exchange_info(info)
+        in2.exchange_info(info)
+
+        for i in range(3):
+            out.push_data(float(i), t + timedelta(days=i))
+
+        for i in range(3):
+            time = t + timedelta(days=i)
+            data1 = in1.pull_data(time)
+            self.assertEqual(len(adapter._memo), 1)
+            data2 = in2.pull_data(time)
+            self.assertEqual(len(adapter._memo), 0)
+
+            self.assertEqual(data1[0], 2.0 * i * fm.UNITS.meter)
+            self.assertEqual(data2[0], 2.0 * i * fm.UNITS.meter)
+
+        self.assertEqual(adapter.calls, 3)
+        self.assertEqual(len(out.data), 1)
+
 
 class TestIOFails(unittest.TestCase):
     def test_input_output_fail(self):
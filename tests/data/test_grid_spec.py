@@ -8,12 +8,15 @@ from numpy.testing import assert_allclose, assert_array_equal
 from finam import (
     CellType,
     EsriGrid,
+    Info,
     Location,
+    NoGrid,
     RectilinearGrid,
     UniformGrid,
     UnstructuredGrid,
     UnstructuredPoints,
 )
+from finam.data import intern_grid, prepare
 
 HEADER = [
     "ncols",
@@ -289,6 +292,9 @@ class TestGridSpec(unittest.TestCase):
 
         # shallow copy shares info
         cp_grid1.points[0, 0] = 0.1
+        # cached fingerprints need to be cleared after modifications
+        us_grid.clear_cache()
+        cp_grid1.clear_cache()
         self.assertTrue(us_grid == cp_grid1)
         self.assertFalse(us_grid == cp_grid2)
 
@@ -323,6 +329,107 @@ class TestGridSpec(unittest.TestCase):
         self.assertNotEqual(grid1, 0)
         self.assertNotEqual(grid1, grid2)
 
+    def test_cached_geometry(self):
+        grid = UniformGrid((4, 3), data_location="POINTS")
+        points = grid.points
+        self.assertIs(grid.points, points)
+        self.assertIs(grid.data_points, points)
+        self.assertIs(grid.cells, grid.cells)
+        self.assertIs(grid.cell_centers, grid.cell_centers)
+        self.assertIs(grid.cell_types, grid.cell_types)
+
+        with self.assertRaises(ValueError):
+            points[0, 0] = 1.0
+
+        # casted grids own their geometry
+        us_grid = grid.to_unstructured()
+        us_grid.points[0, 0] = 1.0
+        self.assertEqual(grid.points[0, 0], 0.0)
+
+        grid.clear_cache()
+        self.assertIsNot(grid.points, points)
+        assert_array_equal(grid.points, points)
+
+    def test_fingerprint(self):
+        grid1 = UniformGrid((3, 4), spacing=(2.0, 2.0))
+        grid2 = RectilinearGrid([[0.0, 2.0, 4.0], [0.0, 2.0, 4.0, 6.0]])
+        grid3 = UniformGrid((3, 4), spacing=(2.0, 2.0), axes_reversed=True)
+        grid4 = UniformGrid((3, 4), spacing=(2.0, 2.0 + 1e-12))
+
+        self.assertEqual(grid1.fingerprint, grid2.fingerprint)
+        self.assertEqual(grid1.content_digest, grid3.content_digest)
+        self.assertNotEqual(grid1.fingerprint, grid3.fingerprint)
+        self.assertNotEqual(grid1.fingerprint, grid4.fingerprint)
+        self.assertEqual(hash(grid1.fingerprint), hash(grid2.fingerprint))
+
+        self.assertEqual(grid1, grid2)
+        self.assertNotEqual(grid1, grid3)
+        self.assertTrue(grid1.compatible_with(grid3))
+        # close grids are still equal
+        self.assertEqual(grid1, grid4)
+        self.assertEqual(grid4, grid1)
+
+        us_grid1 = grid1.to_unstructured()
+        us_grid2 = grid2.to_unstructured()
+        self.assertEqual(us_grid1.fingerprint, us_grid2.fingerprint)
+        self.assertEqual(us_grid1, us_grid2)
+        self.assertNotEqual(us_grid1.fingerprint, grid1.fingerprint)
+
+        self.assertEqual(NoGrid(2).fingerprint, NoGrid(data_shape=(-1, -1)).fingerprint)
+        self.assertNotEqual(NoGrid(2).fingerprint, NoGrid(1).fingerprint)
+
+    def test_intern_grid(self):
+        grid1 = UniformGrid((3, 4))
+        grid2 = UniformGrid((3, 4))
+        grid3 = UniformGrid((3, 4), data_location="POINTS")
+
+        self.assertIs(intern_grid(grid1), grid1)
+        self.assertIs(intern_grid(grid2), grid1)
+        self.assertIs(intern_grid(grid3), grid3)
+        self.assertIsNone(intern_grid(None))
+        # grids of different classes are not shared
+        rect_grid = grid2.to_rectilinear()
+        self.assertEqual(rect_grid.fingerprint, grid1.fingerprint)
+        self.assertIs(intern_grid(rect_grid), rect_grid)
+
+        info = Info(grid=grid2)
+        self.assertIs(info.grid, grid1)
+        self.assertIs(info.copy_with(grid=UniformGrid((3, 4))).grid, grid1)
+
+    def test_intern_grid_order(self):
+        grid_f = UniformGrid((4, 3), order="F")
+        grid_c = UniformGrid((4, 3), order="C")
+
+        self.assertNotEqual(grid_f.fingerprint, grid_c.fingerprint)
+        self.assertIs(intern_grid(grid_f), grid_f)
+        self.assertIs(intern_grid(grid_c), grid_c)
+
+        info = Info(grid=UniformGrid((4, 3), order="C"))
+        self.assertIs(info.grid, grid_c)
+        data = prepare(np.arange(6.0), info)
+        assert_array_equal(data.magnitude[0], [[0.0, 1.0], [2.0, 3.0], [4.0, 5.0]])
+
+    def test_intern_grid_metadata(self):
+        grid1 = UniformGrid((3, 4))
+        grid2 = UniformGrid((3, 4), axes_names=["lon", "lat"])
+        grid3 = UniformGrid((3, 4), axes_attributes=[{"units": "m"}, {"units": "m"}])
+        grid4 = UniformGrid((3, 4), axes_attributes=[{"units": "m"}, {"units": "m"}])
+
+        self.assertIs(intern_grid(grid1), grid1)
+        self.assertIs(intern_grid(grid2), grid2)
+        self.assertIs(intern_grid(grid3), grid3)
+        self.assertIs(intern_grid(grid4), grid3)
+
+        info = Info(grid=UniformGrid((3, 4), axes_names=["lon", "lat"]))
+        self.assertEqual(info.grid.axes_names, ["lon", "lat"])
+        self.assertIs(info.grid, grid2)
+
+        us_grid1 = grid1.to_unstructured()
+        us_grid2 = grid2.to_unstructured()
+        self.assertIs(intern_grid(us_grid1), us_grid1)
+        self.assertIs(intern_grid(us_grid2), us_grid2)
+        self.assertEqual(Info(grid=us_grid2).grid.axes_names, ["lon", "lat"])
+
     def test_cell_types(self):
         grid = UniformGrid((0,))
         self.assertEqual(grid.cell_types, [CellType.VERTEX])
@@ -5,6 +5,7 @@ from numpy.testing import assert_allclose, assert_array_equal
 from pyproj import CRS
 
 from finam import CellType, EsriGrid, NoGrid, UniformGrid, UnstructuredGrid
+from finam.data.grid_base import StructuredTransform
 from finam.data.grid_tools import (
     CELL_DIM,
     INV_VTK_TYPE_MAP,
@@ -185,6 +186,30 @@ class TestGridTools(unittest.TestCase):
         assert_array_equal(data1[0], data2.T[1])
         assert_array_equal(data1[1], data2.T[0])
         assert_array_equal(data1, data3)
+        self.assertIsInstance(trans, StructuredTransform)
+        self.assertIsNone(grid1.get_transform_to(grid1))
+
+        # all time steps at once, as a view
+        stacked = np.stack([data1, data1 + 6])
+        data4 = trans.stacked(stacked)
+        self.assertTrue(np.shares_memory(data4, stacked))
+        assert_array_equal(data4[0], data2)
+        assert_array_equal(data4[1], data2 + 6)
+        with self.assertRaises(ValueError):
+            trans.stacked(data2[np.newaxis])
+
+        # transformation matches canonical form for all axes directions
+        for reversed2 in (False, True):
+            for increase2 in ([True, True], [True, False], [False, True]):
+                grid2 = UniformGrid(
+                    (4, 3), axes_reversed=reversed2, axes_increase=increase2
+                )
+                trans = grid1.get_transform_to(grid2)
+                expected = grid2.from_canonical(grid1.to_canonical(data1))
+                if trans is None:
+                    assert_array_equal(data1, expected)
+                else:
+                    assert_array_equal(trans(data1), expected)
 
         grid1 = EsriGrid(nrows=2, ncols=3, cellsize=2.0)
         self.assertFalse(grid1.compatible_with(grid2))
@@ -1,3 +1,4 @@
+import copy
 import datetime
 import unittest
 from datetime import datetime as dt
@@ -316,15 +317,349 @@ class TestDataTools(unittest.TestCase):
 
         eqiv = finam.data.tools.equivalent_units("mm", "L/m^2")
         self.assertTrue(eqiv)
+        cache = finam.data.tools.units._UNIT_PAIRS_CACHE
         self.assertEqual(
-            {(finam.UNITS.Unit("mm"), finam.UNITS.Unit("L/m^2")): (True, True)},
-            finam.data.tools.units._UNIT_PAIRS_CACHE,
+            [(finam.UNITS.Unit("mm"), finam.UNITS.Unit("L/m^2"))], list(cache)
         )
+        compat, equiv, (scale, offset) = next(iter(cache.values()))
+        self.assertTrue(compat)
+        self.assertTrue(equiv)
+        self.assertAlmostEqual(scale, 1.0)
+        self.assertEqual(offset, 0.0)
 
         finam.data.tools.clear_units_cache()
 
         self.assertEqual({}, finam.data.tools.units._UNIT_PAIRS_CACHE)
 
+    def test_convert_units(self):
+        finam.data.tools.clear_units_cache()
+        xdata = finam.UNITS.Quantity(np.array([[0.0, 1.5], [-3.0, 100.0]]), "m")
+
+        data = finam.data.tools.convert_units(xdata, "km")
+        self.assertEqual(data.units, finam.UNITS.kilometer)
+        np.testing.assert_allclose(data.magnitude, xdata.to("km").magnitude)
+        self.assertEqual(
+            finam.data.tools.units._UNIT_PAIRS_CACHE[
+                (finam.UNITS.meter, finam.UNITS.kilometer)
+            ][2],
+            (0.001, 0.0),
+        )
+
+        # offset units
+        celsius = finam.UNITS.Quantity(np.array([-10.0, 0.0, 25.5]), "degC")
+        data = finam.data.tools.convert_units(celsius, "K")
+        np.testing.assert_allclose(data.magnitude, [263.15, 273.15, 298.65])
+        data = finam.data.tools.convert_units(celsius, "degF")
+        np.testing.assert_allclose(data.magnitude, celsius.to("degF").magnitude)
+
+        # in place
+        out = np.empty((2, 2))
+        data, conv = finam.data.to_units(xdata, "cm", report_conversion=True, out=out)
+        self.assertIs(data.magnitude, out)
+        np.testing.assert_allclose(out, xdata.magnitude * 100)
+        self.assertEqual(conv, (finam.UNITS.meter, finam.UNITS.centimeter))
+
+        # masked
+        masked = finam.UNITS.Quantity(
+            np.ma.array([1.0, 2.0], mask=[True, False]), "degC"
+        )
+        data = finam.data.tools.convert_units(masked, "K")
+        self.assertTrue(finam.data.is_masked_array(data))
+        np.testing.assert_equal(data.magnitude.mask, [True, False])
+        self.assertAlmostEqual(data.magnitude[1], 275.15)
+
+        # non-affine conversion
+        decibel = finam.UNITS.Quantity(np.array([0.0, 10.0, 20.0]), "dB")
+        data = finam.data.tools.convert_units(decibel, "")
+        np.testing.assert_allclose(data.magnitude, [1.0, 10.0, 100.0])
+        self.assertIsNone(
+            finam.data.tools.units._UNIT_PAIRS_CACHE[
+                (finam.UNITS.decibel, finam.UNITS.dimensionless)
+            ][2]
+        )
+
+        with self.assertRaises(finam.errors.FinamDataError):
+            finam.data.tools.convert_units(xdata, "s")
+
+    def test_validation_plan(self):
+        time = dt(2000, 1, 1)
+        info = finam.Info(time, grid=finam.UniformGrid((3, 4)), units="m")
+        plan = finam.data.ValidationPlan(info)
+
+        xdata = finam.data.full(1.0, info)
+        self.assertTrue(plan.matches(xdata))
+        self.assertIs(plan.prepare(xdata), xdata)
+        self.assertEqual(plan.prepare(xdata, report_conversion=True), (xdata, None))
+        plan.check(xdata)
+
+        data = plan.prepare(np.ones((1, 2, 3)))
+        self.assertEqual(data.units, finam.UNITS.meter)
+        self.assertEqual(data.shape, (1, 2, 3))
+
+        # fall back to prepare
+        data = plan.prepare(np.ones(6))
+        self.assertEqual(data.shape, (1, 2, 3))
+        data = plan.prepare(np.ones((2, 3)))
+        self.assertEqual(data.shape, (1, 2, 3))
+
+        data, conv = plan.prepare(
+            finam.UNITS.Quantity(np.ones((1, 2, 3)), "km"), report_conversion=True
+        )
+        self.assertFalse(plan.matches(finam.UNITS.Quantity(np.ones((1, 2, 3)), "km")))
+        self.assertEqual(conv, (finam.UNITS.kilometer, finam.UNITS.meter))
+        np.testing.assert_allclose(data.magnitude, 1000.0)
+
+        with self.assertRaises(finam.errors.FinamDataError):
+            plan.prepare(np.ones((1, 3, 2)))
+        with self.assertRaises(finam.errors.FinamDataError):
+            plan.prepare(finam.UNITS.Quantity(np.ones((1, 2, 3)), "s"))
+        with self.assertRaises(finam.errors.FinamDataError):
+            plan.check(finam.UNITS.Quantity(np.ones((1, 3, 2)), "m"))
+        with self.assertRaises(finam.errors.FinamDataError):
+            plan.check(finam.UNITS.Quantity(np.ones((2, 3)), "m"))
+        with self.assertRaises(finam.errors.FinamDataError):
+            plan.check(np.ones((1, 2, 3)))
+
+        # masked data is required
+        mask = np.array([[True, False, False], [False, False, True]])
+        plan = finam.data.ValidationPlan(info.copy_with(mask=mask))
+        data = plan.prepare(np.ones((1, 2, 3)))
+        self.assertTrue(finam.data.is_masked_array(data))
+        np.testing.assert_equal(data.magnitude.mask[0], mask)
+        data = plan.pack_trusted(np.ones((2, 3)))
+        self.assertTrue(finam.data.is_masked_array(data.magnitude))
+
+        # no fast path without grid shape
+        plan = finam.data.ValidationPlan(finam.Info(time, grid=finam.NoGrid()))
+        self.assertFalse(plan.matches(finam.UNITS.Quantity(np.ones(1), "")))
+        self.assertEqual(plan.prepare(1.0).shape, (1,))
+
+    def test_validation_plan_trusted(self):
+        time = dt(2000, 1, 1)
+        info = finam.Info(time, grid=finam.UniformGrid((3, 4)), units="m")
+        plan = finam.data.ValidationPlan(info)
+
+        array = np.ones((2, 3), dtype=np.float32)
+        data, conv = plan.pack_trusted(array, report_conversion=True)
+        self.assertIsNone(conv)
+        self.assertEqual(data.units, finam.UNITS.meter)
+        self.assertEqual(data.shape, (1, 2, 3))
+        self.assertEqual(data.magnitude.dtype, np.float32)
+        self.assertTrue(np.shares_memory(data.magnitude, array))
+
+        xdata = finam.data.full(1.0, info)
+        self.assertIs(plan.pack_trusted(xdata).magnitude, xdata.magnitude)
+
+        # data is still cast to the negotiated data type
+        plan32 = finam.data.ValidationPlan(info.copy_with(dtype="float32"))
+        self.assertEqual(plan32.pack_trusted(np.zeros((2, 3))).dtype, np.float32)
+        self.assertEqual(
+            plan32.pack_trusted(np.zeros((2, 3))).dtype,
+            plan32.pack(np.zeros((2, 3))).dtype,
+        )
+
+        # units are still converted
+        data, conv = plan.pack_trusted(
+            finam.UNITS.Quantity(np.ones((2, 3)), "km"), report_conversion=True
+        )
+        self.assertEqual(conv, (finam.UNITS.kilometer, finam.UNITS.meter))
+        np.testing.assert_allclose(data.magnitude, 1000.0)
+
+        # flat data is reshaped
+        self.assertEqual(plan.pack_trusted(np.ones(6)).shape, (1, 2, 3))
+
+        with self.assertRaises(finam.errors.FinamDataError):
+            plan.pack_trusted(np.ones((3, 2)))
+        with self.assertRaises(finam.errors.FinamDataError):
+            plan.pack_trusted(np.ones((1, 3, 2)))
+
+    def test_intern_units(self):
+        km = finam.data.intern_units("km")
+        self.assertIs(km, finam.data.intern_units("km"))
+        self.assertIs(km, finam.data.intern_units("kilometer"))
+        self.assertIs(km, finam.data.intern_units(finam.UNITS.kilometer))
+        self.assertIs(km, finam.data.intern_units(finam.UNITS.Quantity(1.0, "km")))
+        self.assertEqual(km, finam.UNITS.kilometer)
+        self.assertIsNot(km, finam.data.intern_units("m"))
+
+        with self.assertRaises(finam.errors.FinamDataError):
+            finam.data.intern_units(None)
+
+    def test_light_quantity(self):
+        time = dt(2000, 1, 1)
+        info = finam.Info(time, grid=finam.UniformGrid((3, 4)), units="m")
+        array = np.ones((1, 2, 3))
+        xdata = finam.data.LightQuantity(array, "m")
+
+        self.assertIs(xdata.magnitude, array)
+        self.assertIs(xdata.units, finam.data.intern_units("m"))
+        self.assertEqual(xdata.shape, (1, 2, 3))
+        self.assertEqual(xdata.ndim, 3)
+        self.assertEqual(xdata.size, 6)
+        self.assertEqual(xdata.nbytes, array.nbytes)
+        self.assertEqual(xdata.dtype, array.dtype)
+        self.assertEqual(len(xdata), 1)
+        self.assertTrue(np.all(xdata == 1.0 * finam.UNITS.meter))
+
+        quantity = xdata.to_quantity()
+        self.assertIsInstance(quantity, pint.Quantity)
+        self.assertIs(quantity.magnitude, array)
+        self.assertEqual(quantity.units, finam.UNITS.meter)
+        self.assertIs(finam.data.to_quantity(xdata), quantity)
+        self.assertIs(finam.data.to_quantity(quantity), quantity)
+        np.testing.assert_allclose((quantity * 2).to("cm").magnitude, 200.0)
+        with self.assertRaises(finam.errors.FinamDataError):
+            finam.data.to_quantity(array)
+
+        copy = xdata.copy()
+        self.assertIsNot(copy.magnitude, array)
+        self.assertEqual(copy.units, xdata.units)
+
+        # data tools
+        self.assertTrue(finam.data.is_quantified(xdata))
+        self.assertIs(finam.data.get_magnitude(xdata), array)
+        self.assertEqual(finam.data.get_units(xdata), finam.UNITS.meter)
+        self.assertEqual(
+            finam.data.get_dimensionality(xdata), finam.UNITS.meter.dimensionality
+        )
+        self.assertTrue(finam.data.tools.compatible_units(xdata, "km"))
+        self.assertFalse(finam.data.tools.equivalent_units(xdata, "km"))
+        finam.data.check(xdata, info)
+
+        stripped = finam.data.strip_time(xdata, info.grid)
+        self.assertIsInstance(stripped, finam.data.LightQuantity)
+        self.assertEqual(stripped.shape, (2, 3))
+
+        data, conv = finam.data.to_units(xdata, "km", report_conversion=True)
+        self.assertIsInstance(data, finam.data.LightQuantity)
+        self.assertEqual(conv, (finam.UNITS.meter, finam.UNITS.kilometer))
+        np.testing.assert_allclose(data.magnitude, 0.001)
+        self.assertIs(finam.data.to_units(xdata, "m"), xdata)
+
+        data = finam.data.prepare(xdata, info)
+        self.assertIsInstance(data, pint.Quantity)
+        self.assertIs(data.magnitude, array)
+
+        data = finam.data.full_like(xdata, 2.0)
+        self.assertIsInstance(data, pint.Quantity)
+        self.assertEqual(data.units, finam.UNITS.meter)
+
+        masked = finam.data.to_masked(xdata, mask=[[[True, False, False]] * 2])
+        self.assertTrue(finam.data.is_masked_array(masked))
+        light = finam.data.LightQuantity(masked.magnitude, "m")
+        self.assertTrue(finam.data.is_masked_array(light))
+        self.assertTrue(finam.data.has_masked_values(light))
+        self.assertEqual(finam.data.to_compressed(light).shape, (4,))
+        self.assertEqual(finam.data.filled(light, 0.0).magnitude.sum(), 4.0)
+
+    def test_validation_plan_pack(self):
+        time = dt(2000, 1, 1)
+        info = finam.Info(time, grid=finam.UniformGrid((3, 4)), units="m")
+        plan = finam.data.ValidationPlan(info)
+
+        array = np.ones((1, 2, 3))
+        data = plan.pack(array)
+        self.assertIsInstance(data, finam.data.LightQuantity)
+        self.assertIs(data.magnitude, array)
+        self.assertIs(data.units, plan.units)
+        self.assertTrue(plan.matches(data))
+        self.assertIs(plan.pack(data), data)
+        plan.check(data)
+
+        xdata = finam.data.full(1.0, info)
+        data = plan.pack(xdata)
+        self.assertIs(data.magnitude, xdata.magnitude)
+        self.assertIs(data.to_quantity(), xdata)
+
+        data, conv = plan.pack(
+            finam.UNITS.Quantity(np.ones((1, 2, 3)), "km"), report_conversion=True
+        )
+        self.assertEqual(conv, (finam.UNITS.kilometer, finam.UNITS.meter))
+        np.testing.assert_allclose(data.magnitude, 1000.0)
+
+        data, conv = plan.pack(
+            finam.data.LightQuantity(np.ones(6), "km"), report_conversion=True
+        )
+        self.assertEqual(conv, (finam.UNITS.kilometer, finam.UNITS.meter))
+        self.assertEqual(data.shape, (1, 2, 3))
+
+        self.assertEqual(plan.pack(np.ones(6)).shape, (1, 2, 3))
+        with self.assertRaises(finam.errors.FinamDataError):
+            plan.pack(np.ones((1, 3, 2)))
+        with self.assertRaises(finam.errors.FinamDataError):
+            plan.pack(finam.data.LightQuantity(np.ones((1, 2, 3)), "s"))
+
+    def test_info_dtype(self):
+        time = dt(2000, 1, 1)
+        info = finam.Info(time, grid=finam.NoGrid(), dtype="float32")
+        self.assertEqual(info.dtype, np.float32)
+        self.assertIsNone(finam.Info(time, grid=finam.NoGrid()).dtype)
+        self.assertEqual(info.copy().dtype, np.float32)
+        self.assertEqual(info.copy_with(dtype=np.float64).dtype, np.float64)
+        self.assertEqual(info.copy_with(use_none=False, dtype=None).dtype, np.float32)
+        self.assertNotEqual(info, info.copy_with(dtype=None))
+        self.assertEqual(info.as_dict()["dtype"], "float32")
+
+        with self.assertRaises(finam.errors.FinamMetaDataError):
+            finam.Info(time, grid=finam.NoGrid(), dtype="foo")
+
+        f64 = finam.Info(time, grid=finam.NoGrid(), dtype="float64")
+        i32 = finam.Info(time, grid=finam.NoGrid(), dtype="int32")
+        self.assertTrue(info.accepts(f64, {}))
+        self.assertTrue(f64.accepts(info, {}))
+        self.assertTrue(info.accepts(i32, {}))
+        fail_info = {}
+        self.assertFalse(i32.accepts(info, fail_info))
+        self.assertEqual(fail_info, {"dtype": (np.float32, np.int32)})
+        self.assertFalse(info.accepts(i32, {}, incoming_downstream=True))
+
+    def test_info_slots(self):
+        time = dt(2000, 1, 1)
+        grid = finam.UniformGrid((4, 3))
+        mask = np.full((3, 2), False)
+        mask[0, 0] = True
+        info = finam.Info(time, grid=grid, units="m", mask=mask, foo="bar")
+
+        self.assertFalse(hasattr(info, "__dict__"))
+        self.assertIs(info.units, finam.Info(time, grid=grid, units="m").units)
+        self.assertIs(info.copy_with(units="m").units, info.units)
+
+        info.foo = "baz"
+        self.assertEqual(info.meta["foo"], "baz")
+        self.assertEqual(info.copy().foo, "baz")
+        self.assertEqual(copy.deepcopy(info), info)
+
+        # equal masks with the same grid, compared by digest
+        other = info.copy_with(mask=mask.copy())
+        self.assertEqual(info, other)
+        self.assertTrue(info.accepts(other, {}))
+
+        other.mask = ~mask
+        self.assertNotEqual(info, other)
+        fail_info = {}
+        self.assertFalse(info.accepts(other, fail_info))
+        self.assertIn("mask", fail_info)
+
+    def test_validation_plan_dtype(self):
+        time = dt(2000, 1, 1)
+        info = finam.Info(time, grid=finam.UniformGrid((3, 4)), dtype="float32")
+        plan = finam.data.ValidationPlan(info)
+
+        array = np.ones((1, 2, 3), dtype=np.float32)
+        data = plan.pack(array)
+        self.assertIs(data.magnitude, array)
+
+        data = plan.pack(np.ones((1, 2, 3)))
+        self.assertEqual(data.dtype, np.float32)
+        self.assertTrue(plan.matches(data))
+        self.assertFalse(plan.matches(finam.data.LightQuantity(np.ones((1, 2, 3)), "")))
+
+        self.assertEqual(finam.data.prepare(np.ones(6), info).dtype, np.float32)
+        self.assertEqual(finam.data.full(1, info).dtype, np.float32)
+
+        with self.assertRaises(finam.errors.FinamDataError):
+            finam.data.check(finam.UNITS.Quantity(np.ones((1, 2, 3)), ""), info)
+
 
 if __name__ == "__main__":
     unittest.main()
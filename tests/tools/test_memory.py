@@ -0,0 +1,240 @@
+import gc
+import os
+import tempfile
+import threading
+import unittest
+
+import numpy as np
+
+from finam.tools.memory_helper import (
+    CODECS,
+    ArenaBlock,
+    Codec,
+    MemoryArena,
+    MemoryBudget,
+    get_codec,
+)
+
+
+class TestMemoryArena(unittest.TestCase):
+    def test_store_load(self):
+        with tempfile.TemporaryDirectory() as td:
+            arena = MemoryArena(os.path.join(td, "test"))
+
+            data = np.arange(12, dtype=np.float32).reshape(3, 4)
+            block = arena.store(data)
+
+            self.assertIsInstance(block, ArenaBlock)
+            self.assertEqual(block.nbytes, data.nbytes)
+            self.assertEqual(arena.paths, [os.path.join(td, "test-0.arena")])
+            self.assertTrue(os.path.isfile(arena.paths[0]))
+
+            loaded = arena.load(block)
+            self.assertIsInstance(loaded.base, np.memmap)
+            self.assertEqual(loaded.dtype, np.float32)
+            np.testing.assert_equal(loaded, data)
+
+            fortran = np.asfortranarray(np.arange(6.0).reshape(2, 3))
+            np.testing.assert_equal(arena.load(arena.store(fortran)), fortran)
+
+            del loaded
+            arena.close()
+            self.assertFalse(os.path.isfile(os.path.join(td, "test-0.arena")))
+
+    def test_masked(self):
+        with tempfile.TemporaryDirectory() as td:
+            arena = MemoryArena(os.path.join(td, "test"))
+
+            data = np.ma.array(
+                np.arange(4.0), mask=[True, False, False, True], fill_value=-1.0
+            )
+            loaded = arena.load(arena.store(data))
+
+            self.assertTrue(np.ma.isMaskedArray(loaded))
+            np.testing.assert_equal(loaded.mask, data.mask)
+            np.testing.assert_equal(loaded.filled(), data.filled())
+            self.assertEqual(loaded.fill_value, -1.0)
+
+            del loaded
+            arena.close()
+
+    def test_reuse(self):
+        with tempfile.TemporaryDirectory() as td:
+            arena = MemoryArena(os.path.join(td, "test"))
+
+            data = np.ones(1000)
+            blocks = [arena.store(data) for _ in range(4)]
+            self.assertEqual(len(arena.paths), 1)
+
+            arena.free(blocks[1])
+            reused = arena.store(data * 2)
+            self.assertEqual(reused.offset, blocks[1].offset)
+
+            # space is not reused while loaded data is alive
+            loaded = arena.load(blocks[2])
+            arena.free(blocks[2])
+            block = arena.store(data * 3)
+            self.assertNotEqual(block.offset, blocks[2].offset)
+            np.testing.assert_equal(loaded, data)
+
+            del loaded
+            gc.collect()
+            block = arena.store(data * 4)
+            self.assertEqual(block.offset, blocks[2].offset)
+
+            # freed neighbours are merged
+            arena.free(blocks[0])
+            arena.free(block)
+            arena.free(reused)
+            arena.free(blocks[3])
+            self.assertEqual(arena.store(np.ones(3000)).offset, blocks[0].offset)
+
+            arena.close()
+
+    def test_grow(self):
+        with tempfile.TemporaryDirectory() as td:
+            arena = MemoryArena(os.path.join(td, "test"))
+
+            first = arena.store(np.zeros(100))
+            loaded = arena.load(first)
+            large = np.arange(1_000_000, dtype=np.float64)
+            block = arena.store(large)
+
+            self.assertEqual(len(arena.paths), 2)
+            self.assertEqual(block.segment, 1)
+            self.assertGreaterEqual(arena.capacity, large.nbytes + (1 << 20))
+            np.testing.assert_equal(arena.load(block), large)
+            np.testing.assert_equal(loaded, np.zeros(100))
+
+            with self.assertRaises(ValueError):
+                arena.store(np.array([None, 1], dtype=object))
+
+            del loaded
+            arena.close()
+            self.assertEqual(arena.paths, [])
+
+    def test_asynchronous(self):
+        with tempfile.TemporaryDirectory() as td:
+            arena = MemoryArena(os.path.join(td, "test"), asynchronous=True)
+
+            data = np.ma.array(np.arange(100_000.0), mask=np.arange(100_000) % 3 == 0)
+            blocks = [arena.store(data + i) for i in range(5)]
+
+            for i, block in enumerate(blocks):
+                arena.prefetch(block)
+                loaded = arena.load(block)
+                self.assertIsNone(block.pending)
+                np.testing.assert_equal(loaded.mask, data.mask)
+                np.testing.assert_equal(loaded.filled(), (data + i).filled())
+                del loaded
+
+            for block in blocks:
+                arena.free(block)
+            arena.wait()
+            arena.close()
+            self.assertFalse(os.path.isfile(os.path.join(td, "test-0.arena")))
+
+    def test_codec(self):
+        data = np.ma.array(
+            np.cumsum(np.ones((30, 20)), axis=1),
+            mask=np.arange(600).reshape(30, 20) % 7 == 0,
+            fill_value=-9999.0,
+        )
+        with tempfile.TemporaryDirectory() as td:
+            for name, codec in CODECS.items():
+                arena = MemoryArena(os.path.join(td, name), codec=name)
+                block = arena.store(data)
+                self.assertIs(block.codec, codec)
+                self.assertLess(block.length, data.data.nbytes)
+
+                loaded = arena.load(block)
+                self.assertTrue(loaded.flags.writeable)
+                np.testing.assert_equal(loaded.mask, data.mask)
+                np.testing.assert_equal(loaded.filled(), data.filled())
+                self.assertEqual(loaded.fill_value, -9999.0)
+
+                fortran = np.asfortranarray(np.arange(6, dtype=np.int16).reshape(2, 3))
+                np.testing.assert_equal(arena.load(arena.store(fortran)), fortran)
+
+                arena.free(block)
+                arena.close()
+
+        self.assertIsNone(get_codec(None))
+        self.assertIs(get_codec(CODECS["zlib"]), CODECS["zlib"])
+        self.assertIsInstance(get_codec("shuffle"), Codec)
+        with self.assertRaises(ValueError):
+            get_codec("gzip")
+
+
+class MockSlot:
+    def __init__(self):
+        self.spilled = []
+
+    def _spill(self, data):
+        self.spilled.append(data)
+        return True
+
+
+class TestMemoryBudget(unittest.TestCase):
+    def test_budget(self):
+        budget = MemoryBudget(3000)
+        slot1 = MockSlot()
+        slot2 = MockSlot()
+
+        data = [np.ones(100) for _ in range(4)]
+
+        self.assertTrue(budget.reserve(800))
+        budget.add(slot1, data[0])
+        budget.add(slot2, data[1])
+        budget.add(slot1, data[2])
+
+        self.assertEqual(budget.used, 2400)
+        self.assertEqual(budget.available, 600)
+        self.assertEqual(budget.usage(), {slot1: 1600, slot2: 800})
+
+        # least recently used is spilled first
+        budget.touch(data[0])
+        self.assertTrue(budget.reserve(800))
+        budget.add(slot2, data[3])
+
+        self.assertEqual(slot2.spilled, [data[1]])
+        self.assertEqual(slot1.spilled, [])
+        self.assertEqual(budget.used, 2400)
+        self.assertEqual(budget.spilled, 800)
+
+        budget.remove(data[3])
+        budget.remove(data[3])
+        self.assertEqual(budget.used, 1600)
+
+        budget.limit = 1000
+        self.assertEqual(slot1.spilled, [data[2]])
+        self.assertEqual(budget.used, 800)
+
+        self.assertFalse(budget.reserve(2000))
+        self.assertEqual(slot1.spilled, [data[2], data[0]])
+        self.assertEqual(budget.used, 0)
+        self.assertEqual(budget.spilled, 2400)
+
+    def test_budget_threads(self):
+        budget = MemoryBudget(8000)
+        slots = [MockSlot() for _ in range(4)]
+
+        def work(slot):
+            for _ in range(200):
+                data = np.ones(100)
+                with budget.lock:
+                    if budget.reserve(data.nbytes):
+                        budget.add(slot, data)
+                budget.touch(data)
+                if len(slot.spilled) % 2:
+                    budget.remove(data)
+
+        threads = [threading.Thread(target=work, args=(slot,)) for slot in slots]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertLessEqual(budget.used, budget.limit)
+        self.assertEqual(budget.used, sum(budget.usage().values()))
+        self.assertEqual(budget.spilled, 800 * sum(len(s.spilled) for s in slots))